@@ -0,0 +1 @@
+"""Benchmarks for Hunt hot paths."""
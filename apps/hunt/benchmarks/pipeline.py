@@ -0,0 +1,145 @@
+"""End-to-end load test of the collection pipeline against a mock Groq.
+
+Run from ``apps/hunt``::
+
+    uv run python -m benchmarks.pipeline --tasks 200 --workers 8 --latency 0.5
+
+Starts the mock Groq server in-process, points the LLM client at it and
+pushes collection tasks through the scheduler's worker pool, so the query
+generator, agent, rate limiting and storage all run as in production.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import uvicorn  # noqa: E402
+
+from src.hunt import agent, llm, policy, query_generator, query_pool, storage  # noqa: E402
+from src.hunt.config import get_settings  # noqa: E402
+from src.hunt.mock_groq import MockGroq, create_app, load_cassette  # noqa: E402
+from src.hunt.models import DataCategory, SearchTarget, USA_STATES  # noqa: E402
+
+
+def serve_in_thread(mock: MockGroq) -> tuple[str, uvicorn.Server]:
+    """Start the mock server on a free local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(mock), host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, name="mock-groq", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}", server
+
+
+async def run_pipeline(tasks: int) -> dict:
+    """Push collection tasks through a fresh scheduler's worker pool."""
+    from src.hunt.scheduler import CollectionScheduler
+
+    scheduler = CollectionScheduler()
+    scheduler._queue = asyncio.Queue()
+    workers = [asyncio.create_task(scheduler._work(n)) for n in range(scheduler.workers)]
+
+    categories = list(DataCategory)
+    start = time.perf_counter()
+    for i in range(tasks):
+        state = USA_STATES[i // len(categories) % len(USA_STATES)]
+        await scheduler._queue.put(
+            SearchTarget(state=state, country="USA", category=categories[i % len(categories)])
+        )
+    await scheduler._queue.join()
+    elapsed = time.perf_counter() - start
+
+    for worker in workers:
+        worker.cancel()
+    await llm.close_llm_client()
+    return {"elapsed_s": elapsed, "tasks_per_s": tasks / elapsed}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the pipeline load test."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tasks", type=int, default=100, help="Collection tasks to run")
+    parser.add_argument("--workers", type=int, default=4, help="Collection workers")
+    parser.add_argument("--batch-size", type=int, default=1, help="Targets per agent call")
+    parser.add_argument("--concurrency", type=int, default=None, help="Groq calls in flight")
+    parser.add_argument(
+        "--calls-per-minute", type=float, default=6000.0, help="Collection call budget"
+    )
+    parser.add_argument("--cassette", type=Path, default=None, help="Exchanges to replay")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean mock latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Mock latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    mock = MockGroq(
+        exchanges=load_cassette(args.cassette) if args.cassette else None,
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=0.1,
+        seed=0,
+    )
+    base_url, server = serve_in_thread(mock)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "GROQ_BASE_URL": base_url,
+            "GROQ_MAX_CONCURRENCY": str(args.concurrency or args.workers * 2),
+            "GROQ_REQUESTS_PER_MINUTE": "100000",
+            "GROQ_TOKENS_PER_MINUTE": "100000000",
+            "GROQ_BACKOFF_BASE_SECONDS": "0.05",
+            "GROQ_BACKOFF_MAX_SECONDS": "0.5",
+            "COLLECTION_WORKERS": str(args.workers),
+            "COLLECTION_BATCH_SIZE": str(args.batch_size),
+            "COLLECTION_CALLS_PER_MINUTE": str(args.calls_per_minute),
+        })
+        os.environ.pop("GROQ_RECORD_PATH", None)
+        get_settings.cache_clear()
+        llm._llm_client = None
+        agent._agent = None
+        query_generator._generator = None
+        query_pool._pool = query_pool.QueryPool(Path(tmp) / "query_pool.json")
+        policy._policy = policy.YieldPolicy(Path(tmp) / "yield_stats.json", policy.all_targets())
+        storage._storage = storage.Storage(data_dir=Path(tmp))
+
+        report = asyncio.run(run_pipeline(args.tasks))
+        report.update({
+            "tasks": args.tasks,
+            "workers": args.workers,
+            "batch_size": args.batch_size,
+            "venues_stored": storage._storage.get_stats()["total_venues"],
+            "mock": dict(mock.stats),
+        })
+
+    server.should_exit = True
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
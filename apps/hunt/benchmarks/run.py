@@ -0,0 +1,357 @@
+"""Benchmark harness for storage, parsing and API hot paths.
+
+Run from ``apps/hunt``::
+
+    uv run python -m benchmarks.run --sizes 1000,10000 --output results.json
+    uv run python -m benchmarks.run --compare baseline.json --output current.json
+
+Each benchmark reports throughput, p50/p99 latency and peak traced memory
+for every dataset size. Results are written as JSON so runs of different
+versions can be compared with ``--compare``.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from src.hunt import storage as storage_module  # noqa: E402
+from src.hunt.agent import VolleyballAgent  # noqa: E402
+from src.hunt.models import DataCategory, VenueData  # noqa: E402
+from src.hunt.records import VenueRecord  # noqa: E402
+
+from .synthetic import (  # noqa: E402
+    canned_response,
+    generate_records,
+    generate_venues,
+    write_json_store,
+    write_sqlite_store,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int,
+    items_per_call: int = 1,
+    setup: Optional[Callable[[], None]] = None,
+) -> dict:
+    """
+    Time a callable and trace its peak memory.
+
+    Args:
+        fn: Operation to measure
+        repeat: Number of timed calls
+        items_per_call: Items processed per call, for throughput
+        setup: Untimed preparation run before every call
+
+    Returns:
+        Latency percentiles in milliseconds, throughput and peak memory
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate call: tracing slows allocations down
+    # enough to distort the timings
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "calls": repeat,
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        "mean_ms": total / repeat * 1000,
+        "throughput_per_s": items_per_call * repeat / total if total else None,
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def open_storage(backend: str, data_dir: Path):
+    """Open a storage backend on a prepared data directory."""
+    if backend == "sqlite":
+        from src.hunt.sqlite_storage import SqliteStorage
+
+        return SqliteStorage(data_dir / "hunt.db")
+    return storage_module.Storage(data_dir=data_dir, compact_min_segments=10**9)
+
+
+def bench_storage(backend: str, size: int, repeat: int) -> list[dict]:
+    """Benchmark storage hot paths on a store holding ``size`` venues."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        if backend == "sqlite":
+            write_sqlite_store(data_dir / "hunt.db", size)
+        else:
+            write_json_store(data_dir, size)
+
+        # Cold load measures the startup cost of reading the whole store
+        results.append({
+            "name": "load_all_venues.cold",
+            **measure(
+                lambda: open_storage(backend, data_dir).load_all_venues(),
+                repeat=max(1, repeat // 10),
+                items_per_call=size,
+            ),
+        })
+
+        storage = open_storage(backend, data_dir)
+        storage.load_all_venues()
+        results.append({
+            "name": "load_all_venues.warm",
+            **measure(storage.load_all_venues, repeat, items_per_call=size),
+        })
+        results.append({"name": "get_stats", **measure(storage.get_stats, repeat)})
+        results.append({
+            "name": "get_venues_by_state",
+            **measure(lambda: storage.get_venues_by_state("California", "USA"), repeat),
+        })
+
+        results.append({
+            "name": "search_venues",
+            **measure(lambda: storage.search_venues("beach volleyball"), repeat),
+        })
+
+        batches = count()
+
+        def save_batch() -> None:
+            offset = size + next(batches) * 30
+            storage.save_venues(generate_venues(30, offset=offset))
+
+        results.append({
+            "name": "save_venues.batch30",
+            **measure(save_batch, repeat, items_per_call=30),
+        })
+
+    return results
+
+
+def bench_api(backend: str, size: int, repeat: int) -> list[dict]:
+    """Benchmark the /api/results and /api/stats routes end to end."""
+    from fastapi.testclient import TestClient
+
+    from src.hunt.main import app
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        if backend == "sqlite":
+            write_sqlite_store(data_dir / "hunt.db", size)
+        else:
+            write_json_store(data_dir, size)
+
+        previous = storage_module._storage
+        storage_module._storage = open_storage(backend, data_dir)
+        storage_module._storage.load_all_venues()
+        try:
+            client = TestClient(app)
+            for name, path in (
+                ("GET /api/stats", "/api/stats"),
+                ("GET /api/results/{state}", "/api/results/California?country=USA"),
+                ("GET /api/results/{state}?limit=100", "/api/results/California?limit=100"),
+                ("GET /api/venues/search", "/api/venues/search?q=beach+volleyball"),
+            ):
+                results.append({
+                    "name": name,
+                    **measure(lambda: client.get(path).raise_for_status(), repeat),
+                })
+        finally:
+            storage_module._storage = previous
+
+    return results
+
+
+def bench_parsing(repeat: int) -> list[dict]:
+    """Benchmark parsing canned LLM responses into venues."""
+    agent = VolleyballAgent.__new__(VolleyballAgent)
+    results = []
+    for count in (10, 50):
+        for prose in (False, True):
+            content = canned_response(count, prose=prose)
+            parsed = len(agent._parse_venues(content, "Texas", "USA", DataCategory.COURTS))
+            results.append({
+                "name": f"_parse_venues.{count}{'.prose' if prose else ''}",
+                "size": count,
+                "venues_parsed": parsed,
+                **measure(
+                    lambda: agent._parse_venues(content, "Texas", "USA", DataCategory.COURTS),
+                    repeat,
+                    items_per_call=count,
+                ),
+            })
+    return results
+
+
+def retained_mb(build: Callable[[], Any]) -> float:
+    """Memory still held by the result of ``build`` once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (1024 * 1024)
+
+
+def bench_memory(size: int, repeat: int) -> list[dict]:
+    """
+    Compare loading venues as validated models and as compact records.
+
+    Venues are decoded from JSON lines like the venue log's, so each one
+    starts with its own copies of repeated strings, as in a real load.
+    """
+    lines = [json.dumps(record) for record in generate_records(size)]
+    results = []
+    for name, build in (
+        ("load.venue_models", lambda: [VenueData(**json.loads(line)) for line in lines]),
+        ("load.venue_records", lambda: [VenueRecord.from_json(json.loads(line)) for line in lines]),
+    ):
+        results.append({
+            "name": name,
+            "retained_mb": retained_mb(build),
+            **measure(build, max(1, repeat // 10), items_per_call=size),
+        })
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Current git revision, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Compare p50 latencies of two result files.
+
+    Returns:
+        Descriptions of benchmarks slower than ``threshold`` (e.g. 0.2 = 20%)
+    """
+    def key(r: dict) -> tuple:
+        return r.get("backend"), r["name"], r.get("size")
+
+    before = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(key(result))
+        if old is None or not old["p50_ms"]:
+            continue
+        change = result["p50_ms"] / old["p50_ms"] - 1
+        line = (
+            f"{result['name']:<40} size={result.get('size')!s:<8} "
+            f"{old['p50_ms']:10.3f} -> {result['p50_ms']:10.3f} ms ({change:+.1%})"
+        )
+        print(line)
+        if change > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated dataset sizes (e.g. 1000,10000,100000,1000000)",
+    )
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per benchmark")
+    parser.add_argument(
+        "--only",
+        choices=["storage", "api", "parsing", "memory"],
+        action="append",
+        help="Run only the given groups (repeatable)",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Regression threshold for --compare"
+    )
+    args = parser.parse_args(argv)
+
+    # Parse failures and saves are logged per call; keep the report readable
+    logging.getLogger("src.hunt").setLevel(logging.ERROR)
+
+    groups = set(args.only or ["storage", "api", "parsing", "memory"])
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    results = []
+    if "parsing" in groups:
+        results += bench_parsing(args.repeat)
+    for size in sizes:
+        if "storage" in groups:
+            results += [{"size": size, **r} for r in bench_storage(args.backend, size, args.repeat)]
+        if "api" in groups:
+            results += [{"size": size, **r} for r in bench_api(args.backend, size, args.repeat)]
+        if "memory" in groups:
+            results += [{"size": size, **r} for r in bench_memory(size, args.repeat)]
+    for result in results:
+        result["backend"] = args.backend
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "sizes": sizes,
+        "results": results,
+    }
+
+    for r in results:
+        throughput = r["throughput_per_s"]
+        print(
+            f"{r['name']:<40} size={r.get('size')!s:<8} "
+            f"p50={r['p50_ms']:9.3f}ms p99={r['p99_ms']:9.3f}ms "
+            f"thr={throughput or 0:12.1f}/s peak={r['peak_mb']:8.2f}MB"
+            + (f" retained={r['retained_mb']:8.2f}MB" if "retained_mb" in r else "")
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Synthetic venue corpora and canned LLM responses for benchmarks."""
+
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from src.hunt.models import DataCategory, INDIA_STATES, USA_STATES, VenueData
+
+WORDS = [
+    "Beach", "Sand", "Spike", "Ace", "Rally", "Net", "Court", "Dig", "Block",
+    "Summit", "Coastal", "Valley", "Metro", "Sunset", "Lakeside", "Central",
+    "Elite", "Premier", "Community", "Riverside", "Harbor", "Pioneer", "Eagle",
+]
+KINDS = {
+    DataCategory.COURTS: ["Courts", "Sports Complex", "Recreation Center", "Arena"],
+    DataCategory.ACADEMIES: ["Academy", "Training Center", "Volleyball School"],
+    DataCategory.EQUIPMENT: ["Sports Store", "Volleyball Shop", "Outfitters"],
+    DataCategory.TOURNAMENTS: ["Open", "Classic", "Championship", "League"],
+    DataCategory.CLUBS: ["Volleyball Club", "VBC", "Juniors", "Athletics"],
+}
+STATES = [(s, "USA") for s in USA_STATES] + [(s, "India") for s in INDIA_STATES]
+
+
+def _venue_fields(rng: random.Random, i: int) -> dict:
+    """Build the raw fields of the i-th synthetic venue."""
+    state, country = rng.choice(STATES)
+    category = rng.choice(list(DataCategory))
+    name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(KINDS[category])} {i}"
+    slug = name.lower().replace(" ", "")
+    return {
+        "name": name,
+        "category": category.value,
+        "state": state,
+        "country": country,
+        "address": f"{rng.randint(1, 9999)} {rng.choice(WORDS)} Street, {state}",
+        "website": f"https://{slug}.example.com",
+        "phone": f"+1 {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+        "email": f"info@{slug}.example.com",
+        "description": " ".join(rng.choice(WORDS).lower() for _ in range(rng.randint(8, 30))),
+        "source_url": f"https://directory.example.com/{slug}",
+        "collected_at": (datetime(2026, 1, 1) + timedelta(minutes=i)).isoformat(),
+    }
+
+
+def generate_records(count: int, seed: int = 0, offset: int = 0) -> Iterator[dict]:
+    """
+    Generate JSON-ready venue records deterministically.
+
+    Args:
+        count: Number of records
+        seed: Random seed
+        offset: Index of the first record, to generate disjoint corpora
+    """
+    rng = random.Random(seed * 1_000_003 + offset)
+    for i in range(offset, offset + count):
+        yield _venue_fields(rng, i)
+
+
+def generate_venues(count: int, seed: int = 0, offset: int = 0) -> list[VenueData]:
+    """Generate validated venues deterministically."""
+    return [VenueData(**r) for r in generate_records(count, seed, offset)]
+
+
+def venue_key(record: dict) -> str:
+    """Exact dedup key of a raw record, as used by the storage backends."""
+    return f"{record['name'].lower()}|{record['state'].lower()}|{record['country'].lower()}"
+
+
+def write_json_store(data_dir: Path, count: int, seed: int = 0, chunk: int = 10_000) -> None:
+    """Write a corpus straight into a venue log, bypassing save-time dedup."""
+    from src.hunt.venue_log import VenueLog
+
+    log = VenueLog(data_dir / "venues", compact_min_segments=10**9)
+    for start in range(0, count, chunk):
+        records = generate_records(min(chunk, count - start), seed, offset=start)
+        log.append([(venue_key(r), r) for r in records])
+
+
+def write_sqlite_store(db_path: Path, count: int, seed: int = 0, chunk: int = 10_000) -> None:
+    """Write a corpus straight into a SQLite store, bypassing save-time dedup."""
+    from src.hunt.sqlite_storage import VENUE_COLUMNS, SqliteStorage
+
+    storage = SqliteStorage(db_path)
+    conn = storage._connect()
+    columns = ", ".join(("venue_key",) + VENUE_COLUMNS)
+    placeholders = ", ".join("?" for _ in range(len(VENUE_COLUMNS) + 1))
+    for start in range(0, count, chunk):
+        records = generate_records(min(chunk, count - start), seed, offset=start)
+        with conn:
+            conn.executemany(
+                f"INSERT INTO venues ({columns}) VALUES ({placeholders})",
+                [(venue_key(r), *(r[c] for c in VENUE_COLUMNS)) for r in records],
+            )
+    storage.close()
+
+
+def canned_response(count: int, seed: int = 0, prose: bool = True) -> str:
+    """
+    Build an LLM completion like the ones Groq Compound returns.
+
+    Args:
+        count: Number of venues in the JSON array
+        seed: Random seed
+        prose: Wrap the array in explanatory text, as the model often does
+    """
+    items = []
+    for record in generate_records(count, seed, offset=10**7):
+        items.append({
+            k: record[k]
+            for k in ("name", "address", "website", "phone", "email", "description", "source_url")
+        })
+
+    body = json.dumps(items, indent=2)
+    if not prose:
+        return body
+    return (
+        "I searched the web and found the following venues [sources below].\n\n"
+        f"```json\n{body}\n```\n\nLet me know if you need more [details]."
+    )
@@ -1,13 +1,13 @@
 """Groq Compound agent for volleyball data collection."""
 
-import json
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, AsyncIterator, Optional
 
-from groq import Groq
-
-from .config import get_settings
-from .models import DataCategory, VenueData
+from .json_stream import JsonArrayStream, extract_items
+from .llm import get_llm_client
+from .metrics import BATCH_UNLABELLED_ITEMS, PARSE_SECONDS
+from .models import DataCategory, SearchTarget, VenueData
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +17,7 @@ class VolleyballAgent:
 
     def __init__(self):
         """Initialize the Groq Compound agent."""
-        settings = get_settings()
-        self.client = Groq(api_key=settings.groq_api_key)
+        self.llm = get_llm_client()
         self.model = "groq/compound"  # Pre-made agent with web search
 
     def _build_system_prompt(self, category: DataCategory) -> str:
@@ -81,11 +80,28 @@ For each venue found, extract and return as JSON array:
   "phone": "phone number if available",
   "email": "email if available",
   "description": "brief description of the venue",
-  "source_url": "URL where you found this information"
+  "source_url": "URL where you found this information",
+  "latitude": decimal latitude if known, else null,
+  "longitude": decimal longitude if known, else null
 }
 
 Return ONLY a valid JSON array of venues. Do not include any other text.
 If no venues found, return an empty array: []
+"""
+
+    def _build_batch_prompt(self, targets: list[SearchTarget], max_results: int) -> str:
+        """Build a user prompt covering several search targets at once."""
+        tasks = "\n".join(
+            f"T{i}: Find up to {max_results} {t.category.value} in {t.state}, {t.country}"
+            for i, t in enumerate(targets, start=1)
+        )
+        return f"""Complete each of these search tasks:
+{tasks}
+
+{self._build_extraction_prompt()}
+Every venue object MUST also include a "target" field with the id of the
+task it belongs to (for example "T1"). Put all venues from all tasks in
+the same array.
 """
 
     async def search(
@@ -109,30 +125,17 @@ If no venues found, return an empty array: []
         Returns:
             Tuple of (venues list, executed tools, query used)
         """
-        system_prompt = self._build_system_prompt(category)
-        extraction_prompt = self._build_extraction_prompt()
-
-        if custom_query:
-            query = custom_query
-        else:
-            query = f"Find {max_results} {category.value} in {state}, {country}"
-
-        full_prompt = f"""{system_prompt}
-
-SEARCH TASK: {query}
-
-{extraction_prompt}"""
+        messages, query = self._build_search_messages(
+            state, country, category, max_results, custom_query
+        )
 
         try:
             logger.info(f"Searching: {query}")
 
             # Use Groq Compound - it has built-in web search
-            response = self.client.chat.completions.create(
+            response = await self.llm.chat_completion(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{query}\n\n{extraction_prompt}"}
-                ],
+                messages=messages,
                 temperature=0.1,
                 max_tokens=4096,
             )
@@ -140,12 +143,7 @@ SEARCH TASK: {query}
             content = response.choices[0].message.content or "[]"
 
             # Extract executed tools from response
-            executed_tools = []
-            if hasattr(response.choices[0].message, 'executed_tools'):
-                executed_tools = [
-                    tool.get('type', 'unknown')
-                    for tool in (response.choices[0].message.executed_tools or [])
-                ]
+            executed_tools = self._executed_tools(response.choices[0].message)
 
             # Parse the JSON response
             venues = self._parse_venues(content, state, country, category)
@@ -157,6 +155,233 @@ SEARCH TASK: {query}
             logger.error(f"Error searching for venues: {e}")
             raise
 
+    async def search_stream(
+        self,
+        state: str,
+        country: str,
+        category: DataCategory,
+        max_results: int = 10,
+        custom_query: Optional[str] = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Search like ``search``, yielding results while the completion streams.
+
+        Every venue is yielded as soon as its JSON object is complete in
+        the token stream, so callers can validate and persist it before
+        the model has finished. A response cut off at ``max_tokens`` still
+        yields every complete venue.
+
+        Args:
+            state: State to search in
+            country: Country (USA or India)
+            category: Category of venue to search for
+            max_results: Maximum number of results
+            custom_query: Optional custom search query
+
+        Yields:
+            ``("query", str)`` first, then ``("tool", str)`` for every
+            executed tool and ``("venue", VenueData)`` for every venue, and
+            finally ``("done", finish_reason)``
+        """
+        messages, query = self._build_search_messages(
+            state, country, category, max_results, custom_query
+        )
+        logger.info(f"Streaming search: {query}")
+        yield "query", query
+
+        parser = JsonArrayStream()
+        found = 0
+        finish_reason = None
+        parse_seconds = 0.0
+        async for chunk in self.llm.stream_completion(
+            model=self.model,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=4096,
+        ):
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            for tool in self._executed_tools(choice.delta):
+                yield "tool", tool
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+            parse_start = time.perf_counter()
+            items = parser.feed(choice.delta.content or "")
+            parse_seconds += time.perf_counter() - parse_start
+            for item in items:
+                if found >= max_results:
+                    break
+                venue = self._item_to_venue(item, state, country, category)
+                if venue is not None:
+                    found += 1
+                    yield "venue", venue
+
+        PARSE_SECONDS.labels("stream").observe(parse_seconds)
+        logger.info(f"Streamed {found} venues for {state}, {country}")
+        yield "done", finish_reason
+
+    def _build_search_messages(
+        self,
+        state: str,
+        country: str,
+        category: DataCategory,
+        max_results: int,
+        custom_query: Optional[str],
+    ) -> tuple[list[dict[str, str]], str]:
+        """Build the chat messages of a single-target search and its query."""
+        system_prompt = self._build_system_prompt(category)
+        extraction_prompt = self._build_extraction_prompt()
+
+        if custom_query:
+            query = custom_query
+        else:
+            query = f"Find {max_results} {category.value} in {state}, {country}"
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{query}\n\n{extraction_prompt}"},
+        ]
+        return messages, query
+
+    async def search_batch(
+        self,
+        targets: list[SearchTarget],
+        max_results: int = 10,
+    ) -> tuple[dict[SearchTarget, list[VenueData]], list[str]]:
+        """
+        Search several targets with a single Groq Compound call.
+
+        The fixed prompt overhead is paid once for the whole batch. Venues
+        are tagged with their task id by the model and split back per
+        target. Every target without labelled venues, and the target the
+        output was cut off in if the response is truncated, is retried with
+        a single-target search.
+
+        Args:
+            targets: Targets to search
+            max_results: Maximum number of results per target
+
+        Returns:
+            Tuple of (venues per target, executed tools)
+        """
+        if len(targets) == 1:
+            target = targets[0]
+            venues, executed_tools, _ = await self.search(
+                target.state, target.country, target.category, max_results
+            )
+            return {target: venues}, executed_tools
+
+        categories = list(dict.fromkeys(t.category for t in targets))
+        system_prompt = "\n\n".join(self._build_system_prompt(c) for c in categories)
+
+        logger.info(f"Batch searching {len(targets)} targets")
+        response = await self.llm.chat_completion(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": self._build_batch_prompt(targets, max_results)},
+            ],
+            temperature=0.1,
+            max_tokens=4096,
+        )
+
+        choice = response.choices[0]
+        executed_tools = self._executed_tools(choice.message)
+        items, complete = self._extract_items(choice.message.content or "[]")
+
+        results: dict[SearchTarget, list[VenueData]] = {t: [] for t in targets}
+        last: Optional[SearchTarget] = None
+        unlabelled = 0
+        for item in items:
+            label = str(item.get("target", "") if isinstance(item, dict) else "")
+            label = label.strip().upper().lstrip("T")
+            if not label.isdigit() or not 1 <= int(label) <= len(targets):
+                unlabelled += 1
+                continue
+            target = targets[int(label) - 1]
+            venue = self._item_to_venue(item, target.state, target.country, target.category)
+            if venue is not None:
+                results[target].append(venue)
+                last = target
+        if unlabelled:
+            BATCH_UNLABELLED_ITEMS.inc(unlabelled)
+            logger.warning(f"Dropped {unlabelled} batch items without a valid target label")
+
+        # Redo targets the model skipped or left unlabelled, and the target
+        # a truncated response may have cut off, with single-target calls
+        truncated = not complete or choice.finish_reason == "length"
+        cut_off = last if truncated else None
+        retry = [t for t in targets if not results[t] or t == cut_off]
+        if retry:
+            logger.warning(
+                f"Retrying {len(retry)} of {len(targets)} batch targets"
+                f"{' after truncation' if truncated else ''}"
+            )
+            for target in retry:
+                venues, tools, _ = await self.search(
+                    target.state, target.country, target.category, max_results
+                )
+                results[target] = venues
+                executed_tools += tools
+
+        for target in targets:
+            results[target] = results[target][:max_results]
+        return results, executed_tools
+
+    @staticmethod
+    def _executed_tools(message: Any) -> list[str]:
+        """Get the types of the tools Groq Compound executed."""
+        tools = getattr(message, "executed_tools", None) or []
+        return [
+            (tool.get("type") if isinstance(tool, dict) else getattr(tool, "type", None))
+            or "unknown"
+            for tool in tools
+        ]
+
+    def _extract_items(self, content: str) -> tuple[list[Any], bool]:
+        """
+        Extract the JSON array of venue items from the model output.
+
+        Prose around the array is ignored, and output cut off mid-array
+        still yields every complete item.
+
+        Returns:
+            Tuple of (items, whether the whole array was present)
+        """
+        with PARSE_SECONDS.labels("complete").time():
+            items, complete = extract_items(content)
+        if not complete:
+            logger.warning(f"Incomplete JSON array in response, kept {len(items)} items")
+        return items, complete
+
+    @staticmethod
+    def _item_to_venue(
+        item: Any,
+        state: str,
+        country: str,
+        category: DataCategory,
+    ) -> Optional[VenueData]:
+        """Convert one extracted item into a VenueData, if it names a venue."""
+        if not isinstance(item, dict) or not item.get('name'):
+            return None
+
+        return VenueData(
+            name=item.get('name', 'Unknown'),
+            category=category,
+            state=state,
+            country=country,
+            address=item.get('address'),
+            website=item.get('website'),
+            phone=item.get('phone'),
+            email=item.get('email'),
+            description=item.get('description'),
+            source_url=item.get('source_url'),
+            latitude=_coordinate(item.get('latitude'), 90),
+            longitude=_coordinate(item.get('longitude'), 180),
+        )
+
     def _parse_venues(
         self,
         content: str,
@@ -166,38 +391,21 @@ SEARCH TASK: {query}
     ) -> list[VenueData]:
         """Parse JSON response into VenueData objects."""
         venues = []
+        items, _ = self._extract_items(content)
+        for item in items:
+            venue = self._item_to_venue(item, state, country, category)
+            if venue is not None:
+                venues.append(venue)
+        return venues
 
-        try:
-            # Try to extract JSON from the response
-            # Sometimes the model includes extra text
-            start_idx = content.find('[')
-            end_idx = content.rfind(']') + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                data = json.loads(json_str)
-
-                for item in data:
-                    if isinstance(item, dict) and item.get('name'):
-                        venue = VenueData(
-                            name=item.get('name', 'Unknown'),
-                            category=category,
-                            state=state,
-                            country=country,
-                            address=item.get('address'),
-                            website=item.get('website'),
-                            phone=item.get('phone'),
-                            email=item.get('email'),
-                            description=item.get('description'),
-                            source_url=item.get('source_url'),
-                        )
-                        venues.append(venue)
-
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON response: {e}")
-            # Return empty list if parsing fails
 
-        return venues
+def _coordinate(value: Any, bound: float) -> Optional[float]:
+    """Parse a coordinate from model output, dropping invalid values."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if -bound <= number <= bound else None
 
 
 # Singleton instance
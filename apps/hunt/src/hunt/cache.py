@@ -0,0 +1,242 @@
+"""Persistent response cache for agent searches."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from .config import get_settings
+from .models import SearchRequest
+from .storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache (last_used);
+"""
+
+
+class _FetchCancelled(Exception):
+    """Raised to callers sharing a fetch whose own caller was cancelled."""
+
+
+class SearchCache:
+    """
+    TTL cache for search results with LRU eviction.
+
+    Entries live in an in-memory LRU front and, when a path is given, in a
+    SQLite file that survives restarts. Both layers are bounded by
+    ``max_entries``. Concurrent lookups of the same key while an upstream
+    call is in flight share that call instead of issuing their own.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = 86400,
+        max_entries: int = 1000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the on-disk layer (memory only if None)
+            ttl_seconds: Lifetime of a cached entry
+            max_entries: Maximum entries kept in each layer
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(request: SearchRequest) -> str:
+        """Build a cache key from the normalized search request."""
+        normalized = {
+            "state": request.state.strip().lower(),
+            "country": request.country.strip().lower(),
+            "category": request.category.value,
+            "query": " ".join((request.query or "").lower().split()),
+            "max_results": request.max_results,
+        }
+        raw = json.dumps(normalized, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a fresh cached payload, or None."""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._touch(key, now)
+                return payload
+            del self._memory[key]
+
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT expires_at, payload FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        expires_at, raw = row
+        if expires_at <= now:
+            with self._db:
+                self._db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            return None
+
+        self._touch(key, now)
+        payload = json.loads(raw)
+        self._remember(key, expires_at, payload)
+        return payload
+
+    def _touch(self, key: str, now: float) -> None:
+        """Record a hit in the on-disk layer's LRU order."""
+        if self._db is None:
+            return
+        with self._db:
+            self._db.execute(
+                "UPDATE search_cache SET last_used = ? WHERE key = ?", (now, key)
+            )
+
+    def set(self, key: str, payload: dict) -> None:
+        """Store a payload under the given key."""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self._remember(key, expires_at, payload)
+
+        if self._db is None:
+            return
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache (key, expires_at, last_used, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (key, expires_at, now, json.dumps(payload, default=str)),
+            )
+            self._db.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "SELECT key FROM search_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def _remember(self, key: str, expires_at: float, payload: dict) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict]],
+        bypass: bool = False,
+        store: bool = True,
+    ) -> tuple[dict, bool]:
+        """
+        Return the cached payload or fetch it once for all concurrent callers.
+
+        Args:
+            key: Cache key from ``make_key``
+            fetch: Coroutine factory producing the payload on a miss
+            bypass: Skip the cached value and fetch a fresh one
+            store: Store a freshly fetched payload
+
+        Returns:
+            Tuple of (payload, whether it was served from cache)
+        """
+        if not bypass:
+            cached = self.get(key)
+            if cached is not None:
+                return cached, True
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            logger.debug(f"Joining in-flight search {key[:12]}")
+            try:
+                return await asyncio.shield(inflight), False
+            except _FetchCancelled:
+                # The caller that was fetching went away; retry, and take
+                # the fetch over if no other follower did first
+                inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await fetch()
+        except asyncio.CancelledError:
+            self._inflight.pop(key, None)
+            future.set_exception(_FetchCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(payload)
+        if store:
+            self.set(key, payload)
+        return payload, False
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._memory.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM search_cache")
+
+
+def parse_cache_control(header: Optional[str]) -> tuple[bool, bool]:
+    """
+    Interpret a ``Cache-Control`` request header.
+
+    Returns:
+        Tuple of (bypass cached value, store fresh value)
+    """
+    directives = {d.strip().lower() for d in (header or "").split(",")}
+    no_store = "no-store" in directives
+    bypass = no_store or "no-cache" in directives or "max-age=0" in directives
+    return bypass, not no_store
+
+
+# Singleton instance
+_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get or create the search cache instance."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = SearchCache(
+            path=settings.search_cache_path or DATA_DIR / "search_cache.db",
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            max_entries=settings.search_cache_max_entries,
+        )
+    return _cache
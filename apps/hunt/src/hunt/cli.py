@@ -0,0 +1,201 @@
+"""Command-line maintenance tasks for Hunt.
+
+Run with ``uv run python -m src.hunt.cli <command>``.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+
+from .storage import DATA_DIR, Storage
+
+
+def migrate_sqlite(args: argparse.Namespace) -> None:
+    """Copy the JSON venue store into a SQLite database."""
+    from .sqlite_storage import SqliteStorage, migrate_from_json
+
+    source = Storage(data_dir=args.data_dir)
+    target = SqliteStorage(args.db or args.data_dir / "hunt.db")
+    inserted = migrate_from_json(source, target)
+    print(f"Migrated {inserted} venues into {target.db_path}")
+
+
+def dedup(args: argparse.Namespace) -> None:
+    """Merge duplicate venues across the stored dataset."""
+    if args.db:
+        from .sqlite_storage import SqliteStorage
+
+        storage = SqliteStorage(args.db)
+    else:
+        storage = Storage(data_dir=args.data_dir)
+    summary = storage.deduplicate()
+    print(
+        f"Merged {summary['merged']} duplicate venues, "
+        f"{summary['remaining']} venues remain"
+    )
+
+
+def ingest_osm(args: argparse.Namespace) -> None:
+    """Import a state's volleyball facilities from OpenStreetMap data."""
+    from .osm import fetch_overpass, ingest, read_overpass_json, read_source
+
+    if args.overpass_url:
+        features = read_overpass_json(fetch_overpass(args.overpass_url, args.state, args.country))
+    elif args.source:
+        features = read_source(args.source)
+    else:
+        raise SystemExit("ingest-osm needs a source file or --overpass-url")
+
+    if args.db:
+        from .sqlite_storage import SqliteStorage
+
+        storage = SqliteStorage(args.db)
+    else:
+        storage = Storage(data_dir=args.data_dir)
+    summary = ingest(features, storage, args.state, args.country, batch_size=args.batch_size)
+    print(
+        f"Read {summary['features']} volleyball features, "
+        f"skipped {summary['skipped']} outside {args.state}, "
+        f"saved {summary['new_venues']} new venues"
+    )
+
+
+def export(args: argparse.Namespace) -> None:
+    """Write a columnar snapshot of the venue dataset."""
+    from .export import SnapshotExporter
+
+    if args.db:
+        from .sqlite_storage import SqliteStorage
+
+        storage = SqliteStorage(args.db)
+    else:
+        storage = Storage(data_dir=args.data_dir)
+    exporter = SnapshotExporter(args.output or args.data_dir / "exports")
+    entry = exporter.export(storage, format=args.format, full=args.full)
+    if entry is None:
+        print("No venues stored since the last export")
+        return
+    print(f"Exported {entry['rows']} venues to {exporter.directory / entry['file']}")
+
+
+def mock_groq(args: argparse.Namespace) -> None:
+    """Serve the offline Groq stand-in."""
+    import uvicorn
+
+    from .mock_groq import MockGroq, create_app, load_cassette
+
+    mock = MockGroq(
+        exchanges=load_cassette(args.cassette) if args.cassette else None,
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(mock), host=args.host, port=args.port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(prog="hunt", description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DATA_DIR,
+        help="Directory holding the JSON data files",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser(
+        "migrate-sqlite", help="Migrate JSON storage into a SQLite database"
+    )
+    migrate.add_argument(
+        "--db", type=Path, default=None, help="Target database (default: <data-dir>/hunt.db)"
+    )
+    migrate.set_defaults(func=migrate_sqlite)
+
+    dedup_parser = subparsers.add_parser(
+        "dedup", help="Merge duplicate venues across the stored dataset"
+    )
+    dedup_parser.add_argument(
+        "--db", type=Path, default=None, help="Deduplicate a SQLite database instead"
+    )
+    dedup_parser.set_defaults(func=dedup)
+
+    osm = subparsers.add_parser(
+        "ingest-osm", help="Import volleyball facilities from OpenStreetMap data"
+    )
+    osm.add_argument(
+        "source",
+        type=Path,
+        nargs="?",
+        default=None,
+        help="Extract to read: .osm[.gz|.bz2], .osm.pbf (needs pyosmium) or Overpass .json",
+    )
+    osm.add_argument("--state", required=True, help="State the extract covers")
+    osm.add_argument("--country", required=True, help="Country of the state (USA or India)")
+    osm.add_argument(
+        "--overpass-url", default=None, help="Query an Overpass-compatible endpoint instead"
+    )
+    osm.add_argument("--batch-size", type=int, default=1000, help="Venues per storage write")
+    osm.add_argument(
+        "--db", type=Path, default=None, help="Import into a SQLite database instead"
+    )
+    osm.set_defaults(func=ingest_osm)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Write a Parquet or Arrow snapshot of the venues (needs pyarrow)"
+    )
+    export_parser.add_argument(
+        "--format", choices=["parquet", "arrow"], default="parquet", help="Snapshot file format"
+    )
+    export_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Export every venue, not only those stored since the last export",
+    )
+    export_parser.add_argument(
+        "--output", type=Path, default=None, help="Export directory (default: <data-dir>/exports)"
+    )
+    export_parser.add_argument(
+        "--db", type=Path, default=None, help="Export a SQLite database instead"
+    )
+    export_parser.set_defaults(func=export)
+
+    mock = subparsers.add_parser(
+        "mock-groq", help="Serve a local Groq stand-in for offline load tests"
+    )
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8089)
+    mock.add_argument(
+        "--cassette", type=Path, default=None, help="Recorded exchanges to replay (JSON lines)"
+    )
+    mock.add_argument("--latency", type=float, default=0.0, help="Mean latency in seconds")
+    mock.add_argument("--jitter", type=float, default=0.0, help="Latency jitter in seconds")
+    mock.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    mock.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses"
+    )
+    mock.add_argument(
+        "--retry-after", type=float, default=1.0, help="retry-after of injected 429s"
+    )
+    mock.add_argument("--seed", type=int, default=None)
+    mock.set_defaults(func=mock_groq)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the command-line interface."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 
 import os
 from functools import lru_cache
-from typing import Optional
+from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,6 +20,19 @@ class Settings(BaseSettings):
     # Groq Configuration
     groq_api_key: str
 
+    # Groq Client Configuration
+    groq_timeout_seconds: float = 60.0
+    groq_connect_timeout_seconds: float = 10.0
+    groq_max_connections: int = 20
+    groq_max_concurrency: int = 4
+    groq_requests_per_minute: int = 30
+    groq_tokens_per_minute: int = 60000
+    groq_max_retries: int = 5
+    groq_backoff_base_seconds: float = 1.0
+    groq_backoff_max_seconds: float = 60.0
+    groq_base_url: Optional[str] = None  # e.g. a local mock-groq server
+    groq_record_path: Optional[Path] = None
+
     # LangSmith Configuration (optional)
     langchain_tracing_v2: bool = True
     langchain_api_key: Optional[str] = None
@@ -27,6 +41,38 @@ class Settings(BaseSettings):
     # Scheduler Configuration
     schedule_interval_minutes: int = 30
     results_per_run: int = 30
+    collection_workers: int = 0  # 0 runs one task per interval
+    collection_calls_per_minute: float = 6.0
+    collection_batch_size: int = 1  # Targets packed into one agent call
+    collection_cycle_pause_minutes: float = 60.0  # Rest after a round-robin cycle
+    scheduling_policy: Literal["yield", "round_robin"] = "yield"
+    scheduling_exploration: float = 1.0  # Weight of the exploration bonus
+    scheduling_half_life_hours: float = 168.0  # Decay of yield observations
+
+    # Query Pool Configuration
+    query_pool_batch_size: int = 8  # Queries generated per LLM call
+    query_pool_low_water: int = 2  # Pending queries that trigger a refill
+    query_pool_path: Optional[Path] = None
+
+    # Storage Configuration
+    storage_backend: Literal["json", "sqlite"] = "json"
+    sqlite_path: Optional[Path] = None
+    venue_segment_max_bytes: int = 8 * 1024 * 1024
+    venue_compact_min_segments: int = 4
+    journal_fsync_interval_seconds: float = 1.0  # 0 syncs every update
+
+    # Search Cache Configuration
+    search_cache_enabled: bool = True
+    search_cache_ttl_seconds: int = 86400
+    search_cache_max_entries: int = 1000
+    search_cache_path: Optional[Path] = None
+
+    # Profiling Configuration
+    profiling_enabled: bool = False
+    profiling_routes: str = ""  # Comma-separated path patterns, e.g. /api/stats
+    profiling_every_nth_run: int = 0  # 0 never profiles collection runs
+    profiling_max_profiles: int = 20
+    profiling_dir: Optional[Path] = None
 
     # Application Settings
     debug: bool = False
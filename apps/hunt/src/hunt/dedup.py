@@ -0,0 +1,301 @@
+"""Normalized venue deduplication with blocking keys."""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .geo import haversine_km
+from .models import VenueData
+
+# Tokens that do not distinguish one venue from another
+NAME_STOPWORDS = {
+    "the", "inc", "llc", "ltd", "lp", "llp", "co", "corp", "corporation",
+    "company", "pvt", "private", "limited", "incorporated",
+}
+
+# Hosts shared by many unrelated venues, useless as a blocking key
+SHARED_HOSTS = {
+    "facebook.com", "instagram.com", "google.com", "maps.google.com",
+    "goo.gl", "yelp.com", "linkedin.com", "twitter.com", "x.com",
+    "youtube.com", "justdial.com", "sites.google.com", "linktr.ee",
+}
+
+ADDRESS_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "boulevard": "blvd",
+    "drive": "dr", "lane": "ln", "suite": "ste", "highway": "hwy",
+    "parkway": "pkwy", "court": "ct", "place": "pl", "north": "n",
+    "south": "s", "east": "e", "west": "w",
+}
+
+# Minimum name similarity for venues sharing a phone, domain or address
+NAME_SIMILARITY_THRESHOLD = 0.6
+
+# Venues with coordinates farther apart than this are never the same place
+MAX_DUPLICATE_DISTANCE_KM = 2.0
+
+# Source URL of a venue imported from an OpenStreetMap element
+_OSM_ELEMENT_URL = re.compile(r"^https?://(?:www\.)?openstreetmap\.org/(node|way|relation)/(\d+)")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _ascii_tokens(value: str) -> list[str]:
+    """Lowercase, strip accents and split on anything but letters and digits."""
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    value = value.lower().replace("&", " and ")
+    return [t for t in _NON_ALNUM.split(value) if t]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a venue name, dropping punctuation and legal suffixes."""
+    return " ".join(t for t in _ascii_tokens(name) if t not in NAME_STOPWORDS)
+
+
+def name_signature(name: str) -> str:
+    """Order-insensitive token signature of a venue name."""
+    return " ".join(sorted(set(normalize_name(name).split())))
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Reduce a phone number to its last ten digits."""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def normalize_domain(url: Optional[str]) -> Optional[str]:
+    """Extract the registrable host of a URL, without ``www.``."""
+    if not url:
+        return None
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"http://{url}"
+
+    host = urlsplit(url).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def normalize_address(address: Optional[str]) -> Optional[str]:
+    """Normalize an address with common street abbreviations."""
+    if not address:
+        return None
+    tokens = [ADDRESS_ABBREVIATIONS.get(t, t) for t in _ascii_tokens(address)]
+    return " ".join(tokens) or None
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two venue names between 0 and 1."""
+    return SequenceMatcher(None, normalize_name(a), normalize_name(b)).ratio()
+
+
+def blocking_keys(venue: VenueData) -> list[str]:
+    """
+    Blocking keys of a venue.
+
+    Only venues sharing at least one blocking key are compared, which
+    keeps matching sub-quadratic. All keys are scoped to the venue's
+    state and country, matching the scope of the exact dedup key.
+    """
+    scope = f"{venue.state.lower()}|{venue.country.lower()}"
+    keys = []
+
+    signature = name_signature(venue.name)
+    if signature:
+        keys.append(f"name:{scope}:{signature}")
+
+    domain = normalize_domain(venue.website)
+    if domain and domain not in SHARED_HOSTS:
+        keys.append(f"domain:{scope}:{domain}")
+
+    phone = normalize_phone(venue.phone)
+    if phone:
+        keys.append(f"phone:{scope}:{phone}")
+
+    address = normalize_address(venue.address)
+    if address:
+        keys.append(f"address:{scope}:{address}")
+
+    return keys
+
+
+def is_duplicate(a: VenueData, b: VenueData) -> bool:
+    """
+    Decide whether two venues in a shared block are the same place.
+
+    Venues known to be different places never match: venues whose
+    coordinates are more than ``MAX_DUPLICATE_DISTANCE_KM`` apart, so
+    same-named venues in different cities stay separate, and venues
+    imported from different OpenStreetMap elements. Otherwise equal name
+    signatures always match. A shared phone, website domain or address
+    only matches when the names are also similar, so a city department
+    listing several courts under one number is not collapsed.
+    """
+    if a.state.lower() != b.state.lower() or a.country.lower() != b.country.lower():
+        return False
+
+    if distinct_places(a, b):
+        return False
+
+    if name_signature(a.name) == name_signature(b.name):
+        return True
+
+    shared_contact = (
+        _same(normalize_phone(a.phone), normalize_phone(b.phone))
+        or _same(normalize_domain(a.website), normalize_domain(b.website))
+        or _same(normalize_address(a.address), normalize_address(b.address))
+    )
+    return shared_contact and name_similarity(a.name, b.name) >= NAME_SIMILARITY_THRESHOLD
+
+
+def far_apart(a: VenueData, b: VenueData) -> bool:
+    """Whether both venues are located and too far apart to be one place."""
+    if a.location is None or b.location is None:
+        return False
+    return haversine_km(*a.location, *b.location) > MAX_DUPLICATE_DISTANCE_KM
+
+
+def osm_element(venue: VenueData) -> Optional[str]:
+    """The ``type/id`` of the OpenStreetMap element a venue came from, if any."""
+    match = _OSM_ELEMENT_URL.match(venue.source_url or "")
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+
+def distinct_places(a: VenueData, b: VenueData) -> bool:
+    """Whether two venues are known to be different places."""
+    if far_apart(a, b):
+        return True
+    element_a, element_b = osm_element(a), osm_element(b)
+    return element_a is not None and element_b is not None and element_a != element_b
+
+
+def distinct_key(key: str, venue: VenueData) -> str:
+    """
+    Storage key of a venue whose plain key is taken by a different place.
+
+    Appends the venue's OpenStreetMap element or its rounded coordinates,
+    so a venue sharing its name, state and country with another place gets
+    a key of its own and finds it again when saved later.
+    """
+    element = osm_element(venue)
+    if element is not None:
+        return f"{key}|osm:{element}"
+    lat, lon = venue.location
+    return f"{key}|{lat:.3f},{lon:.3f}"
+
+
+def _same(a: Optional[str], b: Optional[str]) -> bool:
+    return a is not None and a == b
+
+
+def merge_venues(primary: VenueData, duplicate: VenueData) -> VenueData:
+    """
+    Merge a duplicate into the primary record field by field.
+
+    The primary keeps its identity fields; missing contact fields and
+    coordinates are filled from the duplicate, the longer description wins
+    and the earliest collection time is kept.
+    """
+    update = {}
+    for field in ("address", "website", "phone", "email", "source_url"):
+        if not getattr(primary, field) and getattr(duplicate, field):
+            update[field] = getattr(duplicate, field)
+
+    if primary.location is None and duplicate.location is not None:
+        update["latitude"], update["longitude"] = duplicate.location
+
+    if len(duplicate.description or "") > len(primary.description or ""):
+        update["description"] = duplicate.description
+
+    if duplicate.collected_at < primary.collected_at:
+        update["collected_at"] = duplicate.collected_at
+
+    return primary.model_copy(update=update) if update else primary
+
+
+class DedupIndex:
+    """Blocking index mapping blocking keys to stored venue keys."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._blocks: dict[str, list[str]] = {}
+
+    def add(self, key: str, venue: VenueData) -> None:
+        """Register a stored venue under its blocking keys."""
+        for block in blocking_keys(venue):
+            members = self._blocks.setdefault(block, [])
+            if key not in members:
+                members.append(key)
+
+    def candidates(self, venue: VenueData) -> Iterable[str]:
+        """Stored venue keys sharing a block with the venue."""
+        seen = set()
+        for block in blocking_keys(venue):
+            for key in self._blocks.get(block, ()):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def find(
+        self,
+        venue: VenueData,
+        lookup: Callable[[str], Optional[VenueData]],
+    ) -> Optional[str]:
+        """
+        Find the stored duplicate of a venue.
+
+        Args:
+            venue: Incoming venue
+            lookup: Returns the stored venue for a key
+
+        Returns:
+            Key of the matching stored venue, or None
+        """
+        for key in self.candidates(venue):
+            existing = lookup(key)
+            if existing is not None and is_duplicate(existing, venue):
+                return key
+        return None
+
+
+def find_duplicates(
+    venues: Iterable[tuple[str, VenueData]],
+) -> tuple[dict[str, VenueData], list[str]]:
+    """
+    Find and merge duplicates across a whole dataset in one pass.
+
+    The first venue of every duplicate group survives and absorbs the
+    fields of the later ones.
+
+    Args:
+        venues: (key, venue) pairs in insertion order
+
+    Returns:
+        Tuple of (survivors changed by a merge, keys of merged-away venues)
+    """
+    index = DedupIndex()
+    survivors: dict[str, VenueData] = {}
+    changed: set[str] = set()
+    removed: list[str] = []
+
+    for key, venue in venues:
+        match = index.find(venue, survivors.get)
+        if match is None:
+            survivors[key] = venue
+            index.add(key, venue)
+            continue
+
+        removed.append(key)
+        merged = merge_venues(survivors[match], venue)
+        if merged is not survivors[match]:
+            survivors[match] = merged
+            changed.add(match)
+            index.add(match, merged)
+
+    return {key: survivors[key] for key in changed}, removed
@@ -0,0 +1,270 @@
+"""Columnar snapshot export of the venue dataset.
+
+Snapshots are written as Parquet files or Arrow IPC files, which analytics
+jobs can memory-map, with ``category``, ``state`` and ``country`` stored
+as dictionary-encoded categoricals. A manifest records every snapshot and
+the storage cursor of the last exported venue, so incremental snapshots
+hold only the venues stored since. Each snapshot has a stats sidecar
+with the per-category, per-country and per-state counts of its rows.
+
+Requires pyarrow (``pip install pyarrow``).
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Literal, Optional
+
+from .journal import atomic_write
+from .models import DataCategory, VenueData
+
+logger = logging.getLogger(__name__)
+
+SnapshotFormat = Literal["parquet", "arrow"]
+
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# String columns following the categorical ones
+STRING_COLUMNS = (
+    "address",
+    "website",
+    "phone",
+    "email",
+    "description",
+    "source_url",
+)
+
+# Rows converted to Arrow at a time
+BATCH_ROWS = 10_000
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow, which snapshot export needs."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("Snapshot export requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def snapshot_schema(pa: Any) -> Any:
+    """Arrow schema of a venue snapshot."""
+    return pa.schema(
+        [
+            ("name", pa.string()),
+            ("category", pa.dictionary(pa.int8(), pa.string())),
+            ("state", pa.dictionary(pa.int16(), pa.string())),
+            ("country", pa.dictionary(pa.int8(), pa.string())),
+            *[(column, pa.string()) for column in STRING_COLUMNS],
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("collected_at", pa.timestamp("us")),
+        ]
+    )
+
+
+class SnapshotExporter:
+    """
+    Writes venue snapshots and keeps their manifest.
+
+    ``manifest.json`` in the export directory lists every snapshot, oldest
+    first, and the watermark: the highest storage cursor exported so far.
+    Cursors are assigned when a venue is first stored and only grow, so
+    incremental snapshots resume after the watermark and pick up every
+    venue stored since, however long before its ``collected_at`` lies.
+    Fields a merge adds to an already exported venue only show up in the
+    next full snapshot.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the exporter.
+
+        Args:
+            directory: Directory for snapshots and the manifest
+        """
+        self.directory = directory
+        self.manifest_path = directory / "manifest.json"
+
+    def load_manifest(self) -> dict:
+        """Read the manifest, or an empty one before the first export."""
+        if not self.manifest_path.exists():
+            return {"watermark": None, "snapshots": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict) -> None:
+        # Written atomically, so readers never see a partial manifest
+        atomic_write(self.manifest_path, json.dumps(manifest, indent=2))
+
+    def export(
+        self,
+        storage: Any,
+        format: SnapshotFormat = "parquet",
+        full: bool = False,
+    ) -> Optional[dict]:
+        """
+        Write a snapshot of the venues stored since the last export.
+
+        Args:
+            storage: Storage backend to read venues from
+            format: ``parquet`` or ``arrow`` (Arrow IPC file)
+            full: Export every venue regardless of the watermark
+
+        Returns:
+            The manifest entry of the new snapshot, or None if no venue
+            was stored since the last export
+        """
+        pa = _pyarrow()
+        manifest = self.load_manifest()
+        since = manifest["watermark"]
+        if not isinstance(since, int):
+            # Manifests of older versions hold a collected_at watermark,
+            # which cannot be mapped onto a cursor
+            if since is not None:
+                logger.info("Manifest has a timestamp watermark, exporting every venue")
+            full = True
+        if full:
+            since = None
+
+        # Dictionaries are fixed up front so every batch shares them. The
+        # snapshot ends at the newest venue seen here, leaving venues saved
+        # meanwhile to the next one
+        states: set[str] = set()
+        countries: set[str] = set()
+        until: Optional[int] = None
+        for cursor, venue in storage.iter_venues(after=since):
+            states.add(venue.state)
+            countries.add(venue.country)
+            until = cursor
+        if until is None:
+            logger.info("No venues stored since the last export")
+            return None
+
+        categoricals = {
+            column: (pa.array(values, pa.string()), {value: i for i, value in enumerate(values)})
+            for column, values in (
+                ("category", [c.value for c in DataCategory]),
+                ("state", sorted(states)),
+                ("country", sorted(countries)),
+            )
+        }
+        kind = "full" if since is None else "incremental"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        path = self.directory / f"venues-{stamp}-{kind}{SUFFIXES[format]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        stats = _Counts()
+        schema = snapshot_schema(pa)
+        with _writer(pa, path, schema, format) as writer:
+            for batch in _batches(_venues_until(storage, since, until), BATCH_ROWS):
+                writer.write_batch(_record_batch(pa, schema, batch, categoricals))
+                for venue in batch:
+                    stats.add(venue)
+
+        sidecar = path.with_name(path.name + ".stats.json")
+        sidecar.write_text(json.dumps(stats.to_dict(), indent=2), encoding="utf-8")
+
+        entry = {
+            "file": path.name,
+            "stats": sidecar.name,
+            "format": format,
+            "kind": kind,
+            "rows": stats.total,
+            "since": since,
+            "until": until,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        manifest["snapshots"].append(entry)
+        manifest["watermark"] = until
+        self._save_manifest(manifest)
+        logger.info(f"Exported {stats.total} venues to {path.name}")
+        return entry
+
+
+class _Counts:
+    """Per-category, per-country and per-state counts of exported rows."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_category: dict[str, int] = {}
+        self.by_country: dict[str, int] = {}
+        self.by_state: dict[str, int] = {}
+
+    def add(self, venue: VenueData) -> None:
+        self.total += 1
+        for counts, key in (
+            (self.by_category, venue.category.value),
+            (self.by_country, venue.country),
+            (self.by_state, f"{venue.state}, {venue.country}"),
+        ):
+            counts[key] = counts.get(key, 0) + 1
+
+    def to_dict(self) -> dict:
+        """Counts in the shape of ``Storage.get_stats``."""
+        return {
+            "total_venues": self.total,
+            "by_category": self.by_category,
+            "by_country": self.by_country,
+            "by_state": self.by_state,
+        }
+
+
+def _venues_until(storage: Any, since: Optional[int], until: int) -> Iterator[VenueData]:
+    """Venues stored after the ``since`` cursor, up to the ``until`` cursor."""
+    for cursor, venue in storage.iter_venues(after=since):
+        if cursor > until:
+            return
+        yield venue
+
+
+def _batches(venues: Iterator[VenueData], size: int) -> Iterator[list[VenueData]]:
+    batch: list[VenueData] = []
+    for venue in venues:
+        batch.append(venue)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _record_batch(pa: Any, schema: Any, venues: list[VenueData], categoricals: dict) -> Any:
+    """Convert venues to a record batch using the snapshot dictionaries."""
+    values = {
+        "category": [v.category.value for v in venues],
+        "state": [v.state for v in venues],
+        "country": [v.country for v in venues],
+    }
+    columns = {"name": pa.array([v.name for v in venues], pa.string())}
+    for column, (dictionary, positions) in categoricals.items():
+        indices = pa.array(
+            [positions[value] for value in values[column]], schema.field(column).type.index_type
+        )
+        columns[column] = pa.DictionaryArray.from_arrays(indices, dictionary)
+    for column in STRING_COLUMNS:
+        columns[column] = pa.array([getattr(v, column) for v in venues], pa.string())
+    columns["latitude"] = pa.array([v.latitude for v in venues], pa.float64())
+    columns["longitude"] = pa.array([v.longitude for v in venues], pa.float64())
+    columns["collected_at"] = pa.array([v.collected_at for v in venues], pa.timestamp("us"))
+    return pa.record_batch([columns[f.name] for f in schema], schema=schema)
+
+
+@contextmanager
+def _writer(pa: Any, path: Path, schema: Any, format: SnapshotFormat) -> Iterator[Any]:
+    """Open a Parquet or Arrow IPC file writer, removing the file on error."""
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    try:
+        yield writer
+    except BaseException:
+        writer.close()
+        path.unlink(missing_ok=True)
+        raise
+    writer.close()
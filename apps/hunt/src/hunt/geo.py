@@ -0,0 +1,165 @@
+"""Geographic distance helpers and a grid index for venue coordinates."""
+
+import math
+from typing import Iterator, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """
+    Latitude/longitude box containing every point within ``radius_km``.
+
+    Uses the exact spherical bounds, so no point inside the radius falls
+    outside the box. When the radius reaches a pole the box covers every
+    longitude.
+
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon); ``min_lon`` may be
+        greater than ``max_lon`` when the box crosses the antimeridian
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = lat - math.degrees(angle)
+    max_lat = lat + math.degrees(angle)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    ratio = math.sin(angle) / math.cos(math.radians(lat))
+    if ratio >= 1.0:
+        return min_lat, max_lat, -180.0, 180.0
+    d_lon = math.degrees(math.asin(ratio))
+    return min_lat, max_lat, _wrap(lon - d_lon), _wrap(lon + d_lon)
+
+
+def _wrap(lon: float) -> float:
+    """Normalize a longitude to [-180, 180)."""
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+class GeoGrid:
+    """
+    Point index bucketing coordinates into fixed-size lat/lon cells.
+
+    A radius query visits only the cells overlapping the radius' bounding
+    box, and a nearest-neighbour query widens its radius until it holds
+    enough points, so neither scans the whole dataset.
+    """
+
+    def __init__(self, cell_degrees: float = 0.1):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_degrees: Cell edge length in degrees (0.1 is about 11 km)
+        """
+        self.cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], dict[int, tuple[float, float]]] = {}
+        self._points: dict[int, tuple[int, int]] = {}
+        self._rows = math.ceil(180 / cell_degrees)
+        self._columns = math.ceil(360 / cell_degrees)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        row = min(int((lat + 90.0) / self.cell_degrees), self._rows - 1)
+        column = int((_wrap(lon) + 180.0) / self.cell_degrees) % self._columns
+        return row, column
+
+    def add(self, point_id: int, lat: float, lon: float) -> None:
+        """Add a point, or move it if the id is already indexed."""
+        self.remove(point_id)
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[point_id] = (lat, lon)
+        self._points[point_id] = cell
+
+    def remove(self, point_id: int) -> None:
+        """Remove a point if it is indexed."""
+        cell = self._points.pop(point_id, None)
+        if cell is None:
+            return
+        points = self._cells[cell]
+        del points[point_id]
+        if not points:
+            del self._cells[cell]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[tuple[float, int]]:
+        """
+        Points within a radius, nearest first.
+
+        Returns:
+            List of (distance_km, point_id)
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        row_start, column_start = self._cell(min_lat, min_lon)
+        row_end, column_end = self._cell(max_lat, max_lon)
+        if min_lon == -180.0 and max_lon == 180.0:
+            column_start, column_end = 0, self._columns - 1
+
+        found = []
+        for cell in self._cells_in(row_start, row_end, column_start, column_end):
+            for point_id, (p_lat, p_lon) in self._cells.get(cell, {}).items():
+                distance = haversine_km(lat, lon, p_lat, p_lon)
+                if distance <= radius_km:
+                    found.append((distance, point_id))
+        found.sort()
+        return found
+
+    def _cells_in(
+        self, row_start: int, row_end: int, column_start: int, column_end: int
+    ) -> Iterator[tuple[int, int]]:
+        """Cells of a box, wrapping columns across the antimeridian."""
+        columns = (
+            range(column_start, column_end + 1)
+            if column_start <= column_end
+            else list(range(column_start, self._columns)) + list(range(0, column_end + 1))
+        )
+        if (row_end - row_start + 1) * len(columns) > len(self._cells):
+            # Sparse grid: checking the occupied cells is cheaper
+            wanted = set(columns)
+            for cell in self._cells:
+                if row_start <= cell[0] <= row_end and cell[1] in wanted:
+                    yield cell
+            return
+        for row in range(row_start, row_end + 1):
+            for column in columns:
+                yield row, column
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_radius_km: Optional[float] = None,
+    ) -> list[tuple[float, int]]:
+        """
+        The ``k`` points nearest to a location.
+
+        Searches a radius of one cell and doubles it until it holds ``k``
+        points; every point outside that radius is farther than the
+        ``k``-th one, so the result is exact.
+
+        Returns:
+            List of (distance_km, point_id), nearest first
+        """
+        if k <= 0 or not self._points:
+            return []
+
+        limit = HALF_CIRCUMFERENCE_KM if max_radius_km is None else max_radius_km
+        radius = min(self.cell_degrees * KM_PER_DEGREE_LAT, limit)
+        while True:
+            found = self.within(lat, lon, radius)
+            if len(found) >= k or radius >= limit:
+                return found[:k]
+            radius = min(radius * 2, limit)
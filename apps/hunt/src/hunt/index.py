@@ -0,0 +1,282 @@
+"""In-process venue index with incrementally maintained statistics."""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Optional, Union
+
+from .geo import GeoGrid
+from .models import DataCategory, VenueData
+from .records import VenueRecord
+from .search import TextIndex
+
+
+class VenueIndex:
+    """
+    Venues held in memory with secondary indexes and running counters.
+
+    Venues are kept as compact ``VenueRecord``s and addressed by integer
+    ids. An id stays with its key for good: the storage layer persists
+    it, so scan cursors survive restarts and rebuilds, and new keys get
+    ids above every id in use.
+    Lookups by state, country and category walk only the matching ids,
+    and the statistics served by ``stats`` are updated on every insert,
+    so neither depends on the size of the dataset. Venues with
+    coordinates are also kept in a geographic grid for ``near`` queries,
+    and every venue in a full-text index for keyword ``search``.
+
+    The sorted id lists are never searched for removal: an id whose
+    venue was removed or moved to another state, country or category is
+    left in place and skipped by readers.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.venues: dict[int, VenueRecord] = {}
+        self._ids: dict[str, int] = {}
+        self._next_id = 0
+        self._all: list[int] = []
+        self._by_state: dict[str, list[int]] = {}
+        self._by_country: dict[str, list[int]] = {}
+        self._by_category: dict[str, list[int]] = {}
+        self._geo = GeoGrid()
+        self._text = TextIndex()
+
+        self._category_counts: dict[str, int] = {}
+        self._country_counts: dict[str, int] = {}
+        self._state_counts: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.venues)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def items(self) -> Iterator[tuple[str, VenueRecord]]:
+        """Iterate over (key, venue) pairs in insertion order."""
+        for key, venue_id in self._ids.items():
+            yield key, self.venues[venue_id]
+
+    def get(self, key: str) -> Optional[VenueRecord]:
+        """Get the venue stored under a key."""
+        venue_id = self._ids.get(key)
+        return self.venues[venue_id] if venue_id is not None else None
+
+    def reserve(self, venue_id: int) -> None:
+        """Keep ids up to ``venue_id`` from being assigned to new keys."""
+        self._next_id = max(self._next_id, venue_id + 1)
+
+    def venue_id(self, key: str) -> Optional[int]:
+        """Get the id of the venue stored under a key."""
+        return self._ids.get(key)
+
+    def add(
+        self,
+        key: str,
+        venue: Union[VenueData, VenueRecord],
+        venue_id: Optional[int] = None,
+    ) -> int:
+        """
+        Add a venue, or replace the venue already stored under its key.
+
+        Args:
+            key: Venue key
+            venue: Venue to store
+            venue_id: Id persisted for a new key; a fresh id is assigned if
+                not given or already taken
+
+        Returns:
+            Id of the venue
+        """
+        if isinstance(venue, VenueData):
+            venue = VenueRecord.from_venue(venue)
+        previous = None
+        if key in self._ids:
+            venue_id = self._ids[key]
+            previous = self.venues[venue_id]
+            self._unlink(venue_id)
+        else:
+            if venue_id is None or venue_id in self.venues:
+                venue_id = self._next_id
+            self._next_id = max(self._next_id, venue_id + 1)
+            self._ids[key] = venue_id
+            _insert_id(self._all, venue_id)
+
+        self.venues[venue_id] = venue
+        self._link(venue_id, previous)
+        return venue_id
+
+    def _link(self, venue_id: int, previous: Optional[VenueRecord] = None) -> None:
+        venue = self.venues[venue_id]
+        # A replaced venue normally keeps its state, country and category
+        # and with them its place in the id lists
+        for lists, value, old in (
+            (self._by_state, venue.state.lower(), previous and previous.state.lower()),
+            (self._by_country, venue.country.lower(), previous and previous.country.lower()),
+            (self._by_category, venue.category.value, previous and previous.category.value),
+        ):
+            if value != old:
+                _insert_id(lists.setdefault(value, []), venue_id)
+        if venue.location is not None:
+            self._geo.add(venue_id, *venue.location)
+        self._text.add(venue_id, venue)
+
+        _increment(self._category_counts, venue.category.value, 1)
+        _increment(self._country_counts, venue.country, 1)
+        _increment(self._state_counts, f"{venue.state}, {venue.country}", 1)
+
+    def _unlink(self, venue_id: int) -> None:
+        # Ids stay in the id lists; readers skip those that no longer match
+        venue = self.venues[venue_id]
+        self._geo.remove(venue_id)
+        self._text.remove(venue_id, venue)
+
+        _increment(self._category_counts, venue.category.value, -1)
+        _increment(self._country_counts, venue.country, -1)
+        _increment(self._state_counts, f"{venue.state}, {venue.country}", -1)
+
+    def by_state(self, state: str, country: Optional[str] = None) -> Iterator[VenueRecord]:
+        """Iterate over venues in a state, optionally within one country."""
+        for _, venue in self.scan(state=state, country=country or None):
+            yield venue
+
+    def by_country(self, country: str) -> Iterator[VenueRecord]:
+        """Iterate over venues in a country."""
+        for _, venue in self.scan(country=country):
+            yield venue
+
+    def by_category(self, category: DataCategory) -> Iterator[VenueRecord]:
+        """Iterate over venues in a category."""
+        for _, venue in self.scan(category=category):
+            yield venue
+
+    def near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        category: Optional[DataCategory] = None,
+    ) -> list[tuple[float, VenueRecord]]:
+        """
+        Venues nearest to a location, optionally within a radius.
+
+        Returns:
+            List of (distance_km, venue), nearest first
+        """
+        if category is None:
+            hits = self._geo.nearest(lat, lon, limit, max_radius_km=radius_km)
+        elif radius_km is not None:
+            hits = [
+                hit for hit in self._geo.within(lat, lon, radius_km)
+                if self.venues[hit[1]].category == category
+            ][:limit]
+        else:
+            # Widen the search until enough venues of the category turn up
+            k = limit
+            while True:
+                nearest = self._geo.nearest(lat, lon, k)
+                hits = [hit for hit in nearest if self.venues[hit[1]].category == category]
+                if len(hits) >= limit or len(nearest) < k:
+                    break
+                k *= 4
+            hits = hits[:limit]
+        return [(distance, self.venues[venue_id]) for distance, venue_id in hits]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+    ) -> tuple[int, list[tuple[float, VenueRecord]]]:
+        """
+        Venues matching a keyword query, best match first.
+
+        Returns:
+            Tuple of (number of matches, list of (score, venue))
+        """
+        accept = None
+        if state is not None or country is not None or category is not None:
+            state = state.lower() if state else None
+            country = country.lower() if country else None
+
+            def accept(venue_id: int) -> bool:
+                venue = self.venues[venue_id]
+                return (
+                    (state is None or venue.state.lower() == state)
+                    and (country is None or venue.country.lower() == country)
+                    and (category is None or venue.category == category)
+                )
+
+        total, hits = self._text.search(query, limit, offset, accept)
+        return total, [(score, self.venues[venue_id]) for score, venue_id in hits]
+
+    def scan(
+        self,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+        after: Optional[int] = None,
+    ) -> Iterator[tuple[int, VenueRecord]]:
+        """
+        Iterate over (id, venue) pairs matching the filters in id order.
+
+        Walks the narrowest matching id list and starts right after the
+        ``after`` id, so resuming a scan costs O(log n) to seek. Ids are
+        stable, so a cursor keeps its place while venues are added.
+        """
+        state = state.lower() if state is not None else None
+        country = country.lower() if country is not None else None
+        if state is not None:
+            ids = self._by_state.get(state, [])
+        elif country is not None:
+            ids = self._by_country.get(country, [])
+        elif category is not None:
+            ids = self._by_category.get(category.value, [])
+        else:
+            ids = self._all
+
+        start = bisect_right(ids, after) if after is not None else 0
+        for i in range(start, len(ids)):
+            venue_id = ids[i]
+            venue = self.venues.get(venue_id)
+            # Skips ids left behind by removed or moved venues
+            if venue is None:
+                continue
+            if state is not None and venue.state.lower() != state:
+                continue
+            if country is not None and venue.country.lower() != country:
+                continue
+            if category is not None and venue.category != category:
+                continue
+            yield venue_id, venue
+
+    def stats(self) -> dict:
+        """Get collection statistics from the running counters."""
+        return {
+            "total_venues": len(self.venues),
+            "by_category": dict(self._category_counts),
+            "by_country": dict(self._country_counts),
+            "by_state": dict(self._state_counts),
+        }
+
+
+def _increment(counts: dict[str, int], key: str, amount: int) -> None:
+    """Adjust a counter, dropping it once it reaches zero."""
+    value = counts.get(key, 0) + amount
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _insert_id(ids: list[int], venue_id: int) -> None:
+    """Insert an id into a sorted id list unless it is already there."""
+    if not ids or ids[-1] < venue_id:
+        # New ids are the largest, so this is the common case
+        ids.append(venue_id)
+        return
+    i = bisect_left(ids, venue_id)
+    if i == len(ids) or ids[i] != venue_id:
+        ids.insert(i, venue_id)
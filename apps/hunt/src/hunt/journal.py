@@ -0,0 +1,249 @@
+"""Crash-safe file writes and journaled JSON documents."""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def atomic_write(path: Path, text: str, fsync: bool = True) -> None:
+    """
+    Replace a file's contents atomically.
+
+    The text is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target, so readers and crashes only ever
+    see the old or the new contents, never a truncated file.
+
+    Args:
+        path: File to replace
+        text: New contents
+        fsync: Flush the file and its directory entry to disk
+    """
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if fsync:
+        fsync_directory(path.parent)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a directory entry to disk, where the platform supports it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def truncate_torn_tail(path: Path) -> bool:
+    """
+    Cut an unterminated last line left behind by a crash mid-append.
+
+    Returns:
+        Whether the file was truncated
+    """
+    if not path.exists():
+        return False
+
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return False
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return False
+
+        # Walk back to the last complete line
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                position += newline + 1
+                break
+        f.truncate(position)
+
+    logger.warning(f"Truncated torn write at the end of {path.name} ({size - position} bytes)")
+    return True
+
+
+class JournaledDocument:
+    """
+    A small JSON document updated through a write-ahead journal.
+
+    The document lives in a snapshot file. Updates are appended to a
+    journal as one JSON line each (``{"set": {...}}``, ``{"unset": [...]}``
+    or ``{"clear": true}``) instead of rewriting the snapshot, and once
+    the journal grows past ``checkpoint_entries`` the snapshot is replaced
+    atomically and the journal emptied. Journal appends are fsynced at
+    most once per ``fsync_interval_seconds``; ``flush`` forces it.
+
+    Opening a document recovers from a crash: leftover temporary files are
+    removed, a torn last journal line is cut off, and the journal is
+    replayed on top of the snapshot. Replaying entries already contained
+    in the snapshot is harmless, since every entry is a last-writer-wins
+    update.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        checkpoint_entries: int = 256,
+        fsync_interval_seconds: float = 1.0,
+    ):
+        """
+        Open the document, recovering it if needed.
+
+        Args:
+            path: Snapshot file; the journal sits next to it
+            checkpoint_entries: Journal length that triggers a checkpoint
+            fsync_interval_seconds: Minimum time between journal fsyncs;
+                0 fsyncs every update
+        """
+        self.path = path
+        self.journal_path = path.with_name(f"{path.stem}.journal")
+        self.checkpoint_entries = checkpoint_entries
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self._lock = threading.RLock()
+        self._journal_entries = 0
+        self._last_fsync = 0.0
+        self._dirty = False
+        self.data: dict[str, Any] = self._recover()
+
+    # Recovery
+    def _recover(self) -> dict[str, Any]:
+        """Load the snapshot and replay the journal on top of it."""
+        self.path.with_name(f"{self.path.name}.tmp").unlink(missing_ok=True)
+
+        data = self._load_snapshot()
+        truncate_torn_tail(self.journal_path)
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    try:
+                        _apply(data, json.loads(line))
+                    except (json.JSONDecodeError, AttributeError, TypeError):
+                        logger.warning(f"Skipping bad journal entry {self.journal_path.name}:{line_no}")
+                    self._journal_entries += 1
+        if self._journal_entries:
+            logger.info(f"Replayed {self._journal_entries} journal entries for {self.path.name}")
+        return data
+
+    def _load_snapshot(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Unreadable snapshot {self.path.name}, starting from journal: {e}")
+            return {}
+
+        if isinstance(data, list):
+            # Older files stored sets as plain lists
+            return {str(key): True for key in data}
+        return data if isinstance(data, dict) else {}
+
+    # Updates
+    def set(self, values: dict[str, Any]) -> None:
+        """Set fields, journaling only those that actually change."""
+        with self._lock:
+            changes = {k: v for k, v in values.items() if self.data.get(k, _MISSING) != v}
+            if changes:
+                self._write({"set": changes})
+
+    def unset(self, keys: list[str]) -> None:
+        """Remove fields."""
+        with self._lock:
+            present = [k for k in keys if k in self.data]
+            if present:
+                self._write({"unset": present})
+
+    def clear(self) -> None:
+        """Remove all fields."""
+        with self._lock:
+            if self.data:
+                self._write({"clear": True})
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        _apply(self.data, entry)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval_seconds:
+                os.fsync(f.fileno())
+                self._last_fsync = now
+                self._dirty = False
+            else:
+                self._dirty = True
+
+        self._journal_entries += 1
+        if self._journal_entries >= self.checkpoint_entries:
+            self.checkpoint()
+
+    # Durability
+    def flush(self) -> None:
+        """Fsync journal appends that were deferred by batching."""
+        with self._lock:
+            if not self._dirty or not self.journal_path.exists():
+                return
+            with open(self.journal_path, "rb") as f:
+                os.fsync(f.fileno())
+            self._last_fsync = time.monotonic()
+            self._dirty = False
+
+    def checkpoint(self) -> None:
+        """Write the document into the snapshot and empty the journal."""
+        with self._lock:
+            atomic_write(self.path, json.dumps(self.data, indent=2, default=str))
+            # A crash before this truncation only replays entries the
+            # snapshot already contains
+            if self.journal_path.exists():
+                with open(self.journal_path, "w"):
+                    pass
+            self._journal_entries = 0
+            self._dirty = False
+
+
+def _apply(data: dict[str, Any], entry: dict[str, Any]) -> None:
+    """Apply one journal entry to a document."""
+    if entry.get("clear"):
+        data.clear()
+    for key in entry.get("unset", ()):
+        data.pop(key, None)
+    data.update(entry.get("set", {}))
+
+
+def remove_stale_temp_files(directory: Path, pattern: str = "*.tmp") -> int:
+    """
+    Delete temporary files abandoned by an interrupted atomic write.
+
+    Returns:
+        Number of files removed
+    """
+    removed = 0
+    for path in directory.glob(pattern):
+        path.unlink(missing_ok=True)
+        removed += 1
+    if removed:
+        logger.warning(f"Removed {removed} stale temporary files from {directory}")
+    return removed
@@ -0,0 +1,174 @@
+"""Incremental extraction of JSON array items from LLM output."""
+
+import json
+import logging
+import re
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_ARRAY_START = re.compile(r"\[\s*\{")
+_DECODER = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    """
+    Pulls the items of a JSON array out of text as it arrives.
+
+    Text is fed in chunks of any size. Prose around the array is skipped,
+    including bracketed prose such as ``[sources below]``: only a ``[``
+    followed by an object, an array or ``]`` opens the array. Every item is
+    decoded as soon as its closing bracket arrives, so a response cut off
+    mid-array still yields all the complete items before the cut, and an
+    item that fails to decode is skipped without losing the others.
+    An empty array does not end the stream, since the model may mention
+    ``[]`` in prose before the real array.
+    """
+
+    def __init__(self):
+        """Initialize an empty stream."""
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._item_start = -1
+        self._in_string = False
+        self._escaped = False
+        self._array_items = 0
+        self._done = False
+        self.complete = False
+        self.items_skipped = 0
+
+    def feed(self, chunk: str) -> list[Any]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            Items completed by this chunk, in order
+        """
+        if self._done or not chunk:
+            return []
+
+        self._buffer += chunk
+        items: list[Any] = []
+        buffer = self._buffer
+        pos = self._pos
+
+        while pos < len(buffer):
+            if not self._in_array:
+                pos = buffer.find("[", pos)
+                if pos == -1:
+                    pos = len(buffer)
+                    break
+                opener = _next_significant(buffer, pos + 1)
+                if opener is None:
+                    break  # Wait for more text to decide
+                if opener not in "{[]":
+                    pos += 1
+                    continue
+                self._in_array = True
+                self.complete = False
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                if buffer[pos] == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                pos += 1
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+            char = buffer[pos]
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = pos
+                self._depth += 1
+            else:
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    self.complete = True
+                    self._in_array = False
+                    pos += 1
+                    if self._array_items:
+                        self._done = True
+                        break
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._item_start:pos + 1], items)
+                    self._item_start = -1
+            pos += 1
+
+        # Drop consumed text, keeping an unfinished item
+        keep = self._item_start if self._item_start >= 0 else pos
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._item_start >= 0:
+            self._item_start = 0
+        return items
+
+    def _emit(self, text: str, items: list[Any]) -> None:
+        self._array_items += 1
+        try:
+            items.append(json.loads(text))
+        except json.JSONDecodeError as e:
+            self.items_skipped += 1
+            logger.warning(f"Skipping malformed array item: {e}")
+
+
+def _next_significant(text: str, start: int) -> Optional[str]:
+    """First non-whitespace character at or after ``start``, if any."""
+    for i in range(start, len(text)):
+        if text[i] not in _WHITESPACE:
+            return text[i]
+    return None
+
+
+def extract_items(text: str) -> tuple[list[Any], bool]:
+    """
+    Extract array items from complete or partial model output.
+
+    Well-formed output is decoded in one pass; anything else goes through
+    the tolerant incremental parser.
+
+    Args:
+        text: The model output
+
+    Returns:
+        Tuple of (items, whether the array was closed)
+    """
+    start = _ARRAY_START.search(text)
+    if start is not None:
+        try:
+            data, _ = _DECODER.raw_decode(text, start.start())
+            if isinstance(data, list) and data:
+                return data, True
+        except json.JSONDecodeError:
+            pass
+
+    stream = JsonArrayStream()
+    items = stream.feed(text)
+    return items, stream.complete
@@ -0,0 +1,332 @@
+"""Shared asynchronous Groq client for all LLM calls."""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+from groq import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncGroq,
+    InternalServerError,
+    RateLimitError,
+)
+
+from .config import get_settings
+from .metrics import (
+    LLM_IN_FLIGHT,
+    LLM_RATE_LIMITED,
+    LLM_REQUEST_SECONDS,
+    LLM_RETRIES,
+    LLM_TOKENS,
+)
+from .rate_limit import RateLimiter, backoff_delay, estimate_tokens, parse_duration
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class LLMClient:
+    """
+    Async Groq client with a pooled HTTP connection and a concurrency cap.
+
+    A single instance is shared by the agent and the query generator, so
+    every request reuses the same connection pool, no more than
+    ``max_concurrency`` completions are in flight at once, and all calls
+    draw from one requests/tokens per-minute budget. Rate-limited and
+    transient failures are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout_seconds: float = 60.0,
+        connect_timeout_seconds: float = 10.0,
+        max_connections: int = 20,
+        max_concurrency: int = 4,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 60000,
+        max_retries: int = 5,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        base_url: Optional[str] = None,
+        record_path: Optional[Path] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Groq API key
+            timeout_seconds: Overall timeout for a single completion request
+            connect_timeout_seconds: Timeout for establishing a connection
+            max_connections: Size of the HTTP connection pool
+            max_concurrency: Maximum number of completions in flight
+            requests_per_minute: Request budget shared by all callers
+            tokens_per_minute: Token budget shared by all callers
+            max_retries: Retries for rate-limited or transient failures
+            backoff_base_seconds: Backoff ceiling of the first retry
+            backoff_max_seconds: Upper bound for the backoff ceiling
+            base_url: Alternative API endpoint, e.g. a local mock server
+            record_path: JSON-lines file to append every exchange to, for
+                replay by the mock server
+        """
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+        )
+        self.client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self.http_client,
+            timeout=timeout_seconds,
+            max_retries=0,  # Retries are handled here, against the shared budget
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.record_path = record_path
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter, created lazily inside the running event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def chat_completion(self, **kwargs: Any) -> Any:
+        """
+        Create a chat completion without blocking the event loop.
+
+        The call waits for room in the shared rate budget first, and is
+        retried on 429s, timeouts, connection errors and 5xx responses.
+
+        Args:
+            **kwargs: Arguments for ``chat.completions.create``
+
+        Returns:
+            The chat completion response
+        """
+        estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 1024))
+        model = kwargs.get("model", "")
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            try:
+                async with self.semaphore:
+                    LLM_IN_FLIGHT.inc()
+                    start = time.perf_counter()
+                    try:
+                        raw = await self.client.chat.completions.with_raw_response.create(**kwargs)
+                    finally:
+                        LLM_IN_FLIGHT.dec()
+                LLM_REQUEST_SECONDS.labels(model, "complete").observe(time.perf_counter() - start)
+                self.limiter.update_from_headers(raw.headers)
+                response = await raw.parse()
+
+                usage = getattr(response, "usage", None)
+                _observe_usage(model, usage)
+                if usage is not None and usage.total_tokens:
+                    self.limiter.record_usage(estimated, usage.total_tokens)
+                if self.record_path is not None:
+                    self._record(kwargs, response.to_dict())
+                return response
+
+            except RETRYABLE_ERRORS as e:
+                await self._back_off(attempt, e, model)
+
+    async def stream_completion(self, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Stream a chat completion chunk by chunk.
+
+        Budget, concurrency cap and retries work as in ``chat_completion``,
+        except that a call is only retried until its first chunk has been
+        yielded; a failure after that is raised to the caller, who may
+        already have acted on the partial output.
+
+        Args:
+            **kwargs: Arguments for ``chat.completions.create``
+
+        Yields:
+            Chat completion chunks
+        """
+        estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 1024))
+        model = kwargs.get("model", "")
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            started = False
+            try:
+                async with self.semaphore:
+                    LLM_IN_FLIGHT.inc()
+                    start = time.perf_counter()
+                    try:
+                        raw = await self.client.chat.completions.with_raw_response.create(
+                            stream=True, **kwargs
+                        )
+                        self.limiter.update_from_headers(raw.headers)
+                        stream = await raw.parse()
+
+                        recording = _StreamRecording()
+                        async for chunk in stream:
+                            started = True
+                            recording.add(chunk)
+                            yield chunk
+                    finally:
+                        LLM_IN_FLIGHT.dec()
+
+                LLM_REQUEST_SECONDS.labels(model, "stream").observe(time.perf_counter() - start)
+                _observe_usage(model, recording.usage)
+                if recording.usage is not None and recording.usage.total_tokens:
+                    self.limiter.record_usage(estimated, recording.usage.total_tokens)
+                if self.record_path is not None:
+                    self._record(kwargs, recording.to_dict())
+                return
+
+            except RETRYABLE_ERRORS as e:
+                if started:
+                    raise
+                await self._back_off(attempt, e, model)
+
+    async def _back_off(self, attempt: int, error: Exception, model: str = "") -> None:
+        """Wait before retrying a failed call, or raise once out of retries."""
+        retry_after = None
+        if isinstance(error, RateLimitError):
+            LLM_RATE_LIMITED.labels(model).inc()
+            self.limiter.update_from_headers(error.response.headers)
+            retry_after = parse_duration(error.response.headers.get("retry-after"))
+
+        if attempt == self.max_retries:
+            raise error
+        LLM_RETRIES.labels(model, error.__class__.__name__).inc()
+
+        delay = backoff_delay(
+            attempt, self.backoff_base_seconds, self.backoff_max_seconds, retry_after
+        )
+        if retry_after is not None:
+            # A 429 applies to every caller, not just this one
+            self.limiter.block_for(delay)
+        logger.warning(
+            f"Groq call failed ({error.__class__.__name__}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+
+    def _record(self, request: dict[str, Any], response: dict[str, Any]) -> None:
+        """Append an exchange to the recording file."""
+        exchange = {
+            "model": request.get("model"),
+            "messages": request.get("messages", []),
+            "response": response,
+        }
+        try:
+            self.record_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(exchange, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to record Groq exchange: {e}")
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.http_client.aclose()
+
+
+def _observe_usage(model: str, usage: Any) -> None:
+    """Record the token usage of a completion in the metrics."""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").observe(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, "completion").observe(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class _StreamRecording:
+    """Reassembles streamed chunks into a complete chat completion."""
+
+    def __init__(self):
+        """Initialize an empty recording."""
+        self.base: dict[str, Any] = {}
+        self.content: list[str] = []
+        self.executed_tools: list[Any] = []
+        self.finish_reason: Optional[str] = None
+        self.usage: Any = None
+
+    def add(self, chunk: Any) -> None:
+        """Fold one chunk into the completion."""
+        if not self.base:
+            self.base = {"id": chunk.id, "created": chunk.created, "model": chunk.model}
+        usage = chunk.usage or (chunk.x_groq.usage if chunk.x_groq else None)
+        if usage is not None:
+            self.usage = usage
+        if not chunk.choices:
+            return
+
+        choice = chunk.choices[0]
+        if choice.delta.content:
+            self.content.append(choice.delta.content)
+        if choice.delta.executed_tools:
+            self.executed_tools += [t.to_dict() for t in choice.delta.executed_tools]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+    def to_dict(self) -> dict[str, Any]:
+        """The reassembled completion in API format."""
+        return {
+            **self.base,
+            "object": "chat.completion",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": self.finish_reason,
+                    "message": {
+                        "role": "assistant",
+                        "content": "".join(self.content),
+                        "executed_tools": self.executed_tools,
+                    },
+                }
+            ],
+            "usage": self.usage.to_dict() if self.usage is not None else None,
+        }
+
+
+# Singleton instance
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """Get or create the shared LLM client instance."""
+    global _llm_client
+    if _llm_client is None:
+        settings = get_settings()
+        _llm_client = LLMClient(
+            api_key=settings.groq_api_key,
+            timeout_seconds=settings.groq_timeout_seconds,
+            connect_timeout_seconds=settings.groq_connect_timeout_seconds,
+            max_connections=settings.groq_max_connections,
+            max_concurrency=settings.groq_max_concurrency,
+            requests_per_minute=settings.groq_requests_per_minute,
+            tokens_per_minute=settings.groq_tokens_per_minute,
+            max_retries=settings.groq_max_retries,
+            backoff_base_seconds=settings.groq_backoff_base_seconds,
+            backoff_max_seconds=settings.groq_backoff_max_seconds,
+            base_url=settings.groq_base_url,
+            record_path=settings.groq_record_path,
+        )
+    return _llm_client
+
+
+async def close_llm_client() -> None:
+    """Close the shared LLM client if it was created."""
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.close()
+        _llm_client = None
@@ -5,10 +5,17 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from .config import get_settings
-from .routers import jobs, search
+from .llm import close_llm_client
+from .metrics import CONTENT_TYPE, REGISTRY
+from .policy import get_yield_policy
+from .profiling import ProfilingMiddleware
+from .query_pool import get_query_pool
+from .routers import admin, jobs, search, venues
 from .scheduler import get_scheduler
+from .storage import get_storage
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +34,9 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     settings.configure_langsmith()
 
+    # Build storage indexes before serving requests
+    get_storage().warm_up()
+
     # Start the scheduler
     scheduler = get_scheduler()
     scheduler.start()
@@ -38,6 +48,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down...")
     scheduler.stop()
+    get_query_pool().close()
+    if scheduler.policy is not None:
+        get_yield_policy().close()
+    await close_llm_client()
+    get_storage().close()
     logger.info("Shutdown complete")
 
 
@@ -57,10 +72,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
 
 # Include routers
 app.include_router(search.router)
+app.include_router(venues.router)
 app.include_router(jobs.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
@@ -73,6 +91,12 @@ async def health_check() -> dict:
     }
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Metrics in the Prometheus text exposition format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 async def root() -> dict:
     """Root endpoint with API info."""
@@ -81,11 +105,15 @@ async def root() -> dict:
         "version": "0.1.0",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
         "endpoints": {
             "search": "POST /api/search",
+            "search_stream": "POST /api/search/stream",
             "results": "GET /api/results/{state}",
             "stats": "GET /api/stats",
+            "venues_near": "GET /api/venues/near?lat=&lon=&radius=",
             "jobs": "GET /api/jobs",
             "trigger": "POST /api/jobs/trigger",
+            "profiles": "GET /api/admin/profiles",
         },
     }
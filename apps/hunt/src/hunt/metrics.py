@@ -0,0 +1,311 @@
+"""In-process metrics in the Prometheus text exposition format."""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+FAST_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+class _Metric:
+    """
+    A named metric with optional labels.
+
+    Label values are passed positionally to ``labels`` and resolve to a
+    child holding the actual value. Children are cached, so hot paths can
+    keep a child around and pay only for an uncontended lock per update.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels, if any
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Get the child for a combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        """The child of an unlabelled metric."""
+        return self.labels()
+
+    def _label_text(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        """Exposition lines of the metric."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines += self._render_child(values, child)
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        return [f"{self.name}{self._label_text(values)} {_format(child.value)}"]
+
+
+class _Value:
+    """A single counter or gauge value."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, or is read from a function on scrape."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], float]] = None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled gauge."""
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement an unlabelled gauge."""
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the unlabelled value from ``function`` at scrape time."""
+        self._function = function
+
+    def render(self) -> list[str]:
+        if self._function is not None:
+            try:
+                self.set(self._function())
+            except Exception:
+                pass  # Keep the last value if the source is unavailable
+        return super().render()
+
+
+class _HistogramValue:
+    """Bucket counts, sum and count of one histogram child."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the ``with`` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Observations counted in fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value of an unlabelled histogram."""
+        self._default().observe(value)
+
+    def time(self):
+        """Time a block with an unlabelled histogram."""
+        return self._default().time()
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramValue) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            le = self._label_text(values, f'le="{_format(bound)}"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        labels = self._label_text(values)
+        lines.append(f"{self.name}_sum{labels} {_format(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """The set of metrics exposed on ``/metrics``."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric, returning the one already registered under its name."""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+# LLM calls
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "hunt_llm_request_duration_seconds",
+    "Duration of Groq completion calls, including streaming.",
+    ("model", "mode"),
+))
+LLM_TOKENS = REGISTRY.register(Histogram(
+    "hunt_llm_tokens",
+    "Tokens used per Groq completion.",
+    ("model", "kind"),
+    buckets=TOKEN_BUCKETS,
+))
+LLM_RATE_LIMITED = REGISTRY.register(Counter(
+    "hunt_llm_rate_limited_total", "Groq calls answered with a 429.", ("model",)
+))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "hunt_llm_retries_total", "Groq calls retried after a failure.", ("model", "error")
+))
+LLM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "hunt_llm_requests_in_flight", "Groq completions currently running."
+))
+
+# Parsing
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    "hunt_parse_duration_seconds",
+    "Time spent extracting venues from model output.",
+    ("mode",),
+    buckets=FAST_BUCKETS,
+))
+BATCH_UNLABELLED_ITEMS = REGISTRY.register(Counter(
+    "hunt_batch_unlabelled_items_total",
+    "Batch search items dropped for lacking a valid target label.",
+))
+
+# Storage
+STORAGE_SECONDS = REGISTRY.register(Histogram(
+    "hunt_storage_duration_seconds",
+    "Duration of storage operations.",
+    ("backend", "operation"),
+    buckets=FAST_BUCKETS,
+))
+VENUES_FOUND = REGISTRY.register(Counter(
+    "hunt_venues_found_total", "Venues passed to storage for saving."
+))
+VENUES_NEW = REGISTRY.register(Counter(
+    "hunt_venues_new_total", "Venues stored as new."
+))
+VENUE_DUPLICATES = REGISTRY.register(Counter(
+    "hunt_venue_duplicates_total",
+    "Saved venues matched to a stored venue, by exact key or dedup blocking.",
+    ("match",),
+))
+DATASET_VENUES = REGISTRY.register(Gauge(
+    "hunt_dataset_venues", "Venues in the dataset."
+))
+
+# Collection
+COLLECTION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "hunt_collection_queue_depth", "Collection tasks waiting in the work queue."
+))
+COLLECTION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "hunt_collection_in_flight", "Collection searches currently running."
+))
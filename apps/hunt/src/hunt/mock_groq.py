@@ -0,0 +1,294 @@
+"""Local stand-in for the Groq chat completions API.
+
+Replays recorded completions, or synthesizes plausible ones, so the
+collection pipeline can be load-tested without spending Groq quota.
+Point the service at it with ``GROQ_BASE_URL=http://127.0.0.1:8089`` and
+run it with ``uv run python -m src.hunt.cli mock-groq``.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from itertools import count
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+_NAME_WORDS = [
+    "Beach", "Spike", "Ace", "Rally", "Summit", "Coastal", "Valley", "Metro",
+    "Sunset", "Lakeside", "Central", "Elite", "Premier", "Community", "Harbor",
+]
+_TASK_PATTERN = re.compile(r"^(T\d+): Find up to \d+ (\w+) in (.+)$", re.MULTILINE)
+_QUERY_COUNT = re.compile(r"Return ONLY the (\d+) queries")
+
+
+def load_cassette(path: Path) -> list[dict[str, Any]]:
+    """
+    Load recorded exchanges from a JSON-lines cassette.
+
+    Every line holds ``{"model": ..., "messages": [...], "response": {...}}``
+    as written by ``LLMClient`` when ``GROQ_RECORD_PATH`` is set.
+    """
+    exchanges = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                exchanges.append(json.loads(line))
+    return exchanges
+
+
+class MockGroq:
+    """
+    Replays chat completions with configurable latency and failures.
+
+    A request is answered with the recording of the same prompt if there
+    is one, otherwise with the next recording for the same model in
+    rotation, otherwise with a synthesized response. Injected 429s carry
+    ``retry-after`` and ``x-ratelimit-*`` headers like the real API.
+    """
+
+    def __init__(
+        self,
+        exchanges: Optional[list[dict[str, Any]]] = None,
+        latency_seconds: float = 0.0,
+        latency_jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        requests_per_minute: int = 30,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the mock.
+
+        Args:
+            exchanges: Recorded exchanges to replay
+            latency_seconds: Mean response latency
+            latency_jitter_seconds: Maximum deviation from the mean latency
+            error_rate: Fraction of requests answered with a 500
+            rate_limit_rate: Fraction of requests answered with a 429
+            retry_after_seconds: ``retry-after`` sent with injected 429s
+            requests_per_minute: Limit reported in the rate-limit headers
+            seed: Seed for latency, failure and content randomness
+        """
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.requests_per_minute = requests_per_minute
+        self._rng = random.Random(seed)
+        self._ids = count(1)
+
+        self._by_prompt: dict[str, dict[str, Any]] = {}
+        self._by_model: dict[str, list[dict[str, Any]]] = {}
+        self._rotation: dict[str, int] = {}
+        for exchange in exchanges or []:
+            self._by_prompt[_prompt_key(exchange.get("messages", []))] = exchange["response"]
+            self._by_model.setdefault(exchange.get("model", ""), []).append(exchange["response"])
+
+        self.stats = {"requests": 0, "replayed": 0, "synthesized": 0, "errors": 0, "rate_limited": 0}
+
+    async def handle(self, body: dict[str, Any]) -> tuple[int, dict[str, Any], dict[str, str]]:
+        """
+        Answer one chat completion request.
+
+        Returns:
+            Tuple of (status code, JSON body, headers)
+        """
+        self.stats["requests"] += 1
+        delay = self.latency_seconds + self._rng.uniform(
+            -self.latency_jitter_seconds, self.latency_jitter_seconds
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        headers = {
+            "x-ratelimit-limit-requests": str(self.requests_per_minute),
+            "x-ratelimit-remaining-requests": str(self.requests_per_minute),
+            "x-ratelimit-reset-requests": "0s",
+        }
+
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            headers["retry-after"] = str(self.retry_after_seconds)
+            headers["x-ratelimit-remaining-requests"] = "0"
+            headers["x-ratelimit-reset-requests"] = f"{self.retry_after_seconds}s"
+            return 429, _error("Rate limit reached", "rate_limit_exceeded"), headers
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return 500, _error("Internal server error", "internal_server_error"), headers
+
+        response = self._replay(body)
+        if response is None:
+            self.stats["synthesized"] += 1
+            response = self._synthesize(body)
+        else:
+            self.stats["replayed"] += 1
+
+        # Fresh ids keep replayed responses distinguishable in logs
+        response = {**response, "id": f"chatcmpl-mock-{next(self._ids)}", "created": int(time.time())}
+        return 200, response, headers
+
+    def _replay(self, body: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Find a recorded response for the request."""
+        response = self._by_prompt.get(_prompt_key(body.get("messages", [])))
+        if response is not None:
+            return response
+
+        model = body.get("model", "")
+        recordings = self._by_model.get(model)
+        if not recordings:
+            return None
+        position = self._rotation.get(model, 0)
+        self._rotation[model] = position + 1
+        return recordings[position % len(recordings)]
+
+    def _synthesize(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Build a plausible response for a request with no recording."""
+        messages = body.get("messages", [])
+        prompt = messages[-1].get("content", "") if messages else ""
+
+        executed_tools = []
+        if "JSON array" in prompt:
+            content = json.dumps(self._synthesize_venues(prompt), indent=2)
+            executed_tools = [{"index": 0, "type": "search", "arguments": "{}"}]
+        else:
+            lines = _QUERY_COUNT.search(prompt)
+            content = "\n".join(
+                f"volleyball {self._rng.choice(_NAME_WORDS).lower()} courts contact {n}"
+                for n in range(int(lines.group(1)) if lines else 1)
+            )
+
+        prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "object": "chat.completion",
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": content,
+                        "executed_tools": executed_tools,
+                    },
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _synthesize_venues(self, prompt: str) -> list[dict[str, Any]]:
+        """Synthesize venue items, tagged per task for batch prompts."""
+        tasks = _TASK_PATTERN.findall(prompt) or [(None, "venues", "the area")]
+        items = []
+        for task_id, category, place in tasks:
+            for _ in range(self._rng.randint(3, 8)):
+                name = (
+                    f"{self._rng.choice(_NAME_WORDS)} {self._rng.choice(_NAME_WORDS)} "
+                    f"Volleyball {self._rng.randint(1, 10**6)}"
+                )
+                slug = name.lower().replace(" ", "")
+                item = {
+                    "name": name,
+                    "address": f"{self._rng.randint(1, 9999)} Main Street, {place}",
+                    "website": f"https://{slug}.example.com",
+                    "phone": f"+1 555-{self._rng.randint(100, 999)}-{self._rng.randint(0, 9999):04d}",
+                    "email": f"info@{slug}.example.com",
+                    "description": f"Volleyball {category} in {place}",
+                    "source_url": f"https://directory.example.com/{slug}",
+                }
+                if task_id:
+                    item["target"] = task_id
+                items.append(item)
+        return items
+
+
+def stream_chunks(response: dict[str, Any], chunk_chars: int = 64) -> Iterator[str]:
+    """
+    Split a completion into server-sent chat completion chunks.
+
+    Executed tools are sent in the first delta and usage in the last
+    chunk's ``x_groq`` field, as Groq does for compound models.
+    """
+    choice = response["choices"][0]
+    message = choice["message"]
+    content = message.get("content") or ""
+    base = {
+        "id": response["id"],
+        "object": "chat.completion.chunk",
+        "created": response["created"],
+        "model": response["model"],
+    }
+
+    def chunk(delta: dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> str:
+        payload = {
+            **base,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    first: dict[str, Any] = {"role": "assistant", "content": ""}
+    if message.get("executed_tools"):
+        first["executed_tools"] = message["executed_tools"]
+    yield chunk(first)
+    for start in range(0, len(content), chunk_chars):
+        yield chunk({"content": content[start:start + chunk_chars]})
+    yield chunk(
+        {},
+        choice.get("finish_reason", "stop"),
+        x_groq={"id": response["id"], "usage": response.get("usage")},
+    )
+    yield "data: [DONE]\n\n"
+
+
+def _prompt_key(messages: list[dict[str, Any]]) -> str:
+    """Key identifying a prompt independently of formatting."""
+    return json.dumps(
+        [(m.get("role"), m.get("content")) for m in messages], sort_keys=True
+    )
+
+
+def _error(message: str, code: str) -> dict[str, Any]:
+    """Build an error body in the Groq API format."""
+    return {"error": {"message": message, "type": "api_error", "code": code, "id": uuid.uuid4().hex}}
+
+
+def create_app(mock: MockGroq) -> FastAPI:
+    """Create the ASGI app serving the mock completions endpoint."""
+    app = FastAPI(title="Mock Groq")
+    app.state.mock = mock
+
+    @app.post(COMPLETIONS_PATH)
+    async def chat_completions(request: Request) -> JSONResponse:
+        payload = await request.json()
+        status, body, headers = await mock.handle(payload)
+        if status == 200 and payload.get("stream"):
+            return StreamingResponse(
+                stream_chunks(body), media_type="text/event-stream", headers=headers
+            )
+        return JSONResponse(body, status_code=status, headers=headers)
+
+    @app.get("/stats")
+    async def stats() -> dict:
+        return dict(mock.stats)
+
+    return app
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class DataCategory(str, Enum):
@@ -64,12 +64,41 @@ class VenueData(BaseModel):
     email: Optional[str] = Field(None, description="Contact email")
     description: Optional[str] = Field(None, description="Description of the venue")
     source_url: Optional[str] = Field(None, description="URL where this info was found")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Latitude (WGS84)")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Longitude (WGS84)")
     collected_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @property
+    def location(self) -> Optional[tuple[float, float]]:
+        """The (latitude, longitude) pair, if both are known."""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
     class Config:
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class SearchTarget(BaseModel):
+    """A single (state, country, category) search target."""
+
+    model_config = ConfigDict(frozen=True)
+
+    state: str = Field(..., description="State to search in")
+    country: str = Field(..., description="Country (USA or India)")
+    category: DataCategory = Field(..., description="Category of data to collect")
+
+    @property
+    def state_key(self) -> str:
+        """Key identifying the target's state in the collection cycle."""
+        return f"{self.state}|{self.country}"
+
+    @property
+    def cell_key(self) -> str:
+        """Key identifying the target's (state, country, category) cell."""
+        return f"{self.state}|{self.country}|{self.category.value}"
+
+
 class SearchRequest(BaseModel):
     """Request model for manual search."""
 
@@ -0,0 +1,332 @@
+"""Bulk ingestion of volleyball facilities from OpenStreetMap data.
+
+Reads OSM extracts without any LLM calls: ``.osm`` XML files (optionally
+gzip or bzip2 compressed) are stream-parsed with ``iterparse``, ``.osm.pbf``
+files are read with pyosmium if it is installed, and Overpass API JSON is
+read from a file or fetched from an Overpass-compatible endpoint. Features
+tagged ``sport=volleyball`` or ``sport=beachvolleyball`` are mapped to
+venues and saved through the storage layer in batches.
+"""
+
+import bz2
+import gzip
+import json
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional
+
+import httpx
+
+from .models import DataCategory, VenueData
+
+logger = logging.getLogger(__name__)
+
+VOLLEYBALL_SPORTS = frozenset({"volleyball", "beachvolleyball"})
+
+# Tags mapped onto a category, checked in order
+_CATEGORY_TAGS = [
+    (("shop", "sports"), DataCategory.EQUIPMENT),
+    (("club", "sport"), DataCategory.CLUBS),
+    (("leisure", "sports_centre"), DataCategory.CLUBS),
+    (("amenity", "school"), DataCategory.ACADEMIES),
+]
+
+# Postal codes used in ``addr:state`` tags of US addresses
+_USA_STATE_CODES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
+    "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
+    "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
+    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
+    "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia",
+}
+
+# Tags summarized in the venue description
+_DESCRIBED_TAGS = ("leisure", "sport", "surface", "access", "lit")
+
+
+@dataclass
+class OsmFeature:
+    """A tagged OSM element with a representative location."""
+
+    osm_type: str
+    osm_id: int
+    tags: dict[str, str]
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    refs: list[int] = field(default_factory=list)
+
+
+def is_volleyball(tags: dict[str, str]) -> bool:
+    """Whether an element's ``sport`` tag includes volleyball."""
+    sport = tags.get("sport")
+    if not sport:
+        return False
+    return any(value.strip() in VOLLEYBALL_SPORTS for value in sport.split(";"))
+
+
+# Readers
+def _open(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_osm_xml(path: Path) -> Iterator[OsmFeature]:
+    """
+    Stream volleyball features out of an OSM XML extract.
+
+    Two passes keep memory bounded by the number of volleyball features
+    rather than the size of the extract: the first collects the node ids
+    referenced by volleyball ways, the second yields volleyball nodes and
+    then the ways, located at the mean of their nodes. Relations are
+    yielded without a location.
+    """
+    wanted: set[int] = set()
+    for element in _iter_elements(path, {"way"}):
+        tags = _xml_tags(element)
+        if is_volleyball(tags):
+            wanted.update(int(nd.get("ref")) for nd in element.iter("nd"))
+
+    coordinates: dict[int, tuple[float, float]] = {}
+    for element in _iter_elements(path, {"node", "way", "relation"}):
+        tags = _xml_tags(element)
+        element_id = int(element.get("id"))
+
+        if element.tag == "node":
+            lat, lon = float(element.get("lat")), float(element.get("lon"))
+            if element_id in wanted:
+                coordinates[element_id] = (lat, lon)
+            if is_volleyball(tags):
+                yield OsmFeature("node", element_id, tags, lat, lon)
+        elif is_volleyball(tags):
+            feature = OsmFeature(element.tag, element_id, tags)
+            if element.tag == "way":
+                feature.refs = [int(nd.get("ref")) for nd in element.iter("nd")]
+                _locate(feature, coordinates)
+            yield feature
+
+
+def _iter_elements(path: Path, tags: set[str]) -> Iterator[ET.Element]:
+    """Iterate over complete top-level elements, discarding each after use."""
+    with _open(path) as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, element in context:
+            if event != "end" or element.tag not in ("node", "way", "relation"):
+                continue
+            if element.tag in tags:
+                yield element
+            root.clear()
+
+
+def _xml_tags(element: ET.Element) -> dict[str, str]:
+    return {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+
+
+def _locate(feature: OsmFeature, coordinates: dict[int, tuple[float, float]]) -> None:
+    """Place a way at the mean of its known node coordinates."""
+    points = [coordinates[ref] for ref in feature.refs if ref in coordinates]
+    if points:
+        feature.lat = sum(lat for lat, _ in points) / len(points)
+        feature.lon = sum(lon for _, lon in points) / len(points)
+
+
+def read_osm_pbf(path: Path) -> Iterator[OsmFeature]:
+    """
+    Stream volleyball features out of an ``.osm.pbf`` extract with pyosmium.
+
+    Raises:
+        RuntimeError: If pyosmium (3.7 or later) is not installed
+    """
+    try:
+        import osmium
+    except ImportError as e:
+        raise RuntimeError(
+            "Reading .osm.pbf files requires pyosmium (pip install osmium)"
+        ) from e
+
+    # Only volleyball features are kept; node locations go to pyosmium's index
+    for obj in osmium.FileProcessor(str(path)).with_locations():
+        tags = dict(obj.tags)
+        if not is_volleyball(tags):
+            continue
+        if obj.is_node():
+            yield OsmFeature("node", obj.id, tags, obj.location.lat, obj.location.lon)
+        elif obj.is_way():
+            feature = OsmFeature("way", obj.id, tags)
+            points = [(n.lat, n.lon) for n in obj.nodes if n.location.valid()]
+            if points:
+                feature.lat = sum(lat for lat, _ in points) / len(points)
+                feature.lon = sum(lon for _, lon in points) / len(points)
+            yield feature
+        elif obj.is_relation():
+            yield OsmFeature("relation", obj.id, tags)
+
+
+def read_overpass_json(data: dict[str, Any]) -> Iterator[OsmFeature]:
+    """Read volleyball features from an Overpass API JSON response."""
+    for element in data.get("elements", []):
+        tags = element.get("tags") or {}
+        if not is_volleyball(tags):
+            continue
+        center = element.get("center") or {}
+        yield OsmFeature(
+            element.get("type", "node"),
+            int(element["id"]),
+            tags,
+            element.get("lat", center.get("lat")),
+            element.get("lon", center.get("lon")),
+        )
+
+
+def overpass_query(state: str, country: str) -> str:
+    """Overpass QL selecting volleyball features of a state."""
+    iso = {"USA": "US", "India": "IN"}.get(country, country)
+    return (
+        "[out:json][timeout:300];"
+        f'area["ISO3166-1"="{iso}"]->.country;'
+        f'area["name"="{state}"]["boundary"="administrative"](area.country)->.state;'
+        'nwr["sport"~"(^|;)\\\\s*(beach)?volleyball\\\\s*(;|$)"](area.state);'
+        "out center tags;"
+    )
+
+
+def fetch_overpass(url: str, state: str, country: str, timeout: float = 300.0) -> dict[str, Any]:
+    """Query an Overpass-compatible endpoint for a state's volleyball features."""
+    response = httpx.post(url, data={"data": overpass_query(state, country)}, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def read_source(path: Path) -> Iterator[OsmFeature]:
+    """Read features from a file, picking the reader from its extension."""
+    name = path.name.lower()
+    if name.endswith(".pbf"):
+        return read_osm_pbf(path)
+    if name.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return read_overpass_json(json.load(f))
+    return read_osm_xml(path)
+
+
+# Mapping
+def feature_to_venue(feature: OsmFeature, state: str, country: str) -> VenueData:
+    """Map an OSM feature onto a venue of the given state."""
+    tags = feature.tags
+    category = DataCategory.COURTS
+    for (key, value), mapped in _CATEGORY_TAGS:
+        if tags.get(key) == value:
+            category = mapped
+            break
+
+    name = tags.get("name")
+    if not name:
+        # Unnamed pitches, or all pitches of one operator, would share one
+        # dedup key without the id
+        beach = "beachvolleyball" in tags.get("sport", "")
+        kind = tags.get("operator") or ("Beach volleyball court" if beach else "Volleyball court")
+        name = f"{kind} (OSM {feature.osm_type} {feature.osm_id})"
+
+    details = [f"{key}={tags[key]}" for key in _DESCRIBED_TAGS if key in tags]
+    return VenueData(
+        name=name,
+        category=category,
+        state=state,
+        country=country,
+        address=_address(tags),
+        website=tags.get("website") or tags.get("contact:website"),
+        phone=tags.get("phone") or tags.get("contact:phone"),
+        email=tags.get("email") or tags.get("contact:email"),
+        description="OpenStreetMap: " + ", ".join(details) if details else None,
+        source_url=f"https://www.openstreetmap.org/{feature.osm_type}/{feature.osm_id}",
+        latitude=feature.lat,
+        longitude=feature.lon,
+    )
+
+
+def _address(tags: dict[str, str]) -> Optional[str]:
+    if tags.get("addr:full"):
+        return tags["addr:full"]
+    street = " ".join(p for p in (tags.get("addr:housenumber"), tags.get("addr:street")) if p)
+    city = " ".join(p for p in (tags.get("addr:postcode"), tags.get("addr:city")) if p)
+    parts = [p for p in (street, city, tags.get("addr:state")) if p]
+    return ", ".join(parts) or None
+
+
+def in_state(tags: dict[str, str], state: str, country: str) -> bool:
+    """
+    Whether a feature may belong to a state, judged by its ``addr:state``.
+
+    Features without the tag are assumed to lie in the state; the tag may
+    hold the state's name or, for the USA, its postal code.
+    """
+    tagged = tags.get("addr:state", "").strip()
+    if not tagged:
+        return True
+    if country == "USA":
+        tagged = _USA_STATE_CODES.get(tagged.upper(), tagged)
+    return tagged.lower() == state.lower()
+
+
+# Ingestion
+def ingest(
+    features: Iterable[OsmFeature],
+    storage: Any,
+    state: str,
+    country: str,
+    batch_size: int = 1000,
+) -> dict:
+    """
+    Save OSM features of a single state as venues in batches.
+
+    The input must cover one state, such as a state extract or an Overpass
+    query for it. Every feature is stored under that state, except those
+    whose ``addr:state`` names another one, which are skipped so that
+    extracts reaching over a border do not mislabel venues.
+
+    Args:
+        features: Features to ingest
+        storage: Storage backend
+        state: State the features belong to
+        country: Country of the state
+        batch_size: Venues written per storage save
+
+    Returns:
+        Summary with the number of features read and skipped and new
+        venues saved
+    """
+    read = 0
+    skipped = 0
+    with storage.session(flush_size=batch_size) as session:
+        for feature in features:
+            read += 1
+            if not in_state(feature.tags, state, country):
+                skipped += 1
+                continue
+            session.save_venues([feature_to_venue(feature, state, country)])
+        session.flush()
+        new_venues = session.new_venues
+
+    logger.info(
+        f"Ingested {read} OSM features for {state}, {country}: {new_venues} new venues, "
+        f"{skipped} outside the state"
+    )
+    return {
+        "state": state,
+        "country": country,
+        "features": read,
+        "skipped": skipped,
+        "new_venues": new_venues,
+    }
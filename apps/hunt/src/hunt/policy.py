@@ -0,0 +1,213 @@
+"""Yield-aware scheduling of collection targets."""
+
+import heapq
+import logging
+import math
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .config import get_settings
+from .journal import JournaledDocument
+from .models import DataCategory, INDIA_STATES, SearchTarget, USA_STATES
+from .storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Recent calls averaged for the marginal yield
+MARGINAL_WINDOW = 100
+
+
+class YieldPolicy:
+    """
+    Allocates collection calls to the targets expected to find most.
+
+    Every (state, country, category) cell keeps the number of calls made
+    and new venues found, both decayed exponentially with
+    ``half_life_hours`` so old observations fade. A cell's priority is an
+    upper confidence bound: its decayed new venues per call plus an
+    exploration bonus that grows as its decayed call count shrinks.
+    Unvisited cells come first, in rotation order; cells that have not
+    been searched for a while regain priority as their evidence decays,
+    so depleted cells are rechecked occasionally instead of never.
+
+    Statistics live in a journaled document and survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        targets: list[SearchTarget],
+        exploration: float = 1.0,
+        half_life_hours: float = 168.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            path: Snapshot file of the yield statistics
+            targets: All schedulable cells, in rotation order
+            exploration: Weight of the exploration bonus
+            half_life_hours: Time after which observations count half
+        """
+        self.targets = {t.cell_key: t for t in targets}
+        self._order = {key: i for i, key in enumerate(self.targets)}
+        self.exploration = exploration
+        self.half_life_seconds = half_life_hours * 3600
+        self._doc = JournaledDocument(path)
+        self._recent: deque[int] = deque(maxlen=MARGINAL_WINDOW)
+
+    def _decay(self, cell: dict, now: float) -> float:
+        """Weight of a cell's observations at ``now``."""
+        age = max(0.0, now - cell["updated_at"])
+        return 0.5 ** (age / self.half_life_seconds)
+
+    def record(
+        self,
+        state: str,
+        country: str,
+        category: DataCategory,
+        new_venues: int,
+        now: Optional[float] = None,
+    ) -> None:
+        """Record the outcome of one collection call."""
+        now = time.time() if now is None else now
+        key = _cell_key(state, country, category)
+        cell = self._doc.data.get(key)
+        if cell is None:
+            cell = {"calls": 0.0, "new_venues": 0.0, "total_calls": 0, "total_new": 0}
+            weight = 0.0
+        else:
+            weight = self._decay(cell, now)
+
+        self._doc.set({
+            key: {
+                "calls": cell["calls"] * weight + 1,
+                "new_venues": cell["new_venues"] * weight + new_venues,
+                "total_calls": cell["total_calls"] + 1,
+                "total_new": cell["total_new"] + new_venues,
+                "updated_at": now,
+            }
+        })
+        self._recent.append(new_venues)
+
+    def priorities(self, now: Optional[float] = None) -> dict[str, float]:
+        """Current priority of every cell; unvisited cells are infinite."""
+        now = time.time() if now is None else now
+        decayed = {}
+        for key, cell in self._doc.data.items():
+            if key in self.targets:
+                weight = self._decay(cell, now)
+                decayed[key] = (cell["calls"] * weight, cell["new_venues"] * weight)
+
+        total_calls = sum(calls for calls, _ in decayed.values())
+        total_new = sum(new for _, new in decayed.values())
+        # Bonus in venues, scaled to the overall yield
+        scale = max(1.0, total_new / total_calls) if total_calls else 1.0
+        log_total = math.log(total_calls + 1)
+
+        priorities = {}
+        for key in self.targets:
+            calls, new = decayed.get(key, (0.0, 0.0))
+            if calls < 1e-6:
+                priorities[key] = math.inf
+                continue
+            bonus = self.exploration * scale * math.sqrt(log_total / calls)
+            priorities[key] = new / calls + bonus
+        return priorities
+
+    def select(self, count: int = 1, exclude: Iterable[str] = ()) -> list[SearchTarget]:
+        """
+        Pick the cells to search next.
+
+        Args:
+            count: Number of targets
+            exclude: Cell keys (``SearchTarget.cell_key``) to skip, such as
+                targets already queued
+
+        Returns:
+            Targets in descending priority
+        """
+        excluded = set(exclude)
+        priorities = self.priorities()
+        best = heapq.nlargest(
+            count,
+            (key for key in self.targets if key not in excluded),
+            key=lambda key: (priorities[key], -self._order[key]),
+        )
+        return [self.targets[key] for key in best]
+
+    def covered_states(self) -> set[str]:
+        """``state|country`` keys whose every category was searched."""
+        remaining: dict[str, int] = {}
+        for key, target in self.targets.items():
+            remaining.setdefault(target.state_key, 0)
+            if key not in self._doc.data:
+                remaining[target.state_key] += 1
+        return {key for key, missing in remaining.items() if not missing}
+
+    def stats(self, top: int = 5) -> dict:
+        """Marginal yield per call and the most productive cells."""
+        data = {k: v for k, v in self._doc.data.items() if k in self.targets}
+        total_calls = sum(c["total_calls"] for c in data.values())
+        total_new = sum(c["total_new"] for c in data.values())
+        priorities = self.priorities()
+
+        def describe(key: str) -> dict:
+            cell = data[key]
+            return {
+                "cell": key,
+                "calls": cell["total_calls"],
+                "new_venues": cell["total_new"],
+                "yield_per_call": round(cell["new_venues"] / cell["calls"], 3),
+                "priority": round(priorities[key], 3),
+            }
+
+        ranked = sorted(data, key=lambda k: data[k]["new_venues"] / data[k]["calls"], reverse=True)
+        return {
+            "cells": len(self.targets),
+            "cells_explored": len(data),
+            "calls": total_calls,
+            "yield_per_call": round(total_new / total_calls, 3) if total_calls else None,
+            "marginal_yield_per_call": (
+                round(sum(self._recent) / len(self._recent), 3) if self._recent else None
+            ),
+            "top_cells": [describe(k) for k in ranked[:top]],
+        }
+
+    def close(self) -> None:
+        """Checkpoint the yield statistics."""
+        self._doc.checkpoint()
+
+
+def _cell_key(state: str, country: str, category: DataCategory) -> str:
+    return f"{state}|{country}|{category.value}"
+
+
+def all_targets() -> list[SearchTarget]:
+    """Every (state, country, category) cell, in rotation order."""
+    states = [(s, "USA") for s in USA_STATES] + [(s, "India") for s in INDIA_STATES]
+    return [
+        SearchTarget(state=state, country=country, category=category)
+        for state, country in states
+        for category in DataCategory
+    ]
+
+
+# Singleton instance
+_policy: Optional[YieldPolicy] = None
+
+
+def get_yield_policy() -> YieldPolicy:
+    """Get or create the yield policy instance."""
+    global _policy
+    if _policy is None:
+        settings = get_settings()
+        _policy = YieldPolicy(
+            DATA_DIR / "yield_stats.json",
+            all_targets(),
+            exploration=settings.scheduling_exploration,
+            half_life_hours=settings.scheduling_half_life_hours,
+        )
+    return _policy
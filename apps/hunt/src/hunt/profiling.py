@@ -0,0 +1,197 @@
+"""Opt-in cProfile capture of API requests and collection runs."""
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Optional
+
+from .config import get_settings
+from .storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the text summary of a profile
+SUMMARY_LINES = 60
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class Profiler:
+    """
+    Captures cProfile profiles and keeps the most recent ones on disk.
+
+    Requests are profiled when their path matches one of ``routes``
+    (shell-style patterns such as ``/api/results/*``), and collection runs
+    when their sequence number is a multiple of ``every_nth_run``. Each
+    profile is saved as a ``.prof`` file, readable with ``pstats`` or
+    snakeviz, next to a ``.txt`` summary of the most expensive functions;
+    only the newest ``max_profiles`` are kept.
+
+    Only one profile is captured at a time, since the interpreter allows
+    a single active profiler; a request arriving meanwhile runs
+    unprofiled. Profiles cover everything the event loop thread ran during
+    the capture, including concurrent requests.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        routes: Optional[list[str]] = None,
+        every_nth_run: int = 0,
+        max_profiles: int = 20,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory for the profile artifacts
+            routes: Request path patterns to profile
+            every_nth_run: Profile every Nth collection run (0 disables)
+            max_profiles: Number of profiles kept
+        """
+        self.directory = directory
+        self.routes = routes or []
+        self.every_nth_run = every_nth_run
+        self.max_profiles = max_profiles
+        self._runs = 0
+        self._active = threading.Lock()
+
+    def matches_route(self, path: str) -> bool:
+        """Whether requests to ``path`` are profiled."""
+        return any(fnmatch(path, pattern) for pattern in self.routes)
+
+    def run_context(self, name: str) -> ContextManager:
+        """Profile the collection run if it is an Nth one, else do nothing."""
+        self._runs += 1
+        if self.every_nth_run and self._runs % self.every_nth_run == 0:
+            return self.profile(f"{name}-{self._runs}")
+        return nullcontext()
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Profile the ``with`` block and save it under ``name``."""
+        if not self._active.acquire(blocking=False):
+            yield
+            return
+
+        try:
+            profile: Optional[cProfile.Profile] = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler, such as a debugger, is already active
+                profile = None
+            try:
+                yield
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    self._save(profile, name)
+        finally:
+            self._active.release()
+
+    def _save(self, profile: cProfile.Profile, name: str) -> None:
+        """Write the profile and its summary, then apply retention."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        stem = f"{stamp}-{_UNSAFE.sub('_', name).strip('_')}"
+
+        try:
+            profile.dump_stats(self.directory / f"{stem}.prof")
+            summary = io.StringIO()
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+            (self.directory / f"{stem}.txt").write_text(summary.getvalue(), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to save profile {stem}: {e}")
+            return
+
+        logger.info(f"Saved profile {stem}")
+        for old in self._profile_files()[self.max_profiles:]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".txt").unlink(missing_ok=True)
+
+    def _profile_files(self) -> list[Path]:
+        """Saved ``.prof`` files, newest first."""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.prof"), reverse=True)
+
+    def list_profiles(self) -> list[dict]:
+        """Describe the saved profiles, newest first."""
+        profiles = []
+        for path in self._profile_files():
+            summary = path.with_suffix(".txt")
+            profiles.append({
+                "id": path.stem,
+                "size_bytes": path.stat().st_size,
+                "files": [path.name] + ([summary.name] if summary.exists() else []),
+            })
+        return profiles
+
+    def artifact(self, filename: str) -> Optional[Path]:
+        """Path of a saved artifact, or None if there is no such file."""
+        if _UNSAFE.search(filename) or filename.startswith("."):
+            return None
+        if not filename.endswith((".prof", ".txt")):
+            return None
+        path = self.directory / filename
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests to the configured routes.
+
+    The profiler is looked up once when the middleware stack is built, so
+    with profiling disabled a request costs a single attribute check.
+    """
+
+    def __init__(self, app: Any):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+        """
+        self.app = app
+        self.profiler = get_profiler()
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if (
+            self.profiler is None
+            or scope["type"] != "http"
+            or not self.profiler.matches_route(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+
+# Singleton instance
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Get the profiler, or None when profiling is disabled."""
+    global _profiler
+    settings = get_settings()
+    if not settings.profiling_enabled:
+        return None
+    if _profiler is None:
+        _profiler = Profiler(
+            settings.profiling_dir or DATA_DIR / "profiles",
+            routes=[r.strip() for r in settings.profiling_routes.split(",") if r.strip()],
+            every_nth_run=settings.profiling_every_nth_run,
+            max_profiles=settings.profiling_max_profiles,
+        )
+    return _profiler
@@ -2,93 +2,102 @@
 
 import logging
 import random
+import re
 from typing import Optional
 
-from groq import Groq
-
-from .config import get_settings
+from .llm import get_llm_client
 from .models import DataCategory
 
 logger = logging.getLogger(__name__)
 
+# Bullet or number a model may put in front of each generated query
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
 
 class QueryGenerator:
     """Generate optimized search queries using LLM."""
 
     def __init__(self):
         """Initialize query generator."""
-        settings = get_settings()
-        self.client = Groq(api_key=settings.groq_api_key)
+        self.llm = get_llm_client()
         # Use a fast model for query generation
         self.model = "llama-3.3-70b-versatile"
 
-    def generate_query(
+    async def generate_queries(
         self,
         state: str,
         country: str,
         category: DataCategory,
+        count: int,
         previous_queries: Optional[list[str]] = None,
-    ) -> str:
+        productive_queries: Optional[list[tuple[str, int]]] = None,
+    ) -> list[str]:
         """
-        Generate an optimized search query for volleyball data collection.
+        Generate several distinct search queries with a single LLM call.
 
         Args:
             state: State to search in
             country: Country (USA or India)
             category: Category of data to collect
-            previous_queries: List of previously used queries to avoid duplicates
+            count: Number of queries to generate
+            previous_queries: Previously used queries to avoid repeating
+            productive_queries: (query, new venues found) pairs of earlier
+                queries that worked well, as examples to build on
 
         Returns:
-            Generated search query string
+            Generated queries; empty if generation failed
         """
         previous = previous_queries or []
-        previous_str = "\n".join(f"- {q}" for q in previous[-5:]) if previous else "None"
+        previous_str = "\n".join(f"- {q}" for q in previous[-15:]) if previous else "None"
+        productive_str = "\n".join(
+            f"- {q} ({n} new venues)" for q, n in (productive_queries or [])[:5]
+        ) or "None yet"
 
-        prompt = f"""Generate a specific search query to find volleyball {category.value} in {state}, {country}.
+        prompt = f"""Generate {count} different search queries to find volleyball {category.value} in {state}, {country}.
 
-The query should:
+Each query should:
 1. Be specific to find real businesses/venues
-2. Include location context
-3. Be unique from previous queries
+2. Include location context, such as a city or region of {state}
+3. Differ from the other queries and from previous queries
 4. Target actual contact information or website
 
 Previous queries used (avoid similar):
 {previous_str}
 
-Examples of good queries:
-- "volleyball courts near me {state} with phone number"
-- "beach volleyball clubs {state} {country} contact"
-- "youth volleyball training academy {state} registration"
+Queries that found many new venues (explore similar angles):
+{productive_str}
 
-Return ONLY the search query, nothing else."""
+Return ONLY the {count} queries, one per line, without numbering or quotes."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.llm.chat_completion(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.8,  # Higher temperature for variety
-                max_tokens=100,
+                temperature=0.9,  # Higher temperature for variety
+                max_tokens=60 * count,
             )
+        except Exception as e:
+            logger.error(f"Error generating queries: {e}")
+            return []
 
-            query = response.choices[0].message.content.strip()
-            # Remove quotes if present
-            query = query.strip('"\'')
-            
-            logger.info(f"Generated query: {query}")
-            return query
+        seen = {q.lower() for q in previous}
+        queries = []
+        for line in (response.choices[0].message.content or "").splitlines():
+            query = _LIST_MARKER.sub("", line).strip().strip('"\'')
+            if query and query.lower() not in seen:
+                seen.add(query.lower())
+                queries.append(query)
 
-        except Exception as e:
-            logger.error(f"Error generating query: {e}")
-            # Fallback to a simple query
-            return self._fallback_query(state, country, category)
+        logger.info(f"Generated {len(queries)} queries for {category.value} in {state}, {country}")
+        return queries[:count]
 
-    def _fallback_query(
+    def fallback_query(
         self,
         state: str,
         country: str,
         category: DataCategory
     ) -> str:
-        """Generate a simple fallback query if LLM fails."""
+        """Generate a simple template query for when generation fails."""
         templates = {
             DataCategory.COURTS: [
                 f"volleyball courts in {state} {country}",
@@ -0,0 +1,192 @@
+"""Persistent pool of pre-generated search queries."""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional
+
+from .config import get_settings
+from .journal import JournaledDocument
+from .models import DataCategory, SearchTarget
+from .query_generator import get_query_generator
+from .storage import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Used queries remembered per cell, for diversity and yield tracking
+MAX_USED_QUERIES = 50
+
+
+class QueryPool:
+    """
+    Pre-generated search queries per (state, country, category) cell.
+
+    Queries are generated in batches, many per LLM call, and kept in a
+    journaled document so they survive restarts. ``take`` serves the next
+    query of a cell straight from the pool and refills the cell in the
+    background once it runs low, so query generation stays off the
+    critical path of a collection. ``prefetch`` fills cells that are about
+    to be collected. Every served query records how many new venues it
+    found; the most productive ones steer the next generated batch, and
+    all used ones are passed as previous queries to keep batches diverse.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 8, low_water: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            path: Snapshot file of the pool
+            batch_size: Queries generated per LLM call
+            low_water: Pending queries below which a cell is refilled
+        """
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self._doc = JournaledDocument(path)
+        self._refills: dict[str, asyncio.Task] = {}
+        self.served = 0
+        self.served_from_pool = 0
+
+    @staticmethod
+    def _cell_key(state: str, country: str, category: DataCategory) -> str:
+        return f"{state}|{country}|{category.value}"
+
+    def _cell(self, key: str) -> dict:
+        cell = self._doc.data.get(key) or {}
+        return {"pending": list(cell.get("pending", [])), "used": dict(cell.get("used", {}))}
+
+    def pending(self, state: str, country: str, category: DataCategory) -> list[str]:
+        """Queries waiting to be served for a cell."""
+        return self._cell(self._cell_key(state, country, category))["pending"]
+
+    async def take(self, state: str, country: str, category: DataCategory) -> str:
+        """
+        Serve the next query for a cell.
+
+        Only waits for generation when the cell is empty and no refill has
+        been prefetched; falls back to a template query if that fails.
+        """
+        key = self._cell_key(state, country, category)
+        self.served += 1
+
+        if not self._cell(key)["pending"]:
+            self._schedule_refill(key, state, country, category)
+            try:
+                # Shielded so a cancelled collection leaves the refill running
+                await asyncio.shield(self._refills[key])
+            except Exception as e:
+                logger.error(f"Query refill failed for {key}: {e}")
+
+        cell = self._cell(key)
+        if cell["pending"]:
+            query = cell["pending"].pop(0)
+            self.served_from_pool += 1
+        else:
+            query = get_query_generator().fallback_query(state, country, category)
+
+        cell["used"].setdefault(query, {"calls": 0, "new_venues": 0})
+        self._doc.set({key: cell})
+
+        if len(cell["pending"]) < self.low_water:
+            self._schedule_refill(key, state, country, category)
+        return query
+
+    def record_yield(
+        self,
+        state: str,
+        country: str,
+        category: DataCategory,
+        query: str,
+        new_venues: int,
+    ) -> None:
+        """Record the new venues found by a served query."""
+        key = self._cell_key(state, country, category)
+        cell = self._cell(key)
+        stats = cell["used"].pop(query, {"calls": 0, "new_venues": 0})
+        cell["used"][query] = {
+            "calls": stats["calls"] + 1,
+            "new_venues": stats["new_venues"] + new_venues,
+        }
+        while len(cell["used"]) > MAX_USED_QUERIES:
+            cell["used"].pop(next(iter(cell["used"])))
+        self._doc.set({key: cell})
+
+    def prefetch(self, targets: list[SearchTarget]) -> None:
+        """Refill the cells of upcoming targets in the background."""
+        for target in targets:
+            key = target.cell_key
+            if len(self._cell(key)["pending"]) < self.low_water:
+                self._schedule_refill(key, target.state, target.country, target.category)
+
+    def _schedule_refill(
+        self, key: str, state: str, country: str, category: DataCategory
+    ) -> None:
+        if key in self._refills:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(
+                self._refill(key, state, country, category)
+            )
+        except RuntimeError:
+            return  # No running loop; the next take refills
+        self._refills[key] = task
+        task.add_done_callback(lambda _: self._refills.pop(key, None))
+
+    async def _refill(
+        self, key: str, state: str, country: str, category: DataCategory
+    ) -> None:
+        """Generate a batch of queries for a cell."""
+        cell = self._cell(key)
+        productive = sorted(
+            ((q, s["new_venues"]) for q, s in cell["used"].items() if s["new_venues"] > 0),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        queries = await get_query_generator().generate_queries(
+            state,
+            country,
+            category,
+            count=self.batch_size,
+            previous_queries=list(cell["used"]) + cell["pending"],
+            productive_queries=productive,
+        )
+
+        # Re-read the cell: queries may have been served meanwhile
+        cell = self._cell(key)
+        known = set(cell["pending"]) | set(cell["used"])
+        cell["pending"] += [q for q in queries if q not in known]
+        self._doc.set({key: cell})
+
+    def stats(self) -> dict:
+        """Pool size and how often queries were served without waiting."""
+        cells = [self._cell(key) for key in self._doc.data]
+        return {
+            "cells": len(cells),
+            "pending_queries": sum(len(c["pending"]) for c in cells),
+            "served": self.served,
+            "served_from_pool": self.served_from_pool,
+            "refills_running": len(self._refills),
+        }
+
+    def close(self) -> None:
+        """Cancel background refills and checkpoint the pool."""
+        for task in self._refills.values():
+            task.cancel()
+        self._doc.checkpoint()
+
+
+# Singleton instance
+_pool: Optional[QueryPool] = None
+
+
+def get_query_pool() -> QueryPool:
+    """Get or create the query pool instance."""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = QueryPool(
+            settings.query_pool_path or DATA_DIR / "query_pool.json",
+            batch_size=settings.query_pool_batch_size,
+            low_water=settings.query_pool_low_water,
+        )
+    return _pool
@@ -0,0 +1,196 @@
+"""Rate limiting and backoff for Groq API usage."""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Groq rate-limit duration into seconds.
+
+    Accepts plain seconds (``"12"``, used by ``retry-after``) and compound
+    durations such as ``"7.66s"``, ``"2m59.56s"`` or ``"250ms"`` (used by
+    the ``x-ratelimit-reset-*`` headers).
+
+    Returns:
+        Duration in seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Compute a jittered exponential backoff delay.
+
+    Uses "full jitter": a uniform delay between zero and the exponential
+    ceiling, but never less than a server-provided ``retry-after``.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base_seconds: Delay ceiling of the first attempt
+        max_seconds: Upper bound for the delay ceiling
+        retry_after: Minimum delay requested by the server
+
+    Returns:
+        Delay in seconds
+    """
+    ceiling = min(max_seconds, base_seconds * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens held
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket; the balance may go negative."""
+        self._refill()
+        self.tokens -= amount
+
+    def limit_to(self, remaining: float) -> None:
+        """Lower the balance to a remaining budget reported by the server."""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    """
+    Requests/minute and tokens/minute budget shared by all LLM callers.
+
+    Callers wait in FIFO order until both buckets can cover their request,
+    so bursts are queued instead of turning into 429 responses. The
+    budgets are tightened from Groq's rate-limit headers, and a 429 pauses
+    every caller until its ``retry-after`` has passed.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget per minute
+            tokens_per_minute: Token budget per minute
+        """
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _wait_time(self, estimated_tokens: int) -> float:
+        return max(
+            self._blocked_until - time.monotonic(),
+            self.requests.time_until(1),
+            self.tokens.time_until(estimated_tokens),
+        )
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """
+        Wait until a request of the estimated size fits the budget.
+
+        Args:
+            estimated_tokens: Expected prompt plus completion tokens
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while (wait := self._wait_time(estimated_tokens)) > 0:
+                await asyncio.sleep(wait)
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token budget once the real usage is known."""
+        self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every caller for the given number of seconds."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Tighten the budgets from Groq rate-limit response headers.
+
+        Groq reports the remaining tokens per minute and the remaining
+        requests per day; when either is exhausted every caller waits for
+        the matching reset time.
+        """
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            try:
+                self.tokens.limit_to(float(remaining_tokens))
+            except ValueError:
+                pass
+
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if remaining is not None and reset is not None and remaining.strip() == "0":
+                logger.warning(f"Groq {kind} budget exhausted, pausing for {reset:.1f}s")
+                self.block_for(reset)
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """
+    Estimate the tokens a chat completion counts against the budget.
+
+    Uses the common four-characters-per-token approximation for the prompt
+    and reserves the full ``max_tokens`` for the completion.
+    """
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return prompt_chars // 4 + max_tokens
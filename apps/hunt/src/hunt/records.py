@@ -0,0 +1,85 @@
+"""Compact in-memory venue records."""
+
+import sys
+from datetime import datetime
+from typing import Any, Optional
+
+from .models import DataCategory, VenueData
+
+# Fields of a venue, in model order
+VENUE_FIELDS = tuple(VenueData.model_fields)
+
+# Strings shared by many venues, stored once through ``sys.intern``
+_INTERNED = ("state", "country")
+
+
+class VenueRecord:
+    """
+    Slotted venue record held by the in-memory index.
+
+    Records have no per-instance ``__dict__`` and share a single copy of
+    every state and country string (the category is an enum member and
+    shared already), so they take a fraction of the memory of
+    ``VenueData`` models. Records built from the venue log skip
+    validation, since the log only holds venues that were validated when
+    they were saved. ``to_venue`` builds the model at the API boundary.
+    """
+
+    __slots__ = VENUE_FIELDS
+
+    @classmethod
+    def from_venue(cls, venue: VenueData) -> "VenueRecord":
+        """Build a record from a validated model."""
+        record = cls.__new__(cls)
+        for field in VENUE_FIELDS:
+            setattr(record, field, getattr(venue, field))
+        for field in _INTERNED:
+            setattr(record, field, sys.intern(getattr(venue, field)))
+        return record
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "VenueRecord":
+        """
+        Build a record from a trusted JSON venue without validation.
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If the category or collection time is malformed
+        """
+        record = cls.__new__(cls)
+        record.name = data["name"]
+        record.category = DataCategory(data["category"])
+        record.state = sys.intern(data["state"])
+        record.country = sys.intern(data["country"])
+        for field in ("address", "website", "phone", "email", "description", "source_url"):
+            setattr(record, field, data.get(field))
+        record.latitude = data.get("latitude")
+        record.longitude = data.get("longitude")
+        record.collected_at = datetime.fromisoformat(data["collected_at"])
+        return record
+
+    @property
+    def location(self) -> Optional[tuple[float, float]]:
+        """The (latitude, longitude) pair, if both are known."""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
+    def to_venue(self) -> VenueData:
+        """
+        Build the ``VenueData`` model of the record without revalidating.
+
+        Sets the model's state directly like ``model_construct`` does,
+        minus its default handling, which makes ``model_construct`` slower
+        than validating.
+        """
+        venue = VenueData.__new__(VenueData)
+        _set = object.__setattr__
+        _set(venue, "__dict__", {field: getattr(self, field) for field in VENUE_FIELDS})
+        _set(venue, "__pydantic_fields_set__", set(VENUE_FIELDS))
+        _set(venue, "__pydantic_extra__", None)
+        _set(venue, "__pydantic_private__", None)
+        return venue
+
+    def __repr__(self) -> str:
+        return f"VenueRecord(name={self.name!r}, state={self.state!r}, country={self.country!r})"
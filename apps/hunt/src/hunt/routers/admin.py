@@ -0,0 +1,40 @@
+"""Administrative API endpoints."""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from ..profiling import get_profiler
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/profiles")
+async def list_profiles() -> dict:
+    """List the captured profiles, newest first."""
+    profiler = get_profiler()
+    if profiler is None:
+        return {"enabled": False, "profiles": []}
+
+    return {
+        "enabled": True,
+        "routes": profiler.routes,
+        "every_nth_run": profiler.every_nth_run,
+        "profiles": profiler.list_profiles(),
+    }
+
+
+@router.get("/profiles/{filename}")
+async def download_profile(filename: str) -> FileResponse:
+    """
+    Download a profile artifact.
+
+    ``.prof`` files load with ``pstats`` or snakeviz; ``.txt`` files hold
+    the summary of the most expensive functions.
+    """
+    profiler = get_profiler()
+    path = profiler.artifact(filename) if profiler is not None else None
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {filename} not found")
+
+    media_type = "text/plain" if path.suffix == ".txt" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=path.name)
@@ -81,13 +81,24 @@ async def resume_scheduler() -> dict:
     return {"status": "resumed", "message": "Scheduler resumed"}
 
 
+@router.post("/dedup")
+async def deduplicate_venues() -> dict:
+    """Merge duplicate venues across the stored dataset."""
+    from ..storage import get_storage
+
+    storage = get_storage()
+    summary = storage.deduplicate()
+
+    return {"status": "success", **summary}
+
+
 @router.post("/reset-cycle")
 async def reset_cycle() -> dict:
     """Reset the collection cycle to start from the beginning."""
     from ..storage import get_storage
 
-    storage = get_storage()
-    storage.reset_cycle()
+    with get_storage().session() as session:
+        session.reset_cycle()
 
     return {
         "status": "success",
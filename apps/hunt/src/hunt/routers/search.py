@@ -1,25 +1,41 @@
 """Search API endpoints."""
 
-from fastapi import APIRouter, HTTPException
+import json
+import logging
+from itertools import islice
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
 from ..agent import get_agent
-from ..models import DataCategory, SearchRequest, SearchResponse
+from ..cache import get_search_cache, parse_cache_control
+from ..config import get_settings
+from ..models import DataCategory, SearchRequest, SearchResponse, VenueData
 from ..storage import get_storage
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api", tags=["search"])
 
 
 @router.post("/search", response_model=SearchResponse)
-async def search_venues(request: SearchRequest) -> SearchResponse:
+async def search_venues(
+    request: SearchRequest,
+    response: Response,
+    cache_control: Optional[str] = Header(None),
+) -> SearchResponse:
     """
     Search for volleyball venues in a specific state.
 
     This endpoint uses Groq Compound agent with built-in web search
-    to find volleyball-related venues.
+    to find volleyball-related venues. Identical searches are served from
+    the search cache; send ``Cache-Control: no-cache`` to force a fresh
+    search, or ``no-store`` to also keep the result out of the cache.
     """
     agent = get_agent()
 
-    try:
+    async def fetch() -> dict:
         venues, executed_tools, query_used = await agent.search(
             state=request.state,
             country=request.country,
@@ -29,57 +45,228 @@ async def search_venues(request: SearchRequest) -> SearchResponse:
         )
 
         # Optionally save results
-        storage = get_storage()
-        storage.save_venues(venues)
+        with get_storage().session() as session:
+            session.save_venues(venues)
+
+        return {
+            "venues": [v.model_dump(mode="json") for v in venues],
+            "executed_tools": executed_tools,
+            "query_used": query_used,
+        }
+
+    try:
+        if get_settings().search_cache_enabled:
+            cache = get_search_cache()
+            bypass, store = parse_cache_control(cache_control)
+            payload, hit = await cache.get_or_fetch(
+                cache.make_key(request), fetch, bypass=bypass, store=store
+            )
+            response.headers["X-Cache"] = "HIT" if hit else "MISS"
+        else:
+            payload = await fetch()
 
         return SearchResponse(
             status="success",
-            query_used=query_used,
-            results=venues,
-            executed_tools=executed_tools,
+            query_used=payload["query_used"],
+            results=[VenueData(**v) for v in payload["venues"]],
+            executed_tools=payload["executed_tools"],
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/results/{state}")
-async def get_results_by_state(state: str, country: str = "USA") -> dict:
-    """Get collected venues for a specific state."""
-    storage = get_storage()
-    venues = storage.get_venues_by_state(state)
+def _sse(event: str, data: Any) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _search_events(
+    request: SearchRequest,
+    bypass: bool,
+    store: bool,
+) -> AsyncIterator[str]:
+    """
+    Run a streamed search and encode its progress as server-sent events.
+
+    Venues are saved and sent as soon as the agent parses them. A cached
+    search is replayed from the cache instead, and a completed search is
+    stored in the cache for both search endpoints.
+    """
+    settings = get_settings()
+    cache = get_search_cache() if settings.search_cache_enabled else None
+    key = cache.make_key(request) if cache is not None else None
+
+    cached = cache.get(key) if cache is not None and not bypass else None
+    if cached is not None:
+        yield _sse("query", {"query": cached["query_used"]})
+        for tool in cached["executed_tools"]:
+            yield _sse("tool", {"type": tool})
+        for venue in cached["venues"]:
+            yield _sse("venue", venue)
+        yield _sse("done", {"count": len(cached["venues"]), "cached": True})
+        return
+
+    venues: list[dict] = []
+    executed_tools: list[str] = []
+    query_used = ""
+    finish_reason = None
+    try:
+        # Each venue is saved as it arrives; the session commits progress
+        # once the stream ends, fails or the client disconnects
+        with get_storage().session(flush_size=1) as session:
+            async for kind, value in get_agent().search_stream(
+                state=request.state,
+                country=request.country,
+                category=request.category,
+                max_results=request.max_results,
+                custom_query=request.query,
+            ):
+                if kind == "venue":
+                    session.save_venues([value])
+                    venue = value.model_dump(mode="json")
+                    venues.append(venue)
+                    yield _sse("venue", venue)
+                elif kind == "tool":
+                    executed_tools.append(value)
+                    yield _sse("tool", {"type": value})
+                elif kind == "query":
+                    query_used = value
+                    yield _sse("query", {"query": value})
+                elif kind == "done":
+                    finish_reason = value
+
+    except Exception as e:
+        logger.error(f"Streamed search failed: {e}")
+        yield _sse("error", {"detail": str(e), "count": len(venues)})
+        return
+
+    if cache is not None and store:
+        cache.set(key, {
+            "venues": venues,
+            "executed_tools": executed_tools,
+            "query_used": query_used,
+        })
+    yield _sse("done", {"count": len(venues), "cached": False, "finish_reason": finish_reason})
+
+
+@router.post("/search/stream")
+async def search_venues_stream(
+    request: SearchRequest,
+    cache_control: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Search like ``/api/search``, streaming results as server-sent events.
+
+    Emits a ``query`` event, a ``tool`` event per executed tool and a
+    ``venue`` event per venue as soon as it is parsed from the model
+    output, then ``done`` (or ``error``, after which the venues already
+    sent remain saved). Honours ``Cache-Control`` like ``/api/search``.
+    """
+    bypass, store = parse_cache_control(cache_control)
+    return StreamingResponse(
+        _search_events(request, bypass, store),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
-    # Filter by country if specified
-    if country:
-        venues = [v for v in venues if v.country.lower() == country.lower()]
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
+
+def _wants_ndjson(format: Optional[str], accept: Optional[str]) -> bool:
+    return format == "ndjson" or NDJSON_MEDIA_TYPE in (accept or "")
+
+
+def _ndjson_lines(rows: Iterator[tuple[int, VenueData]]) -> Iterator[str]:
+    """Encode (cursor, venue) pairs as NDJSON lines, one venue at a time."""
+    for cursor, venue in rows:
+        yield json.dumps({"id": cursor, **venue.model_dump(mode="json")}) + "\n"
+
+
+def _venue_results(
+    rows: Iterator[tuple[int, VenueData]],
+    limit: Optional[int],
+    ndjson: bool,
+    **fields: str,
+) -> Union[dict, StreamingResponse]:
+    """
+    Render matching venues as NDJSON stream, a page, or the full list.
+
+    NDJSON lines and paginated venues carry their ``id``, which is the
+    cursor to pass as ``after`` to continue.
+    """
+    if ndjson:
+        if limit is not None:
+            rows = islice(rows, limit)
+        return StreamingResponse(_ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE)
+
+    if limit is None:
+        venues = [v.model_dump(mode="json") for _, v in rows]
+        return {**fields, "count": len(venues), "venues": venues}
+
+    page = list(islice(rows, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
     return {
-        "state": state,
-        "country": country,
-        "count": len(venues),
-        "venues": [v.model_dump(mode="json") for v in venues],
+        **fields,
+        "count": len(page),
+        "venues": [{"id": cursor, **v.model_dump(mode="json")} for cursor, v in page],
+        "next_cursor": page[-1][0] if has_more else None,
     }
 
 
+@router.get("/results/{state}")
+async def get_results_by_state(
+    state: str,
+    country: str = "USA",
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[int] = Query(None, ge=0),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get collected venues for a specific state.
+
+    Pass ``limit`` (and ``after`` from ``next_cursor``) to page through
+    the results, or ``format=ndjson`` / ``Accept: application/x-ndjson``
+    to stream them one venue per line.
+    """
+    storage = get_storage()
+    rows = storage.iter_venues(state=state, country=country or None, after=after)
+
+    return _venue_results(
+        rows, limit, _wants_ndjson(format, accept), state=state, country=country
+    )
+
+
 @router.get("/results/category/{category}")
-async def get_results_by_category(category: DataCategory) -> dict:
-    """Get collected venues for a specific category."""
+async def get_results_by_category(
+    category: DataCategory,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[int] = Query(None, ge=0),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get collected venues for a specific category.
+
+    Supports the same pagination and NDJSON streaming as the state results.
+    """
     storage = get_storage()
-    venues = storage.get_venues_by_category(category)
+    rows = storage.iter_venues(category=category, after=after)
 
-    return {
-        "category": category.value,
-        "count": len(venues),
-        "venues": [v.model_dump(mode="json") for v in venues],
-    }
+    return _venue_results(
+        rows, limit, _wants_ndjson(format, accept), category=category.value
+    )
 
 
 @router.get("/stats")
 async def get_stats() -> dict:
     """Get collection statistics."""
-    storage = get_storage()
-    stats = storage.get_stats()
-    progress = storage.load_progress()
+    with get_storage().session() as session:
+        stats = session.get_stats()
+        progress = session.progress
 
     return {
         **stats,
@@ -0,0 +1,69 @@
+"""Venue lookup API endpoints."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from ..models import DataCategory
+from ..storage import get_storage
+
+router = APIRouter(prefix="/api/venues", tags=["venues"])
+
+
+@router.get("/near")
+async def get_venues_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: Optional[float] = Query(None, gt=0, le=20000, description="Radius in km"),
+    limit: int = Query(10, ge=1, le=500),
+    category: Optional[DataCategory] = None,
+) -> dict:
+    """
+    Get the venues nearest to a location.
+
+    Returns the ``limit`` nearest venues, restricted to ``radius``
+    kilometres when given, nearest first. Only venues with coordinates
+    are considered.
+    """
+    hits = get_storage().get_venues_near(lat, lon, radius, limit, category)
+
+    return {
+        "lat": lat,
+        "lon": lon,
+        "radius_km": radius,
+        "count": len(hits),
+        "results": [
+            {**venue.model_dump(mode="json"), "distance_km": round(distance, 3)}
+            for distance, venue in hits
+        ],
+    }
+
+
+@router.get("/search")
+async def search_venues(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    state: Optional[str] = None,
+    country: Optional[str] = None,
+    category: Optional[DataCategory] = None,
+) -> dict:
+    """
+    Search venues by keyword.
+
+    Matches names, descriptions and addresses, ranked by BM25 with name
+    matches weighted highest, and returns one page of ``limit`` results
+    starting at ``offset``.
+    """
+    total, hits = get_storage().search_venues(q, limit, offset, state, country, category)
+
+    return {
+        "query": q,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "results": [
+            {**venue.model_dump(mode="json"), "score": round(score, 4)}
+            for score, venue in hits
+        ],
+    }
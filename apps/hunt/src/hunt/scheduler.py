@@ -2,25 +2,64 @@
 
 import asyncio
 import logging
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional
+from typing import ContextManager, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from .agent import get_agent
 from .config import get_settings
+from .metrics import COLLECTION_IN_FLIGHT, COLLECTION_QUEUE_DEPTH
 from .models import (
     CollectionProgress,
     DataCategory,
     INDIA_STATES,
+    SearchTarget,
     USA_STATES,
 )
-from .query_generator import get_query_generator
+from .policy import YieldPolicy, get_yield_policy
+from .profiling import get_profiler
+from .query_pool import get_query_pool
+from .session import StorageSession
 from .storage import get_storage
 
 logger = logging.getLogger(__name__)
 
+# Streamed venues written per storage flush during a collection
+VENUE_FLUSH_SIZE = 10
+
+# Attempts at a work-queue task before it is given up for the cycle
+MAX_TASK_ATTEMPTS = 3
+
+
+class RateBudget:
+    """Global budget spacing collection calls evenly over time."""
+
+    def __init__(self, calls_per_minute: float):
+        """
+        Initialize the budget.
+
+        Args:
+            calls_per_minute: Maximum number of calls started per minute
+        """
+        self.interval = 60.0 / calls_per_minute
+        self._next_slot = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Wait until the next call slot is available."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.interval
+
 
 class CollectionScheduler:
     """Automated scheduler for volleyball data collection."""
@@ -42,41 +81,252 @@ class CollectionScheduler:
         self._india_states = INDIA_STATES.copy()
         self._categories = list(DataCategory)
 
+        # Yield-aware target selection; None keeps the fixed rotation
+        self.policy: Optional[YieldPolicy] = (
+            get_yield_policy() if self.settings.scheduling_policy == "yield" else None
+        )
+        self._queued_cells: set[str] = set()
+        self.profiler = get_profiler()
+
+        # Work-queue mode
+        self.workers = self.settings.collection_workers
+        self.batch_size = max(1, self.settings.collection_batch_size)
+        self._queue: Optional[asyncio.Queue[SearchTarget]] = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._budget = RateBudget(self.settings.collection_calls_per_minute)
+        self._dispatched: set[str] = set()
+        self._remaining: dict[str, int] = {}
+        self._retries: list[SearchTarget] = []
+        self._attempts: dict[str, int] = {}
+        self._failed_states: set[str] = set()
+        self._cycle_finished = False
+        self.cycle_pause_seconds = self.settings.collection_cycle_pause_minutes * 60
+        self._in_flight = 0
+        COLLECTION_QUEUE_DEPTH.set_function(
+            lambda: self._queue.qsize() if self._queue is not None else 0
+        )
+        COLLECTION_IN_FLIGHT.set_function(lambda: self._in_flight + int(self.is_running))
+
+    @property
+    def queue_mode(self) -> bool:
+        """Whether collection runs on the concurrent worker pool."""
+        return self.workers > 0
+
     def start(self) -> None:
         """Start the scheduler."""
         if self.scheduler.running:
             logger.warning("Scheduler is already running")
             return
 
-        # Add the collection job
-        self.scheduler.add_job(
-            self._run_collection,
-            trigger=IntervalTrigger(minutes=self.settings.schedule_interval_minutes),
-            id="volleyball_collection",
-            name="Volleyball Data Collection",
-            replace_existing=True,
-        )
+        if self.queue_mode:
+            self._start_workers()
+        else:
+            # Add the collection job
+            self.scheduler.add_job(
+                self._run_collection,
+                trigger=IntervalTrigger(minutes=self.settings.schedule_interval_minutes),
+                id="volleyball_collection",
+                name="Volleyball Data Collection",
+                replace_existing=True,
+            )
 
         self.scheduler.start()
-        logger.info(
-            f"Scheduler started. Running every {self.settings.schedule_interval_minutes} minutes"
-        )
+        if self.queue_mode:
+            logger.info(
+                f"Scheduler started with {self.workers} workers at "
+                f"{self.settings.collection_calls_per_minute} calls/minute"
+            )
+        else:
+            logger.info(
+                f"Scheduler started. Running every {self.settings.schedule_interval_minutes} minutes"
+            )
 
     def stop(self) -> None:
         """Stop the scheduler."""
+        for task in self._worker_tasks:
+            task.cancel()
+        self._worker_tasks = []
+
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler stopped")
 
-    def get_next_state(self) -> tuple[str, str]:
+    # Work-queue mode
+    def _start_workers(self) -> None:
+        """Start the task producer and the worker pool."""
+        self._queue = asyncio.Queue(maxsize=self.workers)
+        self._worker_tasks = [asyncio.create_task(self._produce(), name="collection-producer")]
+        self._worker_tasks += [
+            asyncio.create_task(self._work(n), name=f"collection-worker-{n}")
+            for n in range(self.workers)
+        ]
+
+    def _next_tasks(self) -> list[SearchTarget]:
+        """
+        Produce the next tasks for the work queue.
+
+        Failed tasks waiting for another attempt come first. With the
+        yield policy these are the highest-priority cells not already
+        queued. In rotation they are the categories of the next state; an
+        empty list is returned while the last states of a cycle are still
+        being processed, and once they are all completed the cycle is
+        reset.
+        """
+        if self._retries:
+            tasks, self._retries = self._retries, []
+            return tasks
+
+        if self.policy is not None:
+            tasks = self.policy.select(self.batch_size, exclude=self._queued_cells)
+            self._queued_cells.update(t.cell_key for t in tasks)
+        else:
+            with get_storage().session() as session:
+                tasks = self._next_rotation_tasks(session)
+        # Queries for the new state are generated while it waits in the queue
+        get_query_pool().prefetch(tasks)
+        return tasks
+
+    def _next_rotation_tasks(self, session: StorageSession) -> list[SearchTarget]:
+        completed = session.completed_states
+
+        states = [(s, "USA") for s in self._usa_states]
+        states += [(s, "India") for s in self._india_states]
+        for state, country in states:
+            key = f"{state}|{country}"
+            if key in completed or key in self._dispatched:
+                continue
+
+            self._dispatched.add(key)
+            self._remaining[key] = len(self._categories)
+            return [
+                SearchTarget(state=state, country=country, category=c)
+                for c in self._categories
+            ]
+
+        if not self._remaining:
+            session.reset_cycle()
+            self._dispatched.clear()
+            self._cycle_finished = True
+            logger.info("All states completed. Starting new cycle.")
+        return []
+
+    async def _produce(self) -> None:
+        """
+        Feed rotation tasks into the work queue.
+
+        Once a cycle is finished the next one starts after
+        ``collection_cycle_pause_minutes``, instead of calling the agent
+        again right away.
+        """
+        while True:
+            tasks = self._next_tasks()
+            if not tasks:
+                await self._queue.join()
+                if self._cycle_finished:
+                    self._cycle_finished = False
+                    logger.info(f"Next cycle starts in {self.cycle_pause_seconds:.0f} seconds")
+                    await asyncio.sleep(self.cycle_pause_seconds)
+                continue
+
+            for task in tasks:
+                await self._queue.put(task)
+
+    async def _work(self, worker_id: int) -> None:
+        """
+        Process tasks from the work queue until cancelled.
+
+        With ``collection_batch_size`` > 1 a worker takes up to that many
+        queued tasks at once and covers them with a single batch search.
+        """
+        while True:
+            tasks = [await self._queue.get()]
+            while len(tasks) < self.batch_size and not self._queue.empty():
+                tasks.append(self._queue.get_nowait())
+
+            try:
+                await self._budget.acquire()
+                with (
+                    self._profile_run(f"worker-{worker_id}"),
+                    get_storage().session(flush_size=VENUE_FLUSH_SIZE) as session,
+                ):
+                    self._in_flight += 1
+                    try:
+                        if len(tasks) == 1:
+                            task = tasks[0]
+                            await self._collect(task.state, task.country, task.category, session)
+                        else:
+                            await self._collect_batch(tasks, session)
+                    except Exception as e:
+                        logger.error(f"Worker {worker_id} failed on {tasks}: {e}")
+                        for task in tasks:
+                            self._retry_task(task, session)
+                    else:
+                        for task in tasks:
+                            self._finish_task(task, session)
+                    finally:
+                        self._in_flight -= 1
+            finally:
+                for _ in tasks:
+                    self._queue.task_done()
+
+    def _retry_task(self, task: SearchTarget, session: StorageSession) -> None:
+        """
+        Queue a failed task for another attempt.
+
+        After ``MAX_TASK_ATTEMPTS`` failures the task is given up: its cell
+        is released, and in rotation its state is not marked completed
+        this cycle.
+        """
+        attempts = self._attempts.get(task.cell_key, 0) + 1
+        if attempts < MAX_TASK_ATTEMPTS:
+            self._attempts[task.cell_key] = attempts
+            self._retries.append(task)
+            return
+
+        logger.warning(f"Giving up on {task.cell_key} after {attempts} failed attempts")
+        if self.policy is None:
+            self._failed_states.add(task.state_key)
+        self._finish_task(task, session)
+
+    def _finish_task(self, task: SearchTarget, session: StorageSession) -> None:
+        """Mark the task's state completed once all its categories are done."""
+        self._attempts.pop(task.cell_key, None)
+        if self.policy is not None:
+            self._queued_cells.discard(task.cell_key)
+            session.progress.completed_states = len(self.policy.covered_states())
+            session.progress.total_states = len(self._usa_states) + len(self._india_states)
+            return
+
+        key = task.state_key
+        if key not in self._remaining:
+            return
+
+        self._remaining[key] -= 1
+        if self._remaining[key] <= 0:
+            del self._remaining[key]
+            if key in self._failed_states:
+                # Left for the next cycle
+                self._failed_states.discard(key)
+                return
+            # The session counts completed states into the progress on commit
+            session.mark_state_completed(task.state, task.country)
+            session.progress.total_states = len(self._usa_states) + len(self._india_states)
+
+    def get_next_state(self, session: Optional[StorageSession] = None) -> tuple[str, str]:
         """
         Get the next state to process.
 
+        Args:
+            session: Storage session to read and reset the cycle through
+
         Returns:
             Tuple of (state, country)
         """
-        storage = get_storage()
-        completed = storage.get_completed_states()
+        if session is None:
+            with get_storage().session() as session:
+                return self.get_next_state(session)
+
+        completed = session.completed_states
 
         # Try USA states first
         for state in self._usa_states:
@@ -91,7 +341,7 @@ class CollectionScheduler:
                 return state, "India"
 
         # All states completed, reset and start over
-        storage.reset_cycle()
+        session.reset_cycle()
         logger.info("All states completed. Starting new cycle.")
         return self._usa_states[0], "USA"
 
@@ -108,77 +358,199 @@ class CollectionScheduler:
             return {"status": "skipped", "reason": "already running"}
 
         self.is_running = True
-        storage = get_storage()
+
+        # One session covers the whole run: state is read once and every
+        # change is written in a single commit when the block exits
+        with (
+            self._profile_run("collection-run"),
+            get_storage().session(flush_size=VENUE_FLUSH_SIZE) as session,
+        ):
+            try:
+                if self.policy is not None:
+                    target = self.policy.select()[0]
+                    state, country, category = target.state, target.country, target.category
+                else:
+                    # Get next state and category
+                    state, country = self.get_next_state(session)
+                    category = self.get_next_category()
+
+                result = await self._collect(state, country, category, session)
+
+                # Have queries ready for the next run
+                if self.policy is not None:
+                    get_query_pool().prefetch(self.policy.select())
+                elif self._category_index != 0:
+                    next_category = self._categories[self._category_index]
+                    get_query_pool().prefetch(
+                        [SearchTarget(state=state, country=country, category=next_category)]
+                    )
+
+                # Mark state as completed for this category
+                # Only mark fully completed after all categories
+                if self.policy is None and self._category_index == 0:  # Just wrapped around
+                    session.mark_state_completed(state, country)
+
+                # Update final progress
+                progress = session.progress
+                if self.policy is not None:
+                    progress.completed_states = len(self.policy.covered_states())
+                else:
+                    progress.completed_states = len(session.completed_states)
+                progress.total_states = len(self._usa_states) + len(self._india_states)
+                progress.is_running = False
+
+                return result
+
+            except Exception as e:
+                logger.error(f"Collection error: {e}")
+                session.progress.is_running = False
+                return {"status": "error", "error": str(e)}
+
+            finally:
+                self.is_running = False
+
+    def _profile_run(self, name: str) -> ContextManager:
+        """Profile a collection run if profiling selects it, else do nothing."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.run_context(name)
+
+    async def _collect(
+        self,
+        state: str,
+        country: str,
+        category: DataCategory,
+        session: Optional[StorageSession] = None,
+    ) -> dict:
+        """
+        Collect venues for a single (state, country, category) target.
+
+        Args:
+            state: State to search in
+            country: Country (USA or India)
+            category: Category of venue to search for
+            session: Storage session to record results in; a new one is
+                opened and committed if not given
+
+        Returns:
+            Collection result dictionary
+        """
+        if session is None:
+            with get_storage().session(flush_size=VENUE_FLUSH_SIZE) as session:
+                return await self._collect(state, country, category, session)
+
         agent = get_agent()
-        query_gen = get_query_generator()
-
-        try:
-            # Get next state and category
-            state, country = self.get_next_state()
-            category = self.get_next_category()
-
-            logger.info(f"Starting collection: {category.value} in {state}, {country}")
-
-            # Update progress
-            progress = storage.load_progress()
-            progress.current_state = state
-            progress.current_country = country
-            progress.is_running = True
-            progress.last_run_at = datetime.utcnow()
-            storage.save_progress(progress)
-
-            # Generate optimized query
-            query = query_gen.generate_query(state, country, category)
-
-            # Run search
-            venues, executed_tools, query_used = await agent.search(
-                state=state,
-                country=country,
-                category=category,
-                max_results=self.settings.results_per_run,
-                custom_query=query,
-            )
+        query_pool = get_query_pool()
+
+        logger.info(f"Starting collection: {category.value} in {state}, {country}")
+
+        # Update progress
+        progress = session.progress
+        progress.current_state = state
+        progress.current_country = country
+        progress.last_run_at = datetime.utcnow()
+
+        # Take a pre-generated query from the pool
+        query = await query_pool.take(state, country, category)
+
+        # Run a streamed search; the session writes venues in small groups
+        # as they are parsed, so a cut-off or failed completion keeps what
+        # already arrived
+        venues = []
+        executed_tools = []
+        query_used = query
+        new_before = session.new_venues
+        async for kind, value in agent.search_stream(
+            state=state,
+            country=country,
+            category=category,
+            max_results=self.settings.results_per_run,
+            custom_query=query,
+        ):
+            if kind == "venue":
+                venues.append(value)
+                session.save_venues([value])
+            elif kind == "tool":
+                executed_tools.append(value)
+            elif kind == "query":
+                query_used = value
+
+        session.flush()
+        new_count = session.new_venues - new_before
+        query_pool.record_yield(state, country, category, query, new_count)
+        if self.policy is not None:
+            self.policy.record(state, country, category, new_count)
+
+        result = {
+            "status": "success",
+            "state": state,
+            "country": country,
+            "category": category.value,
+            "query_used": query_used,
+            "venues_found": len(venues),
+            "new_venues_saved": new_count,
+            "executed_tools": executed_tools,
+        }
 
-            # Save results
-            new_count = storage.save_venues(venues)
-
-            # Mark state as completed for this category
-            # Only mark fully completed after all categories
-            if self._category_index == 0:  # Just wrapped around
-                storage.mark_state_completed(state, country)
-
-            # Update final progress
-            stats = storage.get_stats()
-            progress = storage.load_progress()
-            progress.total_results = stats["total_venues"]
-            progress.completed_states = len(storage.get_completed_states())
-            progress.total_states = len(self._usa_states) + len(self._india_states)
-            progress.is_running = False
-            storage.save_progress(progress)
-
-            result = {
-                "status": "success",
-                "state": state,
-                "country": country,
-                "category": category.value,
-                "query_used": query_used,
-                "venues_found": len(venues),
-                "new_venues_saved": new_count,
-                "executed_tools": executed_tools,
-            }
+        logger.info(f"Collection complete: {result}")
+        return result
 
-            logger.info(f"Collection complete: {result}")
-            return result
+    async def _collect_batch(
+        self,
+        targets: list[SearchTarget],
+        session: Optional[StorageSession] = None,
+    ) -> dict:
+        """
+        Collect venues for several targets with one batched agent call.
 
-        except Exception as e:
-            logger.error(f"Collection error: {e}")
-            progress = storage.load_progress()
-            progress.is_running = False
-            storage.save_progress(progress)
-            return {"status": "error", "error": str(e)}
+        Args:
+            targets: Targets to collect
+            session: Storage session to record results in; a new one is
+                opened and committed if not given
 
-        finally:
-            self.is_running = False
+        Returns:
+            Collection result dictionary
+        """
+        if session is None:
+            with get_storage().session() as session:
+                return await self._collect_batch(targets, session)
+
+        agent = get_agent()
+
+        logger.info(f"Starting batch collection of {len(targets)} targets")
+        results, executed_tools = await agent.search_batch(
+            targets, max_results=self.settings.results_per_run
+        )
+
+        venues = [v for target_venues in results.values() for v in target_venues]
+        new_before = session.new_venues
+        # One flush per target attributes new venues to the cell that found them
+        for target in targets:
+            session.save_venues(results[target])
+            target_new = session.flush()
+            if self.policy is not None:
+                self.policy.record(target.state, target.country, target.category, target_new)
+        new_count = session.new_venues - new_before
+        session.progress.last_run_at = datetime.utcnow()
+
+        result = {
+            "status": "success",
+            "targets": [
+                {
+                    "state": t.state,
+                    "country": t.country,
+                    "category": t.category.value,
+                    "venues_found": len(results[t]),
+                }
+                for t in targets
+            ],
+            "venues_found": len(venues),
+            "new_venues_saved": new_count,
+            "executed_tools": executed_tools,
+        }
+
+        logger.info(f"Batch collection complete: {result}")
+        return result
 
     async def trigger_manual(
         self,
@@ -202,38 +574,25 @@ class CollectionScheduler:
 
         # Override next state/category if provided
         if state and country:
-            storage = get_storage()
-            agent = get_agent()
-            query_gen = get_query_generator()
-
             self.is_running = True
             try:
-                cat = category or DataCategory.COURTS
-                query = query_gen.generate_query(state, country, cat)
-
-                venues, executed_tools, query_used = await agent.search(
-                    state=state,
-                    country=country,
-                    category=cat,
-                    max_results=self.settings.results_per_run,
-                    custom_query=query,
-                )
-
-                new_count = storage.save_venues(venues)
-
-                return {
-                    "status": "success",
-                    "state": state,
-                    "country": country,
-                    "category": cat.value,
-                    "query_used": query_used,
-                    "venues_found": len(venues),
-                    "new_venues_saved": new_count,
-                    "executed_tools": executed_tools,
-                }
+                return await self._collect(state, country, category or DataCategory.COURTS)
             finally:
                 self.is_running = False
 
+        # In work-queue mode, hand the next state in rotation to the workers
+        if self.queue_mode and self._queue is not None:
+            tasks = self._next_tasks()
+            for task in tasks:
+                await self._queue.put(task)
+            return {
+                "status": "queued",
+                "tasks": [
+                    {"state": t.state, "country": t.country, "category": t.category.value}
+                    for t in tasks
+                ],
+            }
+
         # Otherwise run normal collection
         return await self._run_collection()
 
@@ -241,6 +600,8 @@ class CollectionScheduler:
         """Get scheduler status."""
         storage = get_storage()
         progress = storage.load_progress()
+        # Progress is only committed at the end of a run; report live state
+        progress.is_running = self.is_running or self._in_flight > 0
 
         next_run = None
         job = self.scheduler.get_job("volleyball_collection")
@@ -252,6 +613,11 @@ class CollectionScheduler:
             "collection_in_progress": self.is_running,
             "interval_minutes": self.settings.schedule_interval_minutes,
             "next_run_at": next_run,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "query_pool": get_query_pool().stats(),
+            "policy": self.policy.stats() if self.policy is not None else None,
             "progress": progress.model_dump(mode="json"),
         }
 
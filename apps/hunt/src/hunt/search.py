@@ -0,0 +1,145 @@
+"""Keyword search over venue names, descriptions and addresses."""
+
+import heapq
+import math
+import re
+import unicodedata
+from typing import Callable, Optional
+
+from .records import VenueRecord
+
+# Term frequency weight of each searched field
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0, "address": 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Split text into lowercase terms with diacritics removed."""
+    if not text:
+        return []
+    if text.isascii():
+        return _WORD.findall(text.lower())
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _WORD.findall(stripped)
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Translate a search query into an FTS5 match expression.
+
+    Terms are quoted so user input cannot inject FTS5 syntax, and joined
+    with OR so documents matching any term are ranked.
+    """
+    terms = dict.fromkeys(tokenize(query))
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class TextIndex:
+    """
+    Inverted index ranking documents with BM25.
+
+    Each document is the weighted bag of terms of a venue's name,
+    description and address, with name terms counting ``FIELD_WEIGHTS``
+    times as much. Documents are added and removed one at a time, so the
+    index stays current as venues are saved, and a query only visits the
+    postings of its own terms.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: dict[str, dict[int, float]] = {}
+        self._lengths: dict[int, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: int, venue: VenueRecord) -> None:
+        """Index a venue under a document id that is not indexed yet."""
+        frequencies = _frequencies(venue)
+        if not frequencies:
+            return
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int, venue: VenueRecord) -> None:
+        """Remove the document indexed for ``venue`` under ``doc_id``."""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in _frequencies(venue):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        accept: Optional[Callable[[int], bool]] = None,
+    ) -> tuple[int, list[tuple[float, int]]]:
+        """
+        Rank the documents matching any query term.
+
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            offset: Number of top results to skip
+            accept: Filter applied to matching document ids
+
+        Returns:
+            Tuple of (number of matches, list of (score, doc_id) best first)
+        """
+        terms = dict.fromkeys(tokenize(query))
+        if not terms or not self._lengths:
+            return 0, []
+
+        count = len(self._lengths)
+        lengths = self._lengths
+        # BM25's length normalization, K1 * (1 - B + B * length / average)
+        base = K1 * (1 - B)
+        per_length = K1 * B * count / self._total_length
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = idf * (K1 + 1)
+            get = scores.get
+            for doc_id, frequency in postings.items():
+                scores[doc_id] = get(doc_id, 0.0) + boost * frequency / (
+                    frequency + base + per_length * lengths[doc_id]
+                )
+
+        if accept is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if accept(doc_id)}
+        # nlargest is stable, so ties keep posting order
+        top = heapq.nlargest(offset + limit, scores, key=scores.get)
+        return len(scores), [(scores[doc_id], doc_id) for doc_id in top[offset:]]
+
+
+def _frequencies(venue: VenueRecord) -> dict[str, float]:
+    """Weighted term frequencies of a venue's searched fields."""
+    frequencies: dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(getattr(venue, field)):
+            frequencies[term] = frequencies.get(term, 0.0) + weight
+    return frequencies
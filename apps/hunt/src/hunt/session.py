@@ -0,0 +1,134 @@
+"""Unit-of-work sessions batching storage reads and writes."""
+
+import logging
+from typing import Any, Optional
+
+from .models import CollectionProgress, VenueData
+
+logger = logging.getLogger(__name__)
+
+
+class StorageSession:
+    """
+    Unit of work over a storage backend.
+
+    Progress and completed states are read at most once per session and
+    all changes are kept in memory. Venues are buffered and written with a
+    single ``save_venues`` call when the session commits, or earlier in
+    groups of ``flush_size`` so long-running collections persist results
+    as they arrive. On commit the progress total is refreshed from the
+    storage statistics and written once, together with the completed
+    states, whose count it reports. A session commits when its ``with`` block exits, also on
+    error, so everything collected before a failure is kept.
+
+    Works with any backend exposing the ``Storage`` interface.
+    """
+
+    def __init__(self, storage: Any, flush_size: int = 0):
+        """
+        Initialize the session.
+
+        Args:
+            storage: Storage backend to work on
+            flush_size: Pending venues that trigger an early flush
+                (0 flushes only on commit)
+        """
+        self.storage = storage
+        self.flush_size = flush_size
+        self.new_venues = 0
+        self._progress: Optional[CollectionProgress] = None
+        self._saved_progress: Optional[dict] = None
+        self._completed: Optional[set[str]] = None
+        self._newly_completed: list[str] = []
+        self._reset = False
+        self._pending: list[VenueData] = []
+        self._venues_written = False
+
+    def __enter__(self) -> "StorageSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.commit()
+
+    # Reads
+    @property
+    def progress(self) -> CollectionProgress:
+        """Collection progress, loaded on first access and edited in place."""
+        if self._progress is None:
+            self._progress = self.storage.load_progress()
+            self._saved_progress = self._progress.model_dump(mode="json")
+        return self._progress
+
+    @property
+    def completed_states(self) -> set[str]:
+        """Completed ``state|country`` keys including this session's changes."""
+        if self._completed is None:
+            self._completed = set() if self._reset else self.storage.get_completed_states()
+            self._completed.update(self._newly_completed)
+        return self._completed
+
+    def get_stats(self) -> dict:
+        """Collection statistics, including venues pending in this session."""
+        self.flush()
+        return self.storage.get_stats()
+
+    # Writes
+    def save_venues(self, venues: list[VenueData]) -> None:
+        """Queue venues for saving."""
+        self._pending.extend(venues)
+        if self.flush_size and len(self._pending) >= self.flush_size:
+            self.flush()
+
+    def mark_state_completed(self, state: str, country: str) -> None:
+        """Mark a state as completed for the current cycle."""
+        key = f"{state}|{country}"
+        self._newly_completed.append(key)
+        if self._completed is not None:
+            self._completed.add(key)
+
+    def reset_cycle(self) -> None:
+        """Reset completed states for a new collection cycle."""
+        self._reset = True
+        self._newly_completed = []
+        self._completed = set()
+
+    def flush(self) -> int:
+        """
+        Write pending venues now.
+
+        Returns:
+            Number of new venues stored by this flush
+        """
+        if not self._pending:
+            return 0
+
+        venues, self._pending = self._pending, []
+        new_count = self.storage.save_venues(venues)
+        self.new_venues += new_count
+        self._venues_written = True
+        return new_count
+
+    def commit(self) -> None:
+        """Write all pending changes."""
+        self.flush()
+
+        # Progress counts the completed states written with it
+        if self._reset or self._newly_completed:
+            self.progress.completed_states = len(self.completed_states)
+        if self._reset:
+            self.storage.reset_cycle()
+            self._reset = False
+        for key in dict.fromkeys(self._newly_completed):
+            state, country = key.split("|", 1)
+            self.storage.mark_state_completed(state, country)
+        self._newly_completed = []
+
+        if self._venues_written:
+            self.progress.total_results = self.storage.get_stats()["total_venues"]
+            self._venues_written = False
+
+        if self._progress is not None:
+            current = self._progress.model_dump(mode="json")
+            if current != self._saved_progress:
+                self.storage.save_progress(self._progress)
+                self._saved_progress = current
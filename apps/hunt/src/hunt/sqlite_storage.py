@@ -0,0 +1,672 @@
+"""SQLite-backed storage for collected volleyball data."""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from .dedup import (
+    blocking_keys,
+    distinct_key,
+    distinct_places,
+    find_duplicates,
+    is_duplicate,
+    merge_venues,
+)
+from .geo import HALF_CIRCUMFERENCE_KM, bounding_box, haversine_km
+from .metrics import STORAGE_SECONDS, VENUE_DUPLICATES, VENUES_FOUND, VENUES_NEW
+from .models import CollectionProgress, DataCategory, VenueData
+from .records import VenueRecord
+from .search import FIELD_WEIGHTS, fts_query
+from .session import StorageSession
+from .storage import Storage
+
+logger = logging.getLogger(__name__)
+
+VENUE_COLUMNS = (
+    "name",
+    "category",
+    "state",
+    "country",
+    "address",
+    "website",
+    "phone",
+    "email",
+    "description",
+    "source_url",
+    "latitude",
+    "longitude",
+    "collected_at",
+)
+
+# Full-text index over the searched columns, kept current by triggers
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE venues_fts USING fts5(
+    {', '.join(FIELD_WEIGHTS)},
+    content='venues', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER venues_fts_insert AFTER INSERT ON venues BEGIN
+    INSERT INTO venues_fts (rowid, {', '.join(FIELD_WEIGHTS)})
+    VALUES (new.id, {', '.join(f'new.{c}' for c in FIELD_WEIGHTS)});
+END;
+CREATE TRIGGER venues_fts_delete AFTER DELETE ON venues BEGIN
+    INSERT INTO venues_fts (venues_fts, rowid, {', '.join(FIELD_WEIGHTS)})
+    VALUES ('delete', old.id, {', '.join(f'old.{c}' for c in FIELD_WEIGHTS)});
+END;
+CREATE TRIGGER venues_fts_update AFTER UPDATE ON venues BEGIN
+    INSERT INTO venues_fts (venues_fts, rowid, {', '.join(FIELD_WEIGHTS)})
+    VALUES ('delete', old.id, {', '.join(f'old.{c}' for c in FIELD_WEIGHTS)});
+    INSERT INTO venues_fts (rowid, {', '.join(FIELD_WEIGHTS)})
+    VALUES (new.id, {', '.join(f'new.{c}' for c in FIELD_WEIGHTS)});
+END;
+"""
+
+# Radius of the first bounding box searched by nearest-venue queries
+NEAR_START_RADIUS_KM = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS venues (
+    id INTEGER PRIMARY KEY,
+    venue_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    state TEXT NOT NULL,
+    country TEXT NOT NULL,
+    address TEXT,
+    website TEXT,
+    phone TEXT,
+    email TEXT,
+    description TEXT,
+    source_url TEXT,
+    latitude REAL,
+    longitude REAL,
+    collected_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_venues_key ON venues (venue_key);
+CREATE INDEX IF NOT EXISTS idx_venues_state
+    ON venues (state COLLATE NOCASE, country COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_venues_country ON venues (country COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_venues_category ON venues (category);
+
+CREATE TABLE IF NOT EXISTS venue_blocks (
+    block_key TEXT NOT NULL,
+    venue_id INTEGER NOT NULL,
+    PRIMARY KEY (block_key, venue_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS completed_states (
+    state_key TEXT PRIMARY KEY
+);
+"""
+
+
+class SqliteStorage:
+    """
+    Venue storage backed by an indexed SQLite database.
+
+    Provides the same interface as ``Storage``. The database runs in WAL
+    mode so API reads never block the scheduler's writes, and every thread
+    gets its own connection. ``close`` closes the connections of all
+    threads; a thread using the storage afterwards opens a new one.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize storage with a database file.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.data_dir = db_path.parent
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Bumped by close, invalidating the connections threads hold
+        self._generation = 0
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        self._backfill_blocks()
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring databases created by older versions up to the schema."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(venues)")}
+        with conn:
+            for column in ("latitude", "longitude"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE venues ADD COLUMN {column} REAL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_venues_location ON venues (latitude, longitude) "
+                "WHERE latitude IS NOT NULL"
+            )
+
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'venues_fts'"
+        ).fetchone()
+        if not has_fts:
+            with conn:
+                conn.executescript(FTS_SCHEMA)
+                conn.execute("INSERT INTO venues_fts (venues_fts) VALUES ('rebuild')")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            # Only this thread uses the connection, but close may run on another
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            with self._connections_lock:
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
+    def warm_up(self) -> None:
+        """Refresh query planner statistics ahead of the first request."""
+        self._connect().execute("PRAGMA optimize")
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    def save_venues(self, venues: list[VenueData]) -> int:
+        """
+        Save venues to storage, avoiding duplicates.
+
+        Exact duplicates are found through the unique index on the venue
+        key and near duplicates through the ``venue_blocks`` table; both
+        are merged into the stored venue field by field.
+
+        Args:
+            venues: List of venues to save
+
+        Returns:
+            Number of new venues saved
+        """
+        if not venues:
+            return 0
+
+        with STORAGE_SECONDS.labels("sqlite", "save_venues").time():
+            new_count = self._save_venues(venues)
+        VENUES_FOUND.inc(len(venues))
+        VENUES_NEW.inc(new_count)
+        return new_count
+
+    def _save_venues(self, venues: list[VenueData]) -> int:
+        conn = self._connect()
+        new_count = 0
+        exact_matches = 0
+        # SQLite hands out the largest id plus one, which reuses the ids of
+        # the newest venues once deduplication deletes them; new ids start
+        # above every id ever used so cursors only grow
+        floor = self._get_metadata("venue_id_floor") or 0
+        with conn:
+            for venue in venues:
+                key, match = self._find_match(conn, venue)
+                if match is None:
+                    cursor = conn.execute(
+                        f"INSERT INTO venues (id, venue_key, {', '.join(VENUE_COLUMNS)}) "
+                        f"VALUES ((SELECT MAX(IFNULL(MAX(id), 0), ?) + 1 FROM venues), "
+                        f"{', '.join('?' for _ in range(len(VENUE_COLUMNS) + 1))})",
+                        (floor, *self._venue_row(venue, key)),
+                    )
+                    self._add_blocks(conn, cursor.lastrowid, venue)
+                    new_count += 1
+                    continue
+
+                venue_id, existing = match
+                if self._venue_key(existing) == self._venue_key(venue):
+                    exact_matches += 1
+                merged = merge_venues(existing, venue)
+                if merged is not existing:
+                    self._update_venue(conn, venue_id, merged)
+
+        if new_count:
+            logger.info(f"Saved {new_count} new venues")
+        VENUE_DUPLICATES.labels("exact").inc(exact_matches)
+        VENUE_DUPLICATES.labels("fuzzy").inc(len(venues) - new_count - exact_matches)
+        return new_count
+
+    def _find_match(
+        self, conn: sqlite3.Connection, venue: VenueData
+    ) -> tuple[str, Optional[tuple[int, VenueData]]]:
+        """
+        Find the stored venue an incoming venue duplicates.
+
+        Returns:
+            Tuple of (key to store the venue under, (id, venue) of the
+            match or None)
+        """
+        key = self._venue_key(venue)
+        row = self._row_by_key(conn, key)
+        if row is not None and distinct_places(self._row_venue(row), venue):
+            # Same name in the same state, but a different place
+            key = distinct_key(key, venue)
+            row = self._row_by_key(conn, key)
+        if row is not None:
+            return key, (row["id"], self._row_venue(row))
+
+        keys = blocking_keys(venue)
+        if not keys:
+            return key, None
+        rows = conn.execute(
+            f"SELECT id, {', '.join(VENUE_COLUMNS)} FROM venues WHERE id IN ("
+            f"SELECT venue_id FROM venue_blocks WHERE block_key IN "
+            f"({', '.join('?' for _ in keys)})) ORDER BY id",
+            keys,
+        )
+        for row in rows:
+            existing = self._row_venue(row)
+            if is_duplicate(existing, venue):
+                return key, (row["id"], existing)
+        return key, None
+
+    def _row_by_key(self, conn: sqlite3.Connection, key: str) -> Optional[sqlite3.Row]:
+        return conn.execute(
+            f"SELECT id, {', '.join(VENUE_COLUMNS)} FROM venues WHERE venue_key = ?", (key,)
+        ).fetchone()
+
+    def _update_venue(self, conn: sqlite3.Connection, venue_id: int, venue: VenueData) -> None:
+        data = venue.model_dump(mode="json")
+        conn.execute(
+            f"UPDATE venues SET {', '.join(f'{c} = ?' for c in VENUE_COLUMNS)} WHERE id = ?",
+            (*(data[c] for c in VENUE_COLUMNS), venue_id),
+        )
+        self._add_blocks(conn, venue_id, venue)
+
+    def _add_blocks(self, conn: sqlite3.Connection, venue_id: int, venue: VenueData) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO venue_blocks (block_key, venue_id) VALUES (?, ?)",
+            [(key, venue_id) for key in blocking_keys(venue)],
+        )
+
+    def _backfill_blocks(self) -> None:
+        """Populate the blocking table for venues stored before it existed."""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM venue_blocks LIMIT 1").fetchone():
+            return
+
+        rows = conn.execute(f"SELECT id, {', '.join(VENUE_COLUMNS)} FROM venues").fetchall()
+        if not rows:
+            return
+        with conn:
+            for row in rows:
+                self._add_blocks(conn, row["id"], self._row_venue(row))
+        logger.info(f"Built dedup blocks for {len(rows)} venues")
+
+    def deduplicate(self) -> dict:
+        """
+        Merge duplicate venues across the whole dataset.
+
+        Returns:
+            Summary with the number of merged and remaining venues
+        """
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT id, {', '.join(VENUE_COLUMNS)} FROM venues ORDER BY id"
+        ).fetchall()
+        changed, removed = find_duplicates(
+            (str(row["id"]), self._row_venue(row)) for row in rows
+        )
+
+        with conn:
+            if removed:
+                # Remembered so the ids of deleted venues are never reused
+                floor = max(rows[-1]["id"], self._get_metadata("venue_id_floor") or 0)
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES ('venue_id_floor', ?)",
+                    (json.dumps(floor),),
+                )
+            conn.executemany(
+                "DELETE FROM venue_blocks WHERE venue_id = ?", [(int(k),) for k in removed]
+            )
+            conn.executemany("DELETE FROM venues WHERE id = ?", [(int(k),) for k in removed])
+            for key, venue in changed.items():
+                self._update_venue(conn, int(key), venue)
+
+        remaining = len(rows) - len(removed)
+        logger.info(f"Deduplication merged {len(removed)} venues, {remaining} remain")
+        return {"merged": len(removed), "updated": len(changed), "remaining": remaining}
+
+    def _venue_key(self, venue: VenueData) -> str:
+        """Generate unique key for a venue."""
+        return f"{venue.name.lower()}|{venue.state.lower()}|{venue.country.lower()}"
+
+    def _venue_row(self, venue: VenueData, key: Optional[str] = None) -> tuple:
+        data = venue.model_dump(mode="json")
+        return (key or self._venue_key(venue), *(data[c] for c in VENUE_COLUMNS))
+
+    @staticmethod
+    def _row_venue(row: sqlite3.Row) -> VenueData:
+        # Rows were validated on insert, so they skip validation here
+        return VenueRecord.from_json({c: row[c] for c in VENUE_COLUMNS}).to_venue()
+
+    def _query_venues(self, where: str = "", params: tuple = ()) -> list[VenueData]:
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT {', '.join(VENUE_COLUMNS)} FROM venues {where} ORDER BY id",
+            params,
+        )
+
+        venues = []
+        for row in rows:
+            try:
+                venues.append(self._row_venue(row))
+            except Exception as e:
+                logger.error(f"Error loading venue: {e}")
+        return venues
+
+    def load_all_venues(self) -> list[VenueData]:
+        """Load all venues from storage."""
+        return self._query_venues()
+
+    def get_venues_by_state(
+        self, state: str, country: Optional[str] = None
+    ) -> list[VenueData]:
+        """Get venues for a specific state, optionally within one country."""
+        if country:
+            return self._query_venues(
+                "WHERE state = ? COLLATE NOCASE AND country = ? COLLATE NOCASE",
+                (state, country),
+            )
+        return self._query_venues("WHERE state = ? COLLATE NOCASE", (state,))
+
+    def get_venues_by_category(self, category: DataCategory) -> list[VenueData]:
+        """Get venues for a specific category."""
+        return self._query_venues("WHERE category = ?", (category.value,))
+
+    def get_venues_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        category: Optional[DataCategory] = None,
+    ) -> list[tuple[float, VenueData]]:
+        """
+        Get the venues nearest to a location, optionally within a radius.
+
+        Bounding boxes around the location are read through the location
+        index, widening until they hold ``limit`` venues or reach the
+        radius. Only venues with coordinates are considered.
+
+        Returns:
+            List of (distance_km, venue), nearest first
+        """
+        max_radius = HALF_CIRCUMFERENCE_KM if radius_km is None else radius_km
+        radius = min(NEAR_START_RADIUS_KM, max_radius)
+        while True:
+            found = self._venues_within(lat, lon, radius, category)
+            if len(found) >= limit or radius >= max_radius:
+                return found[:limit]
+            radius = min(radius * 4, max_radius)
+
+    def _venues_within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[DataCategory],
+    ) -> list[tuple[float, VenueData]]:
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        where = "WHERE latitude BETWEEN ? AND ? AND "
+        if min_lon <= max_lon:
+            where += "longitude BETWEEN ? AND ?"
+        else:
+            where += "(longitude >= ? OR longitude <= ?)"
+        params: tuple = (min_lat, max_lat, min_lon, max_lon)
+        if category is not None:
+            where += " AND category = ?"
+            params += (category.value,)
+
+        found = []
+        for venue in self._query_venues(where, params):
+            distance = haversine_km(lat, lon, venue.latitude, venue.longitude)
+            if distance <= radius_km:
+                found.append((distance, venue))
+        found.sort(key=lambda hit: hit[0])
+        return found
+
+    def search_venues(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+    ) -> tuple[int, list[tuple[float, VenueData]]]:
+        """
+        Search venue names, descriptions and addresses by keyword.
+
+        Results are ranked with FTS5's BM25, weighting the columns like
+        the JSON backend's index.
+
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            offset: Number of top results to skip
+            state: Only venues in this state
+            country: Only venues in this country
+            category: Only venues in this category
+
+        Returns:
+            Tuple of (number of matches, list of (score, venue)), best first
+        """
+        match = fts_query(query)
+        if match is None:
+            return 0, []
+
+        where = "venues_fts MATCH ?"
+        params: list[Any] = [match]
+        if state:
+            where += " AND v.state = ? COLLATE NOCASE"
+            params.append(state)
+        if country:
+            where += " AND v.country = ? COLLATE NOCASE"
+            params.append(country)
+        if category:
+            where += " AND v.category = ?"
+            params.append(category.value)
+
+        conn = self._connect()
+        source = "FROM venues_fts JOIN venues AS v ON v.id = venues_fts.rowid"
+        total = conn.execute(f"SELECT COUNT(*) {source} WHERE {where}", params).fetchone()[0]
+        # bm25() is lower for better matches
+        rank = f"bm25(venues_fts, {', '.join(str(w) for w in FIELD_WEIGHTS.values())})"
+        rows = conn.execute(
+            f"SELECT {rank} AS rank, {', '.join(f'v.{c}' for c in VENUE_COLUMNS)} "
+            f"{source} WHERE {where} ORDER BY rank, v.id LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return total, [(-row["rank"], self._row_venue(row)) for row in rows]
+
+    def iter_venues(
+        self,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+        after: Optional[int] = None,
+        page_size: int = 500,
+    ) -> Iterator[tuple[int, VenueData]]:
+        """
+        Stream (cursor, venue) pairs matching the filters in cursor order.
+
+        Rows are read in keyset-paginated pages, each fetched completely, so
+        the generator can be resumed from any thread.
+
+        Args:
+            state: Only venues in this state
+            country: Only venues in this country
+            category: Only venues in this category
+            after: Resume after this cursor
+            page_size: Rows fetched per query
+
+        Yields:
+            Tuples of (cursor, venue)
+        """
+        filters = []
+        params: list[Any] = []
+        if state:
+            filters.append("state = ? COLLATE NOCASE")
+            params.append(state)
+        if country:
+            filters.append("country = ? COLLATE NOCASE")
+            params.append(country)
+        if category:
+            filters.append("category = ?")
+            params.append(category.value)
+
+        last_id = after if after is not None else 0
+        while True:
+            where = " AND ".join(filters + ["id > ?"])
+            rows = self._connect().execute(
+                f"SELECT id, {', '.join(VENUE_COLUMNS)} FROM venues WHERE {where} "
+                f"ORDER BY id LIMIT ?",
+                (*params, last_id, page_size),
+            ).fetchall()
+
+            for row in rows:
+                yield row["id"], self._row_venue(row)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def count_venues(self) -> int:
+        """Get the number of stored venues."""
+        return self._connect().execute("SELECT COUNT(*) FROM venues").fetchone()[0]
+
+    def get_stats(self) -> dict:
+        """Get collection statistics."""
+        conn = self._connect()
+        total = self.count_venues()
+        by_category = dict(
+            conn.execute("SELECT category, COUNT(*) FROM venues GROUP BY category")
+        )
+        by_country = dict(
+            conn.execute("SELECT country, COUNT(*) FROM venues GROUP BY country")
+        )
+        by_state = {
+            f"{state}, {country}": count
+            for state, country, count in conn.execute(
+                "SELECT state, country, COUNT(*) FROM venues GROUP BY state, country"
+            )
+        }
+
+        return {
+            "total_venues": total,
+            "by_category": by_category,
+            "by_country": by_country,
+            "by_state": by_state,
+        }
+
+    def session(self, flush_size: int = 0) -> StorageSession:
+        """
+        Open a unit-of-work session batching reads and writes.
+
+        Args:
+            flush_size: Pending venues that trigger an early write
+                (0 writes only on commit)
+        """
+        return StorageSession(self, flush_size=flush_size)
+
+    # Progress tracking
+    def _get_metadata(self, key: str) -> Optional[Any]:
+        row = self._connect().execute(
+            "SELECT value FROM metadata WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_metadata(self, key: str, value: Any) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, default=str)),
+            )
+
+    def load_progress(self) -> CollectionProgress:
+        """Load collection progress."""
+        with STORAGE_SECONDS.labels("sqlite", "load_progress").time():
+            data = self._get_metadata("progress")
+        if data is None:
+            return CollectionProgress()
+
+        try:
+            return CollectionProgress(**data)
+        except Exception as e:
+            logger.error(f"Error loading progress: {e}")
+            return CollectionProgress()
+
+    def save_progress(self, progress: CollectionProgress) -> None:
+        """Save collection progress."""
+        with STORAGE_SECONDS.labels("sqlite", "save_progress").time():
+            self._set_metadata("progress", progress.model_dump(mode="json"))
+
+    def get_completed_states(self) -> set[str]:
+        """Get set of completed state-country combinations."""
+        rows = self._connect().execute("SELECT state_key FROM completed_states")
+        return {row[0] for row in rows}
+
+    def mark_state_completed(self, state: str, country: str) -> None:
+        """Mark a state as completed for current cycle."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO completed_states (state_key) VALUES (?)",
+                (f"{state}|{country}",),
+            )
+
+    def reset_cycle(self) -> None:
+        """Reset completed states for a new collection cycle."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM completed_states")
+        logger.info("Collection cycle reset")
+
+
+def migrate_from_json(source: Storage, target: SqliteStorage, batch_size: int = 1000) -> int:
+    """
+    Copy venues, progress and completed states from JSON storage into SQLite.
+
+    The migration is idempotent: venues already present in the target are
+    skipped by the unique venue key.
+
+    Args:
+        source: JSON-file ``Storage`` to read from
+        target: SQLite storage to write to
+        batch_size: Number of venues inserted per transaction
+
+    Returns:
+        Number of venues inserted
+    """
+    venues = source.load_all_venues()
+    inserted = 0
+    for start in range(0, len(venues), batch_size):
+        inserted += target.save_venues(venues[start:start + batch_size])
+
+    target.save_progress(source.load_progress())
+    for state_key in source.get_completed_states():
+        state, _, country = state_key.partition("|")
+        target.mark_state_completed(state, country)
+
+    logger.info(f"Migrated {inserted} of {len(venues)} venues into {target.db_path}")
+    return inserted
@@ -4,9 +4,29 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
+from typing import Iterator, Optional
+
+from .config import get_settings
+from .dedup import (
+    DedupIndex,
+    distinct_key,
+    distinct_places,
+    find_duplicates,
+    merge_venues,
+)
+from .index import VenueIndex
+from .journal import JournaledDocument
+from .metrics import (
+    DATASET_VENUES,
+    STORAGE_SECONDS,
+    VENUE_DUPLICATES,
+    VENUES_FOUND,
+    VENUES_NEW,
+)
 from .models import CollectionProgress, DataCategory, VenueData
+from .records import VenueRecord
+from .session import StorageSession
+from .venue_log import VenueLog
 
 logger = logging.getLogger(__name__)
 
@@ -17,144 +37,323 @@ DATA_DIR = Path(__file__).parent.parent.parent / "data"
 class Storage:
     """Handles data persistence for collected volleyball venues."""
 
-    def __init__(self, data_dir: Optional[Path] = None):
-        """Initialize storage with data directory."""
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        compact_min_segments: int = 4,
+        fsync_interval_seconds: float = 1.0,
+    ):
+        """
+        Initialize storage with data directory.
+
+        Opening the storage recovers from an earlier crash: torn writes
+        are cut off and the progress journals are replayed.
+
+        Args:
+            data_dir: Directory for data files (defaults to ``DATA_DIR``)
+            segment_max_bytes: Size at which the venue log starts a new segment
+            compact_min_segments: Sealed segments that trigger background compaction
+            fsync_interval_seconds: Minimum time between fsyncs of the
+                progress journals (0 syncs every update)
+        """
         self.data_dir = data_dir or DATA_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self._progress_file = self.data_dir / "progress.json"
+        self._progress = JournaledDocument(
+            self.data_dir / "progress.json", fsync_interval_seconds=fsync_interval_seconds
+        )
+        self._completed = JournaledDocument(
+            self.data_dir / "completed_states.json",
+            fsync_interval_seconds=fsync_interval_seconds,
+        )
         self._venues_file = self.data_dir / "venues.json"
+        self._log = VenueLog(
+            self.data_dir / "venues",
+            segment_max_bytes=segment_max_bytes,
+            compact_min_segments=compact_min_segments,
+        )
+        self._index: Optional[VenueIndex] = None
+        self._dedup = DedupIndex()
+        self._import_legacy_venues()
 
     def save_venues(self, venues: list[VenueData]) -> int:
         """
         Save venues to storage, avoiding duplicates.
 
+        New venues are appended to the venue log and added to the
+        in-memory index, so the cost of a save grows with the size of the
+        batch rather than the dataset. A venue matching a stored one,
+        exactly or through the dedup blocking index, is merged into it
+        field by field instead of being stored again.
+
         Args:
             venues: List of venues to save
 
         Returns:
             Number of new venues saved
         """
-        existing = self.load_all_venues()
-        existing_keys = {self._venue_key(v) for v in existing}
-
-        new_venues = []
+        with STORAGE_SECONDS.labels("json", "save_venues").time():
+            new_count = self._save_venues(venues)
+        VENUES_FOUND.inc(len(venues))
+        VENUES_NEW.inc(new_count)
+        return new_count
+
+    def _save_venues(self, venues: list[VenueData]) -> int:
+        index = self.load_index()
+
+        entries = []
+        new_count = 0
+        exact_matches = 0
         for venue in venues:
-            if self._venue_key(venue) not in existing_keys:
-                new_venues.append(venue)
-                existing_keys.add(self._venue_key(venue))
-
-        if new_venues:
-            all_venues = existing + new_venues
-            self._write_venues(all_venues)
-            logger.info(f"Saved {len(new_venues)} new venues")
-
-        return len(new_venues)
+            key = self._venue_key(venue)
+            stored = index.get(key)
+            if stored is not None and distinct_places(stored, venue):
+                # Same name in the same state, but a different place
+                key = distinct_key(key, venue)
+                stored = index.get(key)
+            if stored is not None:
+                match = key
+                exact_matches += 1
+            else:
+                match = self._dedup.find(venue, index.get)
+
+            if match is None:
+                new_count += 1
+            else:
+                existing = index.get(match).to_venue()
+                merged = merge_venues(existing, venue)
+                if merged is existing:
+                    continue
+                key, venue = match, merged
+
+            venue_id = index.add(key, venue)
+            self._dedup.add(key, venue)
+            entries.append((key, venue_id, venue.model_dump(mode="json")))
+
+        if entries:
+            self._log.append(entries)
+            logger.info(f"Saved {new_count} new venues, updated {len(entries) - new_count}")
+
+        VENUE_DUPLICATES.labels("exact").inc(exact_matches)
+        VENUE_DUPLICATES.labels("fuzzy").inc(len(venues) - new_count - exact_matches)
+        return new_count
 
     def _venue_key(self, venue: VenueData) -> str:
         """Generate unique key for a venue."""
         return f"{venue.name.lower()}|{venue.state.lower()}|{venue.country.lower()}"
 
-    def _write_venues(self, venues: list[VenueData]) -> None:
-        """Write all venues to file."""
-        data = [v.model_dump(mode="json") for v in venues]
-        with open(self._venues_file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+    def load_index(self) -> VenueIndex:
+        """
+        Get the in-memory venue index, building it from the log only once.
 
-    def load_all_venues(self) -> list[VenueData]:
-        """Load all venues from storage."""
-        if not self._venues_file.exists():
-            return []
+        Logged venues were validated when they were saved, so they are
+        loaded straight into compact records without building models.
+        """
+        if self._index is None:
+            index = VenueIndex()
+            dedup = DedupIndex()
+            with STORAGE_SECONDS.labels("json", "load_index").time():
+                records, last_seq = self._log.read()
+                # Ids of deleted venues are never reused, keeping cursors monotonic
+                index.reserve(last_seq)
+                for key, (seq, record) in records.items():
+                    try:
+                        venue = VenueRecord.from_json(record)
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.error(f"Error loading venue: {e}")
+                        continue
+                    index.add(key, venue, seq)
+                    dedup.add(key, venue)
+            self._index = index
+            self._dedup = dedup
+            logger.info(f"Indexed {len(index)} venues")
+        return self._index
+
+    def warm_up(self) -> None:
+        """Build the in-memory index ahead of the first request."""
+        self.load_index()
+
+    def _import_legacy_venues(self) -> None:
+        """Import a pre-log ``venues.json`` file into the venue log once."""
+        if not self._venues_file.exists() or not self._log.is_empty():
+            return
 
         try:
             with open(self._venues_file) as f:
                 data = json.load(f)
-                return [VenueData(**v) for v in data]
+            venues = [VenueData(**v) for v in data]
         except (json.JSONDecodeError, Exception) as e:
-            logger.error(f"Error loading venues: {e}")
-            return []
+            logger.error(f"Error importing legacy venues: {e}")
+            return
 
-    def get_venues_by_state(self, state: str) -> list[VenueData]:
-        """Get venues for a specific state."""
-        all_venues = self.load_all_venues()
-        return [v for v in all_venues if v.state.lower() == state.lower()]
+        # Imported like a normal save, so same-named venues at different
+        # places stay apart and duplicates are merged
+        new_count = self._save_venues(venues)
+
+        imported = self._venues_file.with_name("venues.json.imported")
+        self._venues_file.rename(imported)
+        logger.info(f"Imported {new_count} venues from {self._venues_file.name}")
+
+    def load_all_venues(self) -> list[VenueData]:
+        """Load all venues from storage."""
+        return [record.to_venue() for record in self.load_index().venues.values()]
+
+    def deduplicate(self) -> dict:
+        """
+        Merge duplicate venues across the whole dataset.
+
+        Returns:
+            Summary with the number of merged and remaining venues
+        """
+        index = self.load_index()
+        changed, removed = find_duplicates(
+            (key, record.to_venue()) for key, record in index.items()
+        )
+        self._log.append(
+            [(k, index.venue_id(k), v.model_dump(mode="json")) for k, v in changed.items()]
+        )
+        self._log.delete(removed)
+
+        # Rebuild the indexes without the merged-away venues
+        self._index = None
+        remaining = len(self.load_index())
+        logger.info(f"Deduplication merged {len(removed)} venues, {remaining} remain")
+        return {"merged": len(removed), "updated": len(changed), "remaining": remaining}
+
+    def compact(self) -> None:
+        """Compact the venue log in the foreground."""
+        self._log.wait_for_compaction()
+        self._log.compact()
+
+    def get_venues_by_state(
+        self, state: str, country: Optional[str] = None
+    ) -> list[VenueData]:
+        """Get venues for a specific state, optionally within one country."""
+        return [record.to_venue() for record in self.load_index().by_state(state, country)]
 
     def get_venues_by_category(self, category: DataCategory) -> list[VenueData]:
         """Get venues for a specific category."""
-        all_venues = self.load_all_venues()
-        return [v for v in all_venues if v.category == category]
+        return [record.to_venue() for record in self.load_index().by_category(category)]
+
+    def get_venues_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: int = 10,
+        category: Optional[DataCategory] = None,
+    ) -> list[tuple[float, VenueData]]:
+        """
+        Get the venues nearest to a location, optionally within a radius.
+
+        Only venues with coordinates are considered.
+
+        Returns:
+            List of (distance_km, venue), nearest first
+        """
+        hits = self.load_index().near(lat, lon, radius_km, limit, category)
+        return [(distance, record.to_venue()) for distance, record in hits]
+
+    def search_venues(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+    ) -> tuple[int, list[tuple[float, VenueData]]]:
+        """
+        Search venue names, descriptions and addresses by keyword.
+
+        Results are ranked with BM25 over an in-memory inverted index that
+        ``save_venues`` keeps current.
+
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            offset: Number of top results to skip
+            state: Only venues in this state
+            country: Only venues in this country
+            category: Only venues in this category
+
+        Returns:
+            Tuple of (number of matches, list of (score, venue)), best first
+        """
+        total, hits = self.load_index().search(query, limit, offset, state, country, category)
+        return total, [(score, record.to_venue()) for score, record in hits]
+
+    def iter_venues(
+        self,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        category: Optional[DataCategory] = None,
+        after: Optional[int] = None,
+    ) -> Iterator[tuple[int, VenueData]]:
+        """
+        Stream (cursor, venue) pairs matching the filters in cursor order.
+
+        Args:
+            state: Only venues in this state
+            country: Only venues in this country
+            category: Only venues in this category
+            after: Resume after this cursor
+
+        Yields:
+            Tuples of (cursor, venue)
+        """
+        for cursor, record in self.load_index().scan(state, country, category, after):
+            yield cursor, record.to_venue()
 
     def get_stats(self) -> dict:
         """Get collection statistics."""
-        venues = self.load_all_venues()
+        return self.load_index().stats()
 
-        by_category = {}
-        by_country = {}
-        by_state = {}
+    def count_venues(self) -> int:
+        """Get the number of stored venues."""
+        return len(self.load_index())
 
-        for venue in venues:
-            # By category
-            cat = venue.category.value
-            by_category[cat] = by_category.get(cat, 0) + 1
-
-            # By country
-            by_country[venue.country] = by_country.get(venue.country, 0) + 1
+    def close(self) -> None:
+        """Flush pending writes and checkpoint the progress journals."""
+        self._log.wait_for_compaction()
+        for document in (self._progress, self._completed):
+            document.checkpoint()
 
-            # By state
-            state_key = f"{venue.state}, {venue.country}"
-            by_state[state_key] = by_state.get(state_key, 0) + 1
+    def session(self, flush_size: int = 0) -> StorageSession:
+        """
+        Open a unit-of-work session batching reads and writes.
 
-        return {
-            "total_venues": len(venues),
-            "by_category": by_category,
-            "by_country": by_country,
-            "by_state": by_state,
-        }
+        Args:
+            flush_size: Pending venues that trigger an early write
+                (0 writes only on commit)
+        """
+        return StorageSession(self, flush_size=flush_size)
 
     # Progress tracking
     def load_progress(self) -> CollectionProgress:
         """Load collection progress."""
-        if not self._progress_file.exists():
-            return CollectionProgress()
-
         try:
-            with open(self._progress_file) as f:
-                data = json.load(f)
-                return CollectionProgress(**data)
-        except (json.JSONDecodeError, Exception) as e:
+            return CollectionProgress(**self._progress.data)
+        except Exception as e:
             logger.error(f"Error loading progress: {e}")
             return CollectionProgress()
 
     def save_progress(self, progress: CollectionProgress) -> None:
-        """Save collection progress."""
-        with open(self._progress_file, "w") as f:
-            json.dump(progress.model_dump(mode="json"), f, indent=2, default=str)
+        """Save collection progress, journaling only the changed fields."""
+        with STORAGE_SECONDS.labels("json", "save_progress").time():
+            self._progress.set(progress.model_dump(mode="json"))
 
     def get_completed_states(self) -> set[str]:
         """Get set of completed state-country combinations."""
-        progress_file = self.data_dir / "completed_states.json"
-        if not progress_file.exists():
-            return set()
-
-        try:
-            with open(progress_file) as f:
-                return set(json.load(f))
-        except Exception:
-            return set()
+        return set(self._completed.data)
 
     def mark_state_completed(self, state: str, country: str) -> None:
         """Mark a state as completed for current cycle."""
-        completed = self.get_completed_states()
-        completed.add(f"{state}|{country}")
-
-        progress_file = self.data_dir / "completed_states.json"
-        with open(progress_file, "w") as f:
-            json.dump(list(completed), f)
+        self._completed.set({f"{state}|{country}": True})
 
     def reset_cycle(self) -> None:
         """Reset completed states for a new collection cycle."""
-        progress_file = self.data_dir / "completed_states.json"
-        if progress_file.exists():
-            progress_file.unlink()
+        self._completed.clear()
         logger.info("Collection cycle reset")
 
 
@@ -163,8 +362,24 @@ _storage: Optional[Storage] = None
 
 
 def get_storage() -> Storage:
-    """Get or create the storage instance."""
+    """
+    Get or create the storage instance.
+
+    The backend is selected by ``Settings.storage_backend``; the SQLite
+    backend exposes the same interface as ``Storage``.
+    """
     global _storage
     if _storage is None:
-        _storage = Storage()
+        settings = get_settings()
+        if settings.storage_backend == "sqlite":
+            from .sqlite_storage import SqliteStorage
+
+            _storage = SqliteStorage(settings.sqlite_path or DATA_DIR / "hunt.db")
+        else:
+            _storage = Storage(
+                segment_max_bytes=settings.venue_segment_max_bytes,
+                compact_min_segments=settings.venue_compact_min_segments,
+                fsync_interval_seconds=settings.journal_fsync_interval_seconds,
+            )
+        DATASET_VENUES.set_function(lambda: get_storage().count_venues())
     return _storage
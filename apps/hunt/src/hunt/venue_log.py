@@ -0,0 +1,260 @@
+"""Append-only JSON-lines segment log for venue records."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from .journal import fsync_directory, remove_stale_temp_files, truncate_torn_tail
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class VenueLog:
+    """
+    Append-only log of keyed records split into JSON-lines segments.
+
+    Every line is an entry of the form
+    ``{"key": ..., "seq": ..., "venue": {...}}``, or a tombstone
+    ``{"key": ..., "deleted": true}``. A later entry with the same key
+    supersedes an earlier one, so readers fold the log into the latest
+    record per key. ``seq`` is the key's sequence number, which stays the
+    same across rewrites of the key and orders records for readers.
+    Writes only ever append to the newest (active) segment; once it grows
+    past ``segment_max_bytes`` a new segment is started. Sealed segments
+    are immutable until compaction merges them into a single segment
+    holding only the latest entry for every key.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        compact_min_segments: int = 4,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            directory: Directory holding the segment files
+            segment_max_bytes: Size after which the active segment is sealed
+            compact_min_segments: Number of sealed segments that triggers
+                a background compaction
+        """
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_min_segments = compact_min_segments
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self.recover()
+
+    def recover(self) -> None:
+        """
+        Repair the log after a crash.
+
+        Removes the temporary file of an interrupted compaction and cuts
+        off a partially written last entry, which would otherwise swallow
+        the next entry appended after it.
+        """
+        remove_stale_temp_files(self.directory)
+        segments = self.segments()
+        if segments:
+            truncate_torn_tail(segments[-1])
+
+    # Segment bookkeeping
+    def segments(self) -> list[Path]:
+        """Return all segment files, oldest first."""
+        return sorted(
+            p for p in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        )
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def _active_segment(self) -> Path:
+        segments = self.segments()
+        if not segments:
+            return self._segment_path(1)
+
+        active = segments[-1]
+        if active.stat().st_size >= self.segment_max_bytes:
+            return self._segment_path(self._segment_number(active) + 1)
+        return active
+
+    def is_empty(self) -> bool:
+        """Check whether the log holds no segments yet."""
+        return not self.segments()
+
+    # Writing
+    def append(self, entries: list[tuple[str, Optional[int], dict[str, Any]]]) -> None:
+        """
+        Append keyed records to the active segment.
+
+        Args:
+            entries: List of (key, sequence number, record) triples to
+                append; a None sequence number is assigned by readers
+        """
+        if not entries:
+            return
+
+        payload = "".join(
+            json.dumps(_entry(key, seq, record), default=str) + "\n"
+            for key, seq, record in entries
+        )
+
+        with self._lock:
+            with open(self._active_segment(), "a", encoding="utf-8") as f:
+                f.write(payload)
+
+        self.maybe_compact()
+
+    def delete(self, keys: list[str]) -> None:
+        """
+        Append tombstones removing the given keys.
+
+        Args:
+            keys: Keys of the records to remove
+        """
+        if not keys:
+            return
+
+        payload = "".join(json.dumps({"key": key, "deleted": True}) + "\n" for key in keys)
+        with self._lock:
+            with open(self._active_segment(), "a", encoding="utf-8") as f:
+                f.write(payload)
+
+    # Reading
+    def _read_segment(self, path: Path) -> Iterator[dict[str, Any]]:
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed entry {path.name}:{line_no}")
+
+    def entries(self) -> Iterator[dict[str, Any]]:
+        """Iterate over raw log entries in write order."""
+        with self._lock:
+            for path in self.segments():
+                yield from self._read_segment(path)
+
+    def read(self) -> tuple[dict[str, tuple[int, dict[str, Any]]], int]:
+        """
+        Fold the log into the sequence number and latest record per key.
+
+        Keys keep the position of their first appearance, so the result
+        is ordered by first insertion.
+
+        Returns:
+            Tuple of (sequence number and record per key, highest sequence
+            number ever written, including deleted keys; -1 if none)
+        """
+        latest, last = _fold(self.entries())
+        return {key: (entry["seq"], entry["venue"]) for key, entry in latest.items()}, last
+
+    # Compaction
+    def maybe_compact(self) -> None:
+        """Start a background compaction if enough segments are sealed."""
+        sealed = len(self.segments()) - 1
+        if sealed < self.compact_min_segments:
+            return
+
+        with self._lock:
+            if self._compaction and self._compaction.is_alive():
+                return
+            self._compaction = threading.Thread(
+                target=self.compact, name="venue-log-compaction", daemon=True
+            )
+            self._compaction.start()
+
+    def compact(self) -> None:
+        """
+        Merge all sealed segments into one.
+
+        The merged segment takes the number of the newest sealed segment
+        and is swapped in with an atomic rename before the older segments
+        are removed, so a crash at any point leaves a log that folds to the
+        same records.
+        """
+        with self._lock:
+            sealed = self.segments()[:-1]
+        if len(sealed) < 2:
+            return
+
+        # Tombstones can be dropped here: the merge always starts at the
+        # oldest segment, so nothing older is left for them to shadow.
+        # Sequence numbers assigned while folding are written out, so they
+        # no longer depend on the entries before them
+        merged, last = _fold(entry for path in sealed for entry in self._read_segment(path))
+
+        target = sealed[-1]
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in merged.values():
+                f.write(json.dumps(entry, default=str) + "\n")
+            if last > max((entry["seq"] for entry in merged.values()), default=-1):
+                # A deleted key held the highest number; a keyless tombstone
+                # keeps it from being handed out again
+                f.write(json.dumps({"key": None, "seq": last, "deleted": True}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._lock:
+            os.replace(tmp, target)
+            fsync_directory(self.directory)
+            for path in sealed[:-1]:
+                path.unlink(missing_ok=True)
+
+        logger.info(f"Compacted {len(sealed)} venue segments into {target.name}")
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+
+def _entry(key: str, seq: Optional[int], record: dict[str, Any]) -> dict[str, Any]:
+    if seq is None:
+        return {"key": key, "venue": record}
+    return {"key": key, "seq": seq, "venue": record}
+
+
+def _fold(entries: Iterable[dict[str, Any]]) -> tuple[dict[str, dict[str, Any]], int]:
+    """
+    Fold log entries into the latest entry per key.
+
+    Entries without a sequence number, as written before entries carried
+    one, keep the number of their key or take the next one after every
+    number seen so far.
+
+    Returns:
+        Tuple of (latest entry per key, highest sequence number seen)
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    last = -1
+    for entry in entries:
+        key = entry["key"]
+        if entry.get("deleted"):
+            latest.pop(key, None)
+            last = max(last, entry.get("seq", -1))
+            continue
+        if entry.get("seq") is None:
+            previous = latest.get(key)
+            entry["seq"] = previous["seq"] if previous is not None else last + 1
+        last = max(last, entry["seq"])
+        latest[key] = entry
+    return latest, last
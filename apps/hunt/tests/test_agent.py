@@ -0,0 +1,115 @@
+"""Tests for the Groq Compound agent."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from src.hunt.agent import VolleyballAgent
+from src.hunt.metrics import BATCH_UNLABELLED_ITEMS
+from src.hunt.models import DataCategory, SearchTarget
+
+
+class FakeLLM:
+    """LLM client returning canned completions in order."""
+
+    def __init__(self, *contents: tuple[str, str]):
+        self.contents = list(contents)
+        self.calls = []
+
+    async def chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        content, finish_reason = self.contents.pop(0)
+        message = SimpleNamespace(content=content, executed_tools=[{"type": "search"}])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason=finish_reason)]
+        )
+
+    async def stream_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        content, finish_reason = self.contents.pop(0)
+        tools = [{"type": "search"}]
+        for start in range(0, len(content), 7):
+            delta = SimpleNamespace(content=content[start:start + 7], executed_tools=tools)
+            tools = None
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=None)])
+        delta = SimpleNamespace(content=None, executed_tools=None)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def make_agent(*contents: tuple[str, str]) -> VolleyballAgent:
+    """Create an agent backed by a fake LLM."""
+    agent = VolleyballAgent.__new__(VolleyballAgent)
+    agent.llm = FakeLLM(*contents)
+    agent.model = "groq/compound"
+    return agent
+
+
+TARGETS = [
+    SearchTarget(state="Texas", country="USA", category=DataCategory.COURTS),
+    SearchTarget(state="Goa", country="India", category=DataCategory.CLUBS),
+]
+
+
+def test_search_batch_splits_results_by_target():
+    """Test that one batch call is split back into per-target venues."""
+    content = json.dumps([
+        {"name": "Austin Courts", "target": "T1"},
+        {"name": "Goa Club", "target": "T2"},
+        {"name": "Dallas Courts", "target": "t1"},
+    ])
+    agent = make_agent((content, "stop"))
+
+    results, tools = asyncio.run(agent.search_batch(TARGETS))
+    assert [v.name for v in results[TARGETS[0]]] == ["Austin Courts", "Dallas Courts"]
+    assert [(v.name, v.state, v.category) for v in results[TARGETS[1]]] == [
+        ("Goa Club", "Goa", DataCategory.CLUBS)
+    ]
+    assert tools == ["search"]
+    assert len(agent.llm.calls) == 1
+
+
+def test_search_batch_falls_back_when_truncated():
+    """Test that a truncated batch is retried with single-target calls."""
+    truncated = '[{"name": "Austin Courts", "target": "T1"}, {"name": "Goa'
+    agent = make_agent(
+        (truncated, "length"),
+        (json.dumps([{"name": "Austin Courts"}]), "stop"),
+        (json.dumps([{"name": "Goa Club"}]), "stop"),
+    )
+
+    results, _ = asyncio.run(agent.search_batch(TARGETS))
+    assert [v.name for v in results[TARGETS[0]]] == ["Austin Courts"]
+    assert [v.name for v in results[TARGETS[1]]] == ["Goa Club"]
+    assert len(agent.llm.calls) == 3
+
+
+def test_search_batch_retries_targets_without_labelled_items():
+    """Test that every target left without labelled venues is retried."""
+    content = json.dumps([
+        {"name": "Austin Courts", "target": "T1"},
+        {"name": "Goa Club"},
+        {"name": "Lost Club", "target": "T9"},
+    ])
+    agent = make_agent((content, "stop"), (json.dumps([{"name": "Goa Club"}]), "stop"))
+    unlabelled = BATCH_UNLABELLED_ITEMS._default().value
+
+    results, _ = asyncio.run(agent.search_batch(TARGETS))
+    assert [v.name for v in results[TARGETS[0]]] == ["Austin Courts"]
+    assert [(v.name, v.state) for v in results[TARGETS[1]]] == [("Goa Club", "Goa")]
+    assert len(agent.llm.calls) == 2
+    assert BATCH_UNLABELLED_ITEMS._default().value == unlabelled + 2
+
+
+def test_search_stream_yields_venues_from_truncated_output():
+    """Test that a cut-off streamed completion still yields complete venues."""
+    content = 'Results [1]: [{"name": "Austin Courts"}, {"name": "Dallas Courts"}, {"name": "Hou'
+    agent = make_agent((content, "length"))
+
+    async def collect():
+        return [event async for event in agent.search_stream("Texas", "USA", DataCategory.COURTS)]
+
+    events = asyncio.run(collect())
+    assert events[0][0] == "query"
+    assert ("tool", "search") in events
+    assert [v.name for kind, v in events if kind == "venue"] == ["Austin Courts", "Dallas Courts"]
+    assert events[-1] == ("done", "length")
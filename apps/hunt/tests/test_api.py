@@ -46,3 +46,129 @@ def test_jobs_endpoint(client):
     data = response.json()
     assert "jobs" in data
     assert "scheduler_running" in data
+
+
+def test_results_pagination_and_ndjson(client, tmp_path, monkeypatch):
+    """Test cursor pagination and NDJSON streaming of state results."""
+    from src.hunt import storage as storage_module
+    from src.hunt.models import DataCategory, VenueData
+
+    storage = storage_module.Storage(data_dir=tmp_path)
+    storage.save_venues([
+        VenueData(name=f"Court {i}", category=DataCategory.COURTS, state="Ohio", country="USA")
+        for i in range(3)
+    ])
+    monkeypatch.setattr(storage_module, "_storage", storage)
+
+    page = client.get("/api/results/Ohio", params={"limit": 2}).json()
+    assert [v["name"] for v in page["venues"]] == ["Court 0", "Court 1"]
+    rest = client.get(
+        "/api/results/Ohio", params={"limit": 2, "after": page["next_cursor"]}
+    ).json()
+    assert [v["name"] for v in rest["venues"]] == ["Court 2"]
+    assert rest["next_cursor"] is None
+
+    response = client.get("/api/results/Ohio", params={"format": "ndjson"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 3
+
+
+def test_search_stream_sends_events_and_caches(client, tmp_path, monkeypatch):
+    """Test SSE search events and their replay from the search cache."""
+    from src.hunt import agent as agent_module
+    from src.hunt import cache as cache_module
+    from src.hunt import storage as storage_module
+    from src.hunt.models import DataCategory, VenueData
+
+    class FakeAgent:
+        calls = 0
+
+        async def search_stream(self, state, country, category, max_results, custom_query):
+            FakeAgent.calls += 1
+            yield "query", "courts in Ohio"
+            yield "tool", "search"
+            for name in ("Court A", "Court B"):
+                yield "venue", VenueData(
+                    name=name, category=category, state=state, country=country
+                )
+            yield "done", "stop"
+
+    storage = storage_module.Storage(data_dir=tmp_path)
+    monkeypatch.setattr(storage_module, "_storage", storage)
+    monkeypatch.setattr(agent_module, "_agent", FakeAgent())
+    monkeypatch.setattr(cache_module, "_cache", cache_module.SearchCache())
+
+    body = {"state": "Ohio", "category": DataCategory.COURTS.value}
+    response = client.post("/api/search/stream", json=body)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line[7:] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events == ["query", "tool", "venue", "venue", "done"]
+    assert storage.get_stats()["total_venues"] == 2
+
+    cached = client.post("/api/search/stream", json=body)
+    assert '"cached": true' in cached.text
+    assert cached.text.count("event: venue") == 2
+    assert FakeAgent.calls == 1
+
+
+def test_metrics_endpoint(client, tmp_path):
+    """Test that storage activity shows up on the metrics endpoint."""
+    from src.hunt.metrics import REGISTRY
+    from src.hunt.models import DataCategory, VenueData
+    from src.hunt.storage import Storage
+
+    venue = VenueData(name="Metric Courts", category=DataCategory.COURTS, state="Ohio", country="USA")
+    Storage(data_dir=tmp_path).save_venues([venue, venue])
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text == REGISTRY.render()
+    assert "# TYPE hunt_llm_request_duration_seconds histogram" in response.text
+    assert 'hunt_storage_duration_seconds_bucket{backend="json",operation="save_venues",le="+Inf"}' in response.text
+    assert 'hunt_venue_duplicates_total{match="exact"}' in response.text
+
+
+def test_venues_near_endpoint(client, tmp_path, monkeypatch):
+    """Test the nearest-venue endpoint."""
+    from src.hunt import storage as storage_module
+    from src.hunt.models import DataCategory, VenueData
+
+    storage = storage_module.Storage(data_dir=tmp_path)
+    storage.save_venues([
+        VenueData(name="Beach Court", category=DataCategory.COURTS, state="Goa", country="India",
+                  latitude=15.5527, longitude=73.7517),
+    ])
+    monkeypatch.setattr(storage_module, "_storage", storage)
+
+    data = client.get("/api/venues/near", params={"lat": 15.55, "lon": 73.75, "radius": 5}).json()
+    assert data["count"] == 1
+    assert data["results"][0]["name"] == "Beach Court"
+    assert data["results"][0]["distance_km"] < 1
+
+    far = client.get("/api/venues/near", params={"lat": 0, "lon": 0, "radius": 5}).json()
+    assert far["count"] == 0
+    assert client.get("/api/venues/near", params={"lat": 95, "lon": 0}).status_code == 422
+
+
+def test_venues_search_endpoint(client, tmp_path, monkeypatch):
+    """Test the keyword search endpoint."""
+    from src.hunt import storage as storage_module
+    from src.hunt.models import DataCategory, VenueData
+
+    storage = storage_module.Storage(data_dir=tmp_path)
+    storage.save_venues([
+        VenueData(name=f"Beach Court {i}", category=DataCategory.COURTS, state="Goa",
+                  country="India")
+        for i in range(3)
+    ])
+    monkeypatch.setattr(storage_module, "_storage", storage)
+
+    data = client.get("/api/venues/search", params={"q": "beach", "limit": 2}).json()
+    assert data["total"] == 3
+    assert [r["name"] for r in data["results"]] == ["Beach Court 0", "Beach Court 1"]
+    assert "score" in data["results"][0]
+
+    page = client.get("/api/venues/search", params={"q": "beach", "offset": 2}).json()
+    assert [r["name"] for r in page["results"]] == ["Beach Court 2"]
+    assert client.get("/api/venues/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,80 @@
+"""Tests for the search response cache."""
+
+import asyncio
+
+from src.hunt.cache import SearchCache, parse_cache_control
+from src.hunt.models import SearchRequest
+
+
+def test_cache_key_normalizes_request():
+    """Test that equivalent requests share a cache key."""
+    a = SearchRequest(state="Texas", query="Beach  Courts")
+    b = SearchRequest(state=" texas ", country="usa", query="beach courts")
+    assert SearchCache.make_key(a) == SearchCache.make_key(b)
+
+
+def test_cache_persists_and_evicts(tmp_path):
+    """Test the on-disk layer across instances and LRU eviction."""
+    cache = SearchCache(path=tmp_path / "cache.db", max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+
+    reopened = SearchCache(path=tmp_path / "cache.db", max_entries=2)
+    assert reopened.get("a") == {"n": 1}
+    assert reopened.get("b") is None
+    assert reopened.get("c") == {"n": 3}
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Test request coalescing of identical in-flight searches."""
+    cache = SearchCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(payload == {"n": 1} for payload, _ in results)
+
+
+def test_cancelled_fetch_is_taken_over_by_follower():
+    """Test that a follower still gets a result when the leader is cancelled."""
+    cache = SearchCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return {"n": calls}
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    payload, cached = asyncio.run(run())
+    assert calls == 2
+    assert payload == {"n": 2}
+    assert cached is False
+    assert cache.get("k") == {"n": 2}
+
+
+def test_parse_cache_control():
+    """Test Cache-Control bypass directives."""
+    assert parse_cache_control(None) == (False, True)
+    assert parse_cache_control("no-cache") == (True, True)
+    assert parse_cache_control("no-store") == (True, False)
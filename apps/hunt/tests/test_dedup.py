@@ -0,0 +1,122 @@
+"""Tests for venue deduplication."""
+
+import pytest
+
+from src.hunt.dedup import is_duplicate, name_signature, normalize_domain, normalize_phone
+from src.hunt.sqlite_storage import SqliteStorage
+from src.hunt.storage import Storage
+
+from test_storage import make_venue
+
+
+def test_normalization():
+    """Test name, phone and URL normalization."""
+    assert name_signature("XYZ Sports Complex, Inc.") == name_signature("xyz sports-complex")
+    assert normalize_phone("+1 (512) 555-0100") == normalize_phone("512.555.0100")
+    assert normalize_domain("https://www.XYZ.com/courts") == "xyz.com"
+
+
+def test_shared_phone_needs_similar_names():
+    """Test that a shared phone alone does not merge different venues."""
+    a = make_venue("Zilker Park Sand Courts", phone="512-555-0100")
+    b = make_venue("Zilker Park Sand Court", phone="(512) 555 0100")
+    c = make_venue("Mueller Recreation Center", phone="512-555-0100")
+    assert is_duplicate(a, b)
+    assert not is_duplicate(a, c)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    """Create storage for each backend in a temporary directory."""
+    if request.param == "sqlite":
+        return SqliteStorage(tmp_path / "hunt.db")
+    return Storage(data_dir=tmp_path)
+
+
+def test_inline_dedup_merges_fields(storage):
+    """Test that near duplicates are merged into the stored venue on save."""
+    assert storage.save_venues([make_venue("XYZ Sports Complex")]) == 1
+    assert storage.save_venues([
+        make_venue("XYZ Sports Complex, Inc.", phone="512-555-0100"),
+        make_venue("xyz sports-complex", website="https://xyz.com"),
+    ]) == 0
+
+    venues = storage.load_all_venues()
+    assert len(venues) == 1
+    assert venues[0].name == "XYZ Sports Complex"
+    assert venues[0].phone == "512-555-0100"
+    assert venues[0].website == "https://xyz.com"
+
+
+def store_without_dedup(storage, venues):
+    """Store venues bypassing inline dedup, as older versions did."""
+    if isinstance(storage, SqliteStorage):
+        conn = storage._connect()
+        with conn:
+            for venue in venues:
+                conn.execute(
+                    "INSERT INTO venues (venue_key, name, category, state, country, email, "
+                    "collected_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (storage._venue_key(venue), venue.name, venue.category.value,
+                     venue.state, venue.country, venue.email, venue.collected_at.isoformat()),
+                )
+    else:
+        storage._log.append(
+            [(storage._venue_key(v), None, v.model_dump(mode="json")) for v in venues]
+        )
+        storage._index = None
+
+
+def test_batch_dedup(storage):
+    """Test merging duplicates that were stored before inline dedup."""
+    store_without_dedup(storage, [
+        make_venue("Austin Beach Club"),
+        make_venue("Austin Beach Club LLC", email="hi@abc.com"),
+        make_venue("Dallas Gym"),
+    ])
+
+    assert storage.deduplicate() == {"merged": 1, "updated": 1, "remaining": 2}
+    venues = storage.load_all_venues()
+    assert [v.name for v in venues] == ["Austin Beach Club", "Dallas Gym"]
+    assert venues[0].email == "hi@abc.com"
+
+
+def test_ids_of_merged_away_venues_are_not_reused(storage):
+    """Test that cursors keep growing after deduplication deletes the newest venue."""
+    store_without_dedup(storage, [
+        make_venue("Dallas Gym"),
+        make_venue("Austin Beach Club"),
+        make_venue("Austin Beach Club LLC"),
+    ])
+    last = max(cursor for cursor, _ in storage.iter_venues())
+    storage.deduplicate()
+    if isinstance(storage, Storage):
+        storage.compact()
+        storage = Storage(data_dir=storage.data_dir)
+
+    storage.save_venues([make_venue("Houston Gym")])
+    cursors = {venue.name: cursor for cursor, venue in storage.iter_venues()}
+    assert cursors["Houston Gym"] > last
+    assert len(cursors) == 3
+
+
+def test_same_name_far_apart_is_kept_separate(storage):
+    """Test that same-named venues in different cities are not merged."""
+    austin = make_venue("City Park Courts", latitude=30.2669, longitude=-97.7729,
+                        phone="512-555-0100")
+    dallas = make_venue("City Park Courts", latitude=32.7767, longitude=-96.7970,
+                        phone="214-555-0199")
+    assert not is_duplicate(austin, dallas)
+
+    assert storage.save_venues([austin, dallas]) == 2
+    # Each is found again under its own key and merged into itself
+    assert storage.save_venues([
+        make_venue("City Park Courts", latitude=32.7768, longitude=-96.7971,
+                   email="dallas@example.com"),
+    ]) == 0
+
+    venues = {v.phone: v for v in storage.load_all_venues()}
+    assert set(venues) == {"512-555-0100", "214-555-0199"}
+    assert venues["214-555-0199"].email == "dallas@example.com"
+    assert venues["512-555-0100"].email is None
+    assert storage.deduplicate()["remaining"] == 2
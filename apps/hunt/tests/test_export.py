@@ -0,0 +1,77 @@
+"""Tests for columnar snapshot export."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.hunt.export import SnapshotExporter
+from src.hunt.models import DataCategory, VenueData
+from src.hunt.storage import Storage
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def make_venue(name: str, state: str, collected_at: datetime) -> VenueData:
+    """Build a venue collected at a given time."""
+    return VenueData(
+        name=name,
+        category=DataCategory.COURTS,
+        state=state,
+        country="USA",
+        collected_at=collected_at,
+    )
+
+
+def test_export_writes_full_then_incremental_snapshots(tmp_path):
+    """Test dictionary encoding, the stats sidecar and incremental exports."""
+    storage = Storage(data_dir=tmp_path / "data")
+    start = datetime(2026, 1, 1)
+    storage.save_venues([
+        make_venue("Austin Courts", "Texas", start),
+        make_venue("Dallas Courts", "Texas", start + timedelta(hours=1)),
+        make_venue("Reno Courts", "Nevada", start + timedelta(hours=2)),
+    ])
+    exporter = SnapshotExporter(tmp_path / "exports")
+
+    first = exporter.export(storage)
+    assert first["kind"] == "full"
+    assert first["rows"] == 3
+    table = pq.read_table(exporter.directory / first["file"])
+    assert pa.types.is_dictionary(table.schema.field("state").type)
+    assert table.column("state").to_pylist() == ["Texas", "Texas", "Nevada"]
+    stats = json.loads((exporter.directory / first["stats"]).read_text())
+    assert stats["by_state"] == {"Texas, USA": 2, "Nevada, USA": 1}
+
+    assert exporter.export(storage) is None
+
+    storage.save_venues([make_venue("Goa Sands", "Goa", start + timedelta(days=1))])
+    second = exporter.export(storage, format="arrow")
+    assert second["kind"] == "incremental"
+    with pa.memory_map(str(exporter.directory / second["file"])) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.column("name").to_pylist() == ["Goa Sands"]
+
+    manifest = exporter.load_manifest()
+    assert [s["file"] for s in manifest["snapshots"]] == [first["file"], second["file"]]
+    assert manifest["watermark"] == 3
+    assert exporter.export(storage, full=True)["rows"] == 4
+
+
+def test_incremental_export_picks_up_venues_built_before_the_last_export(tmp_path):
+    """Test that a venue collected before an export but saved after it is exported."""
+    storage = Storage(data_dir=tmp_path / "data")
+    start = datetime(2026, 1, 1)
+    buffered = make_venue("Dallas Courts", "Texas", start)
+    storage.save_venues([make_venue("Austin Courts", "Texas", start + timedelta(hours=1))])
+    exporter = SnapshotExporter(tmp_path / "exports")
+    assert exporter.export(storage)["rows"] == 1
+
+    storage.save_venues([buffered])
+    second = exporter.export(storage)
+    assert second["kind"] == "incremental"
+    table = pq.read_table(exporter.directory / second["file"])
+    assert table.column("name").to_pylist() == ["Dallas Courts"]
+    assert exporter.load_manifest()["watermark"] == 1
+    assert exporter.export(storage) is None
@@ -0,0 +1,43 @@
+"""Tests for incremental JSON array extraction."""
+
+import json
+
+from src.hunt.json_stream import JsonArrayStream, extract_items
+
+ITEMS = [
+    {"name": "Austin [Beach] Courts", "description": 'Quote \\" and } inside'},
+    {"name": "Dallas Courts", "tags": ["indoor", {"nested": [1, 2]}]},
+    {"name": "Houston Courts"},
+]
+
+
+def test_items_are_emitted_as_soon_as_complete():
+    """Test that every item is emitted by the chunk that completes it."""
+    text = "Found these [see sources]:\n```json\n" + json.dumps(ITEMS) + "\n```"
+    stream = JsonArrayStream()
+    emitted = []
+    for i, char in enumerate(text):
+        for item in stream.feed(char):
+            emitted.append((item, i))
+
+    assert [item for item, _ in emitted] == ITEMS
+    # The first item is available long before the array is finished
+    assert emitted[0][1] < text.index("Dallas")
+    assert stream.complete
+
+
+def test_partial_output_keeps_complete_items():
+    """Test that a cut-off array still yields the items before the cut."""
+    text = json.dumps(ITEMS)
+    cut = text[:text.index("Houston") + 3]
+
+    items, complete = extract_items(cut)
+    assert items == ITEMS[:2]
+    assert not complete
+
+
+def test_malformed_item_is_skipped():
+    """Test that one broken item does not lose its neighbours."""
+    items, complete = extract_items('[] [{"name": "A"}, {name: B}, {"name": "C"}] [{"x": 1}]')
+    assert items == [{"name": "A"}, {"name": "C"}]
+    assert complete
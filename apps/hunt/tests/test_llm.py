@@ -0,0 +1,125 @@
+"""Tests for the shared LLM client and rate limiting."""
+
+import asyncio
+
+import httpx
+
+from src.hunt import llm
+from src.hunt.config import Settings
+from src.hunt.llm import LLMClient, close_llm_client, get_llm_client
+from src.hunt.rate_limit import TokenBucket, parse_duration
+
+
+def completion(content: str) -> dict:
+    """Build a minimal chat completion payload."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def make_client(handler) -> LLMClient:
+    """Create an LLM client that talks to a mock transport."""
+    client = LLMClient(api_key="test", backoff_base_seconds=0.01, backoff_max_seconds=0.01)
+    client.http_client._transport = httpx.MockTransport(handler)
+    return client
+
+
+def test_parse_duration():
+    """Test parsing of Groq rate-limit durations."""
+    assert parse_duration("12") == 12.0
+    assert parse_duration("7.66s") == 7.66
+    assert abs(parse_duration("2m59.56s") - 179.56) < 1e-9
+    assert parse_duration("250ms") == 0.25
+    assert parse_duration(None) is None
+
+
+def test_token_bucket_waits_for_refill():
+    """Test that an empty bucket reports the time until refill."""
+    bucket = TokenBucket(capacity=60, refill_per_second=1)
+    bucket.consume(60)
+    assert 9 < bucket.time_until(10) <= 10
+
+
+def test_chat_completion_retries_after_rate_limit():
+    """Test that a 429 is retried after the server's retry-after."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after": "0.05"}, json={"error": {}})
+        return httpx.Response(200, json=completion("ok"))
+
+    async def run():
+        client = make_client(handler)
+        try:
+            return await client.chat_completion(
+                model="test", messages=[{"role": "user", "content": "hi"}], max_tokens=10
+            )
+        finally:
+            await client.close()
+
+    response = asyncio.run(run())
+    assert response.choices[0].message.content == "ok"
+    assert len(calls) == 2
+
+
+def test_shared_client_caps_concurrent_calls(monkeypatch):
+    """Test that concurrent callers share one client and its concurrency cap."""
+    settings = Settings(groq_api_key="test", groq_max_concurrency=2)
+    monkeypatch.setattr(llm, "get_settings", lambda: settings)
+    monkeypatch.setattr(llm, "_llm_client", None)
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        in_flight.append(request)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.02)
+        in_flight.remove(request)
+        return httpx.Response(200, json=completion("ok"))
+
+    async def call():
+        client = get_llm_client()
+        return client, await client.chat_completion(
+            model="test", messages=[{"role": "user", "content": "hi"}], max_tokens=10
+        )
+
+    async def run():
+        get_llm_client().http_client._transport = httpx.MockTransport(handler)
+        try:
+            return await asyncio.gather(*(call() for _ in range(6)))
+        finally:
+            await close_llm_client()
+
+    results = asyncio.run(run())
+    assert len({id(client) for client, _ in results}) == 1
+    assert len(peak) == 6
+    assert max(peak) == 2
+
+
+def test_close_llm_client_resets_the_singleton(monkeypatch):
+    """Test that closing the shared client closes its pool and drops it."""
+    monkeypatch.setattr(llm, "get_settings", lambda: Settings(groq_api_key="test"))
+    monkeypatch.setattr(llm, "_llm_client", None)
+
+    async def run():
+        client = get_llm_client()
+        await close_llm_client()
+        return client
+
+    closed = asyncio.run(run())
+    assert closed.http_client.is_closed
+    assert llm._llm_client is None
+    assert get_llm_client() is not closed
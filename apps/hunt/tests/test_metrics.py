@@ -0,0 +1,27 @@
+"""Tests for the metrics registry."""
+
+from src.hunt.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_registry_renders_prometheus_text():
+    """Test counters, callback gauges and cumulative histogram buckets."""
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Calls.", ("model",)))
+    depth = registry.register(Gauge("queue_depth", "Queue depth."))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+
+    calls.labels('a"b').inc()
+    calls.labels('a"b').inc(2)
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE calls_total counter" in lines
+    assert 'calls_total{model="a\\"b"} 3' in lines
+    assert "queue_depth 7" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 3.65" in lines
+    assert "latency_seconds_count 4" in lines
@@ -0,0 +1,60 @@
+"""Tests for the offline Groq stand-in and exchange recording."""
+
+import asyncio
+
+import httpx
+
+from src.hunt.llm import LLMClient
+from src.hunt.mock_groq import MockGroq, create_app, load_cassette
+
+
+def make_client(mock: MockGroq, **kwargs) -> LLMClient:
+    """Create an LLM client that talks to the mock app in-process."""
+    client = LLMClient(
+        api_key="test",
+        base_url="http://mock-groq",
+        backoff_base_seconds=0.01,
+        backoff_max_seconds=0.01,
+        **kwargs,
+    )
+    client.http_client._transport = httpx.ASGITransport(app=create_app(mock))
+    return client
+
+
+def complete(client: LLMClient, content: str, model: str = "groq/compound"):
+    """Run one chat completion and close the client."""
+    async def run():
+        try:
+            return await client.chat_completion(
+                model=model, messages=[{"role": "user", "content": content}], max_tokens=100
+            )
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+def test_recorded_exchange_is_replayed(tmp_path):
+    """Test that a recorded completion, executed tools included, replays."""
+    cassette = tmp_path / "groq.jsonl"
+    prompt = "Find courts in Texas. Return ONLY a valid JSON array"
+
+    recorder = make_client(MockGroq(seed=1), record_path=cassette)
+    recorded = complete(recorder, prompt)
+    assert recorded.choices[0].message.executed_tools[0].type == "search"
+
+    mock = MockGroq(exchanges=load_cassette(cassette), seed=2)
+    replayed = complete(make_client(mock), prompt)
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+    assert replayed.choices[0].message.executed_tools[0].type == "search"
+    assert mock.stats["replayed"] == 1
+
+
+def test_injected_rate_limits_are_retried():
+    """Test that injected 429s carry retry-after and are retried."""
+    mock = MockGroq(rate_limit_rate=0.5, retry_after_seconds=0.01, seed=4)
+    response = complete(make_client(mock), "volleyball query", model="llama")
+
+    assert response.choices[0].message.content
+    assert mock.stats["rate_limited"] >= 1
+    assert mock.stats["requests"] == mock.stats["rate_limited"] + 1
@@ -0,0 +1,127 @@
+"""Tests for OpenStreetMap ingestion."""
+
+import bz2
+import json
+
+from src.hunt.models import DataCategory
+from src.hunt.osm import ingest, read_overpass_json, read_source
+from src.hunt.storage import Storage
+
+OSM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+  <node id="1" lat="30.0" lon="-97.0"/>
+  <node id="2" lat="30.2" lon="-97.0"/>
+  <node id="3" lat="30.2" lon="-97.2"/>
+  <node id="4" lat="30.0" lon="-97.2"/>
+  <node id="5" lat="29.5" lon="-98.5">
+    <tag k="leisure" v="pitch"/>
+    <tag k="sport" v="beachvolleyball"/>
+  </node>
+  <node id="6" lat="29.6" lon="-98.6">
+    <tag k="leisure" v="pitch"/>
+    <tag k="sport" v="tennis"/>
+  </node>
+  <way id="10">
+    <nd ref="1"/><nd ref="2"/><nd ref="3"/><nd ref="4"/>
+    <tag k="leisure" v="sports_centre"/>
+    <tag k="sport" v="basketball;volleyball"/>
+    <tag k="name" v="Austin Sports Center"/>
+    <tag k="addr:housenumber" v="12"/>
+    <tag k="addr:street" v="Main Street"/>
+    <tag k="addr:city" v="Austin"/>
+    <tag k="website" v="https://austinsports.example"/>
+  </way>
+</osm>
+"""
+
+
+def test_ingest_osm_xml_extract(tmp_path):
+    """Test that volleyball nodes and ways are located, mapped and saved."""
+    path = tmp_path / "texas.osm.bz2"
+    path.write_bytes(bz2.compress(OSM_XML.encode()))
+    storage = Storage(data_dir=tmp_path)
+
+    summary = ingest(read_source(path), storage, "Texas", "USA", batch_size=1)
+    assert summary["features"] == 2
+    assert summary["new_venues"] == 2
+
+    venues = {v.name: v for v in storage.load_all_venues()}
+    center = venues["Austin Sports Center"]
+    assert center.category == DataCategory.CLUBS
+    assert center.location == (30.1, -97.1)
+    assert center.address == "12 Main Street, Austin"
+    assert center.source_url == "https://www.openstreetmap.org/way/10"
+
+    court = venues["Beach volleyball court (OSM node 5)"]
+    assert court.category == DataCategory.COURTS
+    assert court.location == (29.5, -98.5)
+
+    # Re-importing the same extract adds nothing
+    assert ingest(read_source(path), storage, "Texas", "USA")["new_venues"] == 0
+
+
+def test_read_overpass_json_uses_centers(tmp_path):
+    """Test that Overpass elements are filtered and located by their center."""
+    path = tmp_path / "kerala.json"
+    path.write_text(json.dumps({"elements": [
+        {"type": "way", "id": 7, "center": {"lat": 10.0, "lon": 76.3},
+         "tags": {"sport": "volleyball", "name": "Kochi Court"}},
+        {"type": "node", "id": 8, "lat": 10.1, "lon": 76.2, "tags": {"sport": "cricket"}},
+    ]}))
+
+    features = list(read_source(path))
+    assert [(f.osm_type, f.osm_id, f.lat, f.lon) for f in features] == [("way", 7, 10.0, 76.3)]
+    assert list(read_overpass_json({"elements": []})) == []
+
+
+def test_ingest_keeps_distinct_elements_apart(tmp_path):
+    """Test that pitches sharing a name or operator are not merged."""
+    elements = [
+        {"type": "way", "id": 1, "center": {"lat": 30.10, "lon": -97.70},
+         "tags": {"sport": "volleyball", "name": "Volleyball Court"}},
+        {"type": "way", "id": 2, "center": {"lat": 30.11, "lon": -97.71},
+         "tags": {"sport": "volleyball", "name": "Volleyball Court"}},
+        {"type": "node", "id": 3, "lat": 30.12, "lon": -97.72,
+         "tags": {"sport": "volleyball", "operator": "City Parks Department",
+                  "phone": "512-555-0100"}},
+        {"type": "node", "id": 4, "lat": 30.13, "lon": -97.73,
+         "tags": {"sport": "volleyball", "operator": "City Parks Department",
+                  "phone": "512-555-0100"}},
+    ]
+    storage = Storage(data_dir=tmp_path)
+    features = read_overpass_json({"elements": elements})
+
+    assert ingest(features, storage, "Texas", "USA")["new_venues"] == 4
+    names = sorted(v.name for v in storage.load_all_venues())
+    assert names == [
+        "City Parks Department (OSM node 3)",
+        "City Parks Department (OSM node 4)",
+        "Volleyball Court",
+        "Volleyball Court",
+    ]
+
+    # Re-importing finds every element under its own key
+    features = read_overpass_json({"elements": elements})
+    assert ingest(features, storage, "Texas", "USA")["new_venues"] == 0
+    assert len(storage.load_all_venues()) == 4
+
+
+def test_ingest_skips_features_tagged_with_another_state(tmp_path):
+    """Test that features addressed to a neighbouring state are not relabelled."""
+    features = read_overpass_json({"elements": [
+        {"type": "node", "id": 1, "lat": 33.9, "lon": -98.5,
+         "tags": {"sport": "volleyball", "name": "Wichita Falls Court", "addr:state": "TX"}},
+        {"type": "node", "id": 2, "lat": 34.0, "lon": -98.4,
+         "tags": {"sport": "volleyball", "name": "Lawton Court", "addr:state": "OK"}},
+        {"type": "node", "id": 3, "lat": 34.1, "lon": -98.3,
+         "tags": {"sport": "volleyball", "name": "Burkburnett Court", "addr:state": "Texas"}},
+        {"type": "node", "id": 4, "lat": 34.2, "lon": -98.2,
+         "tags": {"sport": "volleyball", "name": "Red River Court"}},
+    ]})
+    storage = Storage(data_dir=tmp_path)
+
+    summary = ingest(features, storage, "Texas", "USA")
+    assert summary["features"] == 4
+    assert summary["skipped"] == 1
+    assert summary["new_venues"] == 3
+    assert "Lawton Court" not in {v.name for v in storage.load_all_venues()}
@@ -0,0 +1,50 @@
+"""Tests for the yield-aware scheduling policy."""
+
+import time
+
+from src.hunt.models import DataCategory, SearchTarget
+from src.hunt.policy import YieldPolicy
+
+
+def make_targets() -> list[SearchTarget]:
+    """Four cells in rotation order."""
+    return [
+        SearchTarget(state=state, country="USA", category=category)
+        for state in ("California", "Wyoming")
+        for category in (DataCategory.COURTS, DataCategory.TOURNAMENTS)
+    ]
+
+
+def test_policy_explores_then_favours_yield_and_revisits_stale_cells(tmp_path):
+    """Test exploration order, yield preference, decay and persistence."""
+    targets = make_targets()
+    path = tmp_path / "yield_stats.json"
+    policy = YieldPolicy(path, targets, exploration=0.5, half_life_hours=1.0)
+
+    # Unvisited cells come first, in rotation order
+    assert policy.select(4) == targets
+
+    now = time.time()
+    for _ in range(5):
+        for target, new_venues in zip(targets, (12, 3, 2, 0)):
+            policy.record(target.state, target.country, target.category, new_venues, now=now)
+
+    assert policy.select(2) == [targets[0], targets[1]]
+    assert policy.select(1, exclude=[targets[0].cell_key]) == [targets[1]]
+    assert policy.covered_states() == {"California|USA", "Wyoming|USA"}
+
+    stats = policy.stats()
+    assert stats["calls"] == 20
+    assert stats["marginal_yield_per_call"] == 4.25
+    assert stats["top_cells"][0]["cell"] == "California|USA|courts"
+
+    # A day later all observations have decayed away and every cell is
+    # worth rechecking, except the one searched just now
+    later = now + 24 * 3600
+    policy.record("California", "USA", DataCategory.COURTS, 0, now=later)
+    priorities = policy.priorities(now=later)
+    assert priorities["Wyoming|USA|tournaments"] > priorities["California|USA|courts"]
+
+    policy.close()
+    reopened = YieldPolicy(path, targets)
+    assert reopened.stats()["calls"] == 21
@@ -0,0 +1,46 @@
+"""Tests for opt-in profiling."""
+
+import pstats
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.hunt import profiling
+from src.hunt.profiling import Profiler, ProfilingMiddleware
+
+
+def test_profiles_matching_routes_with_retention(tmp_path, monkeypatch):
+    """Test route selection, saved artifacts, retention and safe lookup."""
+    profiler = Profiler(tmp_path, routes=["/slow/*"], every_nth_run=2, max_profiles=2)
+    monkeypatch.setattr(profiling, "get_profiler", lambda: profiler)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow/{n}")
+    async def slow(n: int) -> dict:
+        return {"total": sum(range(n))}
+
+    @app.get("/fast")
+    async def fast() -> dict:
+        return {}
+
+    with TestClient(app) as client:
+        client.get("/fast")
+        assert profiler.list_profiles() == []
+        for n in (10, 20, 30):
+            assert client.get(f"/slow/{n}").status_code == 200
+
+    profiles = profiler.list_profiles()
+    assert len(profiles) == 2
+    assert profiles[0]["id"].endswith("GET_slow_30")
+    prof_file, summary_file = profiles[0]["files"]
+    pstats.Stats(str(profiler.artifact(prof_file)))
+    assert "function calls" in profiler.artifact(summary_file).read_text()
+    assert profiler.artifact("../" + prof_file) is None
+
+    # Only every second collection run is profiled
+    for _ in range(2):
+        with profiler.run_context("collection-run"):
+            sum(range(100))
+    assert profiler.list_profiles()[0]["id"].endswith("collection-run-2")
@@ -0,0 +1,111 @@
+"""Tests for the query pool."""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.hunt import query_pool
+from src.hunt.models import DataCategory, SearchTarget
+from src.hunt.query_generator import QueryGenerator
+from src.hunt.query_pool import QueryPool
+
+
+class FakeGenerator:
+    """Query generator returning numbered queries."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def generate_queries(self, state, country, category, count, previous_queries=None,
+                               productive_queries=None):
+        self.calls.append({"previous": previous_queries, "productive": productive_queries})
+        start = len(self.calls) * 100
+        return [f"{category.value} {state} {start + n}" for n in range(count)]
+
+    def fallback_query(self, state, country, category):
+        return f"fallback {state}"
+
+
+def test_pool_batches_prefetches_and_tracks_yield(tmp_path, monkeypatch):
+    """Test batched generation, background refills, persistence and yield."""
+    generator = FakeGenerator()
+    monkeypatch.setattr(query_pool, "get_query_generator", lambda: generator)
+    path = tmp_path / "query_pool.json"
+
+    async def run():
+        pool = QueryPool(path, batch_size=3, low_water=2)
+        pool.prefetch([SearchTarget(state="Texas", country="USA", category=DataCategory.COURTS)])
+        await asyncio.sleep(0)
+        assert len(pool._refills) == 1
+        await asyncio.gather(*pool._refills.values())
+
+        # One call filled the cell; takes are served from the pool
+        first = await pool.take("Texas", "USA", DataCategory.COURTS)
+        second = await pool.take("Texas", "USA", DataCategory.COURTS)
+        assert len(generator.calls) == 1
+        assert first != second
+
+        pool.record_yield("Texas", "USA", DataCategory.COURTS, first, 4)
+        pool.record_yield("Texas", "USA", DataCategory.COURTS, second, 0)
+
+        # Dropping below the low-water mark refilled in the background
+        await asyncio.sleep(0)
+        await asyncio.gather(*pool._refills.values())
+        pool.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert generator.calls[1]["productive"] == [(first, 4)]
+    assert set(generator.calls[1]["previous"]) >= {first, second}
+
+    reopened = QueryPool(path, batch_size=3, low_water=2)
+    assert len(reopened.pending("Texas", "USA", DataCategory.COURTS)) == 4
+    assert reopened.stats()["pending_queries"] == 4
+
+
+def test_concurrent_takes_of_an_empty_cell_share_one_refill(tmp_path, monkeypatch):
+    """Test that takes waiting on an empty cell join the registered refill."""
+    generator = FakeGenerator()
+    monkeypatch.setattr(query_pool, "get_query_generator", lambda: generator)
+
+    async def run():
+        pool = QueryPool(tmp_path / "query_pool.json", batch_size=4, low_water=1)
+        return await asyncio.gather(
+            *(pool.take("Texas", "USA", DataCategory.COURTS) for _ in range(3))
+        )
+
+    queries = asyncio.run(run())
+    assert len(generator.calls) == 1
+    assert len(set(queries)) == 3
+
+
+def test_failed_refill_falls_back_to_template_query(tmp_path, monkeypatch):
+    """Test that a take whose refill raises serves the fallback query."""
+
+    class FailingGenerator(FakeGenerator):
+        async def generate_queries(self, *args, **kwargs):
+            raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(query_pool, "get_query_generator", lambda: FailingGenerator())
+
+    async def run():
+        pool = QueryPool(tmp_path / "query_pool.json", batch_size=4, low_water=1)
+        return await pool.take("Texas", "USA", DataCategory.COURTS)
+
+    assert asyncio.run(run()) == "fallback Texas"
+
+
+def test_generated_queries_drop_list_markers_only():
+    """Test that leading bullets and numbers are stripped, not query digits."""
+    content = '1. "volleyball courts Austin"\n- 24 hour gyms Dallas\n2) 3rd Street courts\n'
+
+    class FakeLlm:
+        async def chat_completion(self, **kwargs):
+            message = SimpleNamespace(content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    generator = QueryGenerator.__new__(QueryGenerator)
+    generator.llm = FakeLlm()
+    generator.model = "test"
+
+    queries = asyncio.run(generator.generate_queries("Texas", "USA", DataCategory.COURTS, 3))
+    assert queries == ["volleyball courts Austin", "24 hour gyms Dallas", "3rd Street courts"]
@@ -0,0 +1,142 @@
+"""Tests for the work-queue collection scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.hunt import scheduler as scheduler_module
+from src.hunt.config import Settings
+from src.hunt.models import DataCategory, VenueData
+from src.hunt.scheduler import MAX_TASK_ATTEMPTS, CollectionScheduler
+from src.hunt.storage import Storage
+
+
+class FakeAgent:
+    """Agent streaming one venue per search, failing for chosen states."""
+
+    def __init__(self, scheduler_ref: list, failing: set[str] = frozenset()):
+        self.scheduler_ref = scheduler_ref
+        self.failing = failing
+        self.calls: list[str] = []
+        self.in_flight_seen: list[int] = []
+
+    async def search_stream(self, state, country, category, max_results, custom_query):
+        self.calls.append(state)
+        self.in_flight_seen.append(self.scheduler_ref[0]._in_flight)
+        await asyncio.sleep(0)
+        if state in self.failing:
+            raise RuntimeError(f"search failed for {state}")
+        venue = VenueData(
+            name=f"{state} Courts {len(self.calls)}",
+            category=category,
+            state=state,
+            country=country,
+        )
+        yield "venue", venue
+
+
+class FakeQueryPool:
+    """Query pool serving a fixed query."""
+
+    def prefetch(self, targets):
+        pass
+
+    async def take(self, state, country, category):
+        return f"volleyball {state}"
+
+    def record_yield(self, state, country, category, query, new_venues):
+        pass
+
+
+@pytest.fixture
+def make_scheduler(tmp_path, monkeypatch):
+    """Build a round-robin worker-pool scheduler over two states."""
+    storage = Storage(data_dir=tmp_path)
+    monkeypatch.setattr(scheduler_module, "get_storage", lambda: storage)
+    monkeypatch.setattr(scheduler_module, "get_query_pool", lambda: FakeQueryPool())
+
+    def make(failing=frozenset(), pause_seconds=60.0):
+        settings = Settings(
+            groq_api_key="test",
+            collection_workers=2,
+            collection_calls_per_minute=60000,
+            scheduling_policy="round_robin",
+            collection_cycle_pause_minutes=pause_seconds / 60,
+        )
+        monkeypatch.setattr(scheduler_module, "get_settings", lambda: settings)
+        ref: list = []
+        agent = FakeAgent(ref, set(failing))
+        monkeypatch.setattr(scheduler_module, "get_agent", lambda: agent)
+
+        scheduler = CollectionScheduler()
+        ref.append(scheduler)
+        scheduler._usa_states = ["Ohio", "Utah"]
+        scheduler._india_states = []
+        scheduler._categories = [DataCategory.COURTS]
+        return scheduler, agent, storage
+
+    return make
+
+
+async def run_until(scheduler: CollectionScheduler, condition, timeout: float = 5.0) -> None:
+    """Run the worker pool until a condition holds, then stop it."""
+    scheduler._start_workers()
+    try:
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
+    finally:
+        scheduler.stop()
+
+
+def test_failed_tasks_are_retried_then_given_up(make_scheduler):
+    """Test retries up to MAX_TASK_ATTEMPTS and in-flight balance after failures."""
+    scheduler, agent, storage = make_scheduler(failing={"Ohio"})
+    marked = []
+    mark = storage.mark_state_completed
+    storage.mark_state_completed = lambda state, country: (marked.append(state),
+                                                           mark(state, country))
+
+    def cycle_done():
+        # Ohio was given up and Utah completed; the cycle then resets
+        return len(agent.calls) == MAX_TASK_ATTEMPTS + 1 and not scheduler._dispatched
+
+    asyncio.run(run_until(scheduler, cycle_done))
+    assert agent.calls.count("Ohio") == MAX_TASK_ATTEMPTS
+    assert agent.calls.count("Utah") == 1
+    assert marked == ["Utah"]
+    assert scheduler._in_flight == 0
+    assert all(n >= 1 for n in agent.in_flight_seen)
+    assert scheduler._attempts == {}
+    assert scheduler._retries == []
+
+
+def test_finished_cycle_resets_and_pauses_before_restarting(make_scheduler):
+    """Test cycle completion, the reset of completed states and the pause."""
+    scheduler, agent, storage = make_scheduler(pause_seconds=0.3)
+
+    async def run():
+        scheduler._start_workers()
+        try:
+            async with asyncio.timeout(5):
+                while len(agent.calls) < 2:
+                    await asyncio.sleep(0.01)
+            # The cycle is done; nothing runs during the pause
+            await asyncio.sleep(0.15)
+            during_pause = len(agent.calls)
+            completed = storage.get_completed_states()
+            progress = storage.load_progress()
+            async with asyncio.timeout(5):
+                while len(agent.calls) < 4:
+                    await asyncio.sleep(0.01)
+            return during_pause, completed, progress
+        finally:
+            scheduler.stop()
+
+    during_pause, completed, progress = asyncio.run(run())
+    assert during_pause == 2
+    assert completed == set()
+    assert progress.completed_states == 0
+    assert progress.total_states == 2
+    assert sorted(agent.calls) == ["Ohio", "Ohio", "Utah", "Utah"]
+    assert scheduler._in_flight == 0
@@ -0,0 +1,319 @@
+"""Tests for venue storage."""
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.hunt.models import DataCategory, VenueData
+from src.hunt.sqlite_storage import SqliteStorage, migrate_from_json
+from src.hunt.storage import Storage
+
+
+def make_venue(name: str, state: str = "Texas", country: str = "USA", **kwargs) -> VenueData:
+    """Build a venue with sensible defaults."""
+    return VenueData(
+        name=name,
+        category=kwargs.pop("category", DataCategory.COURTS),
+        state=state,
+        country=country,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create storage in a temporary directory."""
+    return Storage(data_dir=tmp_path)
+
+
+def test_save_venues_skips_duplicates(storage):
+    """Test that saving the same venue twice only stores it once."""
+    assert storage.save_venues([make_venue("Austin Beach Club")]) == 1
+    assert storage.save_venues([make_venue("austin beach club"), make_venue("Dallas Gym")]) == 1
+
+    names = [v.name for v in storage.load_all_venues()]
+    assert names == ["Austin Beach Club", "Dallas Gym"]
+
+
+def test_stats_and_lookups_follow_incremental_saves(storage):
+    """Test that the in-memory index is kept current by save_venues."""
+    storage.warm_up()
+    storage.save_venues([
+        make_venue("Austin Beach Club"),
+        make_venue("Goa Sands", state="Goa", country="India", category=DataCategory.CLUBS),
+    ])
+    storage.save_venues([make_venue("Houston Gym", category=DataCategory.CLUBS)])
+
+    stats = storage.get_stats()
+    assert stats["total_venues"] == 3
+    assert storage.count_venues() == 3
+    assert stats["by_category"] == {"courts": 1, "clubs": 2}
+    assert stats["by_country"] == {"USA": 2, "India": 1}
+    assert stats["by_state"] == {"Texas, USA": 2, "Goa, India": 1}
+    assert [v.name for v in storage.get_venues_by_state("TEXAS", "usa")] == [
+        "Austin Beach Club",
+        "Houston Gym",
+    ]
+    assert len(storage.get_venues_by_category(DataCategory.CLUBS)) == 2
+
+
+def test_venue_log_survives_restart_and_compaction(tmp_path):
+    """Test that venues persist across instances and log compaction."""
+    storage = Storage(data_dir=tmp_path, segment_max_bytes=1, compact_min_segments=100)
+    for i in range(5):
+        storage.save_venues([make_venue(f"Court {i}")])
+    assert len(storage._log.segments()) == 5
+
+    storage.compact()
+    assert len(storage._log.segments()) == 2
+
+    reopened = Storage(data_dir=tmp_path)
+    assert [v.name for v in reopened.load_all_venues()] == [f"Court {i}" for i in range(5)]
+    assert reopened.save_venues([make_venue("Court 3")]) == 0
+
+
+def test_legacy_venues_json_is_imported_once(tmp_path):
+    """Test the one-time import of a pre-log venues.json file."""
+    legacy = [
+        make_venue("Old Court", latitude=30.2669, longitude=-97.7729),
+        make_venue("Old Court", latitude=32.7767, longitude=-96.7970),
+        make_venue("Old Court", latitude=32.7768, longitude=-96.7971, email="a@b.com"),
+    ]
+    (tmp_path / "venues.json").write_text(
+        json.dumps([v.model_dump(mode="json") for v in legacy])
+    )
+
+    storage = Storage(data_dir=tmp_path)
+    venues = storage.load_all_venues()
+    assert [v.name for v in venues] == ["Old Court", "Old Court"]
+    assert [v.email for v in venues] == [None, "a@b.com"]
+    assert not (tmp_path / "venues.json").exists()
+    assert (tmp_path / "venues.json.imported").exists()
+
+
+def test_recovery_after_crash_mid_write(tmp_path):
+    """Test that torn writes are cut off and journals replayed on startup."""
+    storage = Storage(data_dir=tmp_path, fsync_interval_seconds=0)
+    storage.save_venues([make_venue("Austin Beach Club")])
+    storage.mark_state_completed("Texas", "USA")
+    progress = storage.load_progress()
+    progress.total_results = 1
+    storage.save_progress(progress)
+
+    # Simulate a crash partway through appending to each file
+    segment = storage._log.segments()[-1]
+    with open(segment, "a") as f:
+        f.write('{"key": "dallas gym|texas|usa", "ven')
+    with open(tmp_path / "completed_states.journal", "a") as f:
+        f.write('{"set": {"Ohio|U')
+    (tmp_path / "progress.json.tmp").write_text('{"total_res')
+
+    recovered = Storage(data_dir=tmp_path)
+    assert recovered.get_completed_states() == {"Texas|USA"}
+    assert recovered.load_progress().total_results == 1
+    assert not (tmp_path / "progress.json.tmp").exists()
+
+    # The entry appended after the torn one must not be swallowed by it
+    recovered.save_venues([make_venue("Dallas Gym")])
+    assert [v.name for v in Storage(data_dir=tmp_path).load_all_venues()] == [
+        "Austin Beach Club", "Dallas Gym"
+    ]
+
+
+def test_progress_journal_checkpoints_on_close(tmp_path):
+    """Test that closing storage folds the journals into the JSON files."""
+    storage = Storage(data_dir=tmp_path)
+    storage.mark_state_completed("Goa", "India")
+    storage.close()
+
+    assert json.loads((tmp_path / "completed_states.json").read_text()) == {"Goa|India": True}
+    assert (tmp_path / "completed_states.journal").read_text() == ""
+    storage.reset_cycle()
+    assert Storage(data_dir=tmp_path).get_completed_states() == set()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_session_batches_reads_and_writes(tmp_path, backend, monkeypatch):
+    """Test that a session reads state once and commits it in one flush."""
+    if backend == "sqlite":
+        storage = SqliteStorage(tmp_path / "hunt.db")
+    else:
+        storage = Storage(data_dir=tmp_path)
+
+    calls = []
+    for name in ("load_progress", "save_progress", "save_venues", "get_completed_states"):
+        original = getattr(storage, name)
+        monkeypatch.setattr(
+            storage, name, lambda *a, _f=original, _n=name: calls.append(_n) or _f(*a)
+        )
+
+    with storage.session() as session:
+        session.save_venues([make_venue("Austin Beach Club")])
+        session.save_venues([make_venue("Dallas Gym")])
+        session.mark_state_completed("Texas", "USA")
+        session.progress.current_state = "Texas"
+        assert session.completed_states == {"Texas|USA"}
+        assert calls == ["load_progress", "get_completed_states"]
+
+    assert sorted(calls) == sorted([
+        "load_progress", "get_completed_states", "save_venues", "save_progress"
+    ])
+    assert storage.get_completed_states() == {"Texas|USA"}
+    progress = storage.load_progress()
+    assert (progress.current_state, progress.total_results) == ("Texas", 2)
+
+
+def test_sqlite_storage_filters_and_stats(tmp_path):
+    """Test indexed reads and stats on the SQLite backend."""
+    storage = SqliteStorage(tmp_path / "hunt.db")
+    saved = storage.save_venues([
+        make_venue("Austin Beach Club"),
+        make_venue("AUSTIN BEACH CLUB"),
+        make_venue("Goa Sands", state="Goa", country="India", category=DataCategory.CLUBS),
+    ])
+    assert saved == 2
+
+    assert [v.name for v in storage.get_venues_by_state("texas", "usa")] == ["Austin Beach Club"]
+    assert [v.name for v in storage.get_venues_by_category(DataCategory.CLUBS)] == ["Goa Sands"]
+
+    stats = storage.get_stats()
+    assert stats["total_venues"] == 2
+    assert stats["by_state"] == {"Texas, USA": 1, "Goa, India": 1}
+    assert storage.count_venues() == 2
+
+
+def test_migrate_json_to_sqlite(storage, tmp_path):
+    """Test migrating venues and cycle state from JSON storage."""
+    storage.save_venues([make_venue("Court A"), make_venue("Court B")])
+    storage.mark_state_completed("Texas", "USA")
+
+    target = SqliteStorage(tmp_path / "hunt.db")
+    assert migrate_from_json(storage, target) == 2
+    assert migrate_from_json(storage, target) == 0
+    assert target.get_completed_states() == {"Texas|USA"}
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_venues_near_radius_and_nearest(tmp_path, backend):
+    """Test radius and nearest queries, including coordinates from merges."""
+    if backend == "sqlite":
+        storage = SqliteStorage(tmp_path / "hunt.db")
+    else:
+        storage = Storage(data_dir=tmp_path)
+
+    storage.save_venues([
+        make_venue("Zilker Courts", state="Texas", latitude=30.2669, longitude=-97.7729),
+        make_venue("Mueller Courts", state="Texas", latitude=30.2986, longitude=-97.7048),
+        make_venue("Dallas Sand", state="Texas", latitude=32.7767, longitude=-96.7970,
+                   category=DataCategory.CLUBS),
+        make_venue("Unlocated Gym", state="Texas"),
+    ])
+    # A duplicate carrying coordinates locates the stored venue
+    storage.save_venues([make_venue("Unlocated Gym", state="Texas", latitude=29.76, longitude=-95.37)])
+
+    within = storage.get_venues_near(30.27, -97.74, radius_km=10, limit=10)
+    assert [v.name for _, v in within] == ["Zilker Courts", "Mueller Courts"]
+    assert within[0][0] < within[1][0] < 10
+
+    nearest = storage.get_venues_near(30.27, -97.74, limit=3)
+    assert [v.name for _, v in nearest] == ["Zilker Courts", "Mueller Courts", "Unlocated Gym"]
+
+    clubs = storage.get_venues_near(30.27, -97.74, limit=5, category=DataCategory.CLUBS)
+    assert [v.name for _, v in clubs] == ["Dallas Sand"]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_search_venues_ranks_and_follows_updates(tmp_path, backend):
+    """Test keyword ranking, filters, paging and incremental updates."""
+    if backend == "sqlite":
+        storage = SqliteStorage(tmp_path / "hunt.db")
+    else:
+        storage = Storage(data_dir=tmp_path)
+
+    storage.save_venues([
+        make_venue("Metro Gym", address="1 Beach Road, Austin", description="Indoor courts"),
+        make_venue("Sunset Beach Volleyball", state="California", description="Sand courts"),
+        make_venue("Café Smash", state="Goa", country="India"),
+    ])
+
+    total, hits = storage.search_venues("beach volleyball")
+    assert total == 2
+    assert [v.name for _, v in hits] == ["Sunset Beach Volleyball", "Metro Gym"]
+    assert hits[0][0] > hits[1][0]
+
+    assert storage.search_venues("beach", limit=1, offset=1)[1][0][1].name == "Metro Gym"
+    assert [v.name for _, v in storage.search_venues("beach", state="texas")[1]] == ["Metro Gym"]
+    assert storage.search_venues("CAFE")[0] == 1
+    assert storage.search_venues('" OR *')[0] == 0
+
+    # Merged fields become searchable, and replaced ones stop matching
+    storage.save_venues([make_venue("Café Smash", state="Goa", country="India",
+                                    address="Calangute Beach")])
+    assert storage.search_venues("calangute")[0] == 1
+    assert storage.search_venues("beach")[0] == 3
+
+
+def test_venue_records_round_trip_and_share_strings(storage):
+    """Test that compact records rebuild equal models and intern locations."""
+    venue = make_venue("Zilker Courts", address="2100 Barton Springs Rd",
+                       latitude=30.2669, longitude=-97.7729)
+    storage.save_venues([venue, make_venue("Mueller Courts")])
+
+    reopened = Storage(data_dir=storage.data_dir)
+    loaded = reopened.get_venues_by_state("texas")
+    assert loaded[0] == venue
+    assert loaded[0].model_dump(mode="json") == venue.model_dump(mode="json")
+    assert loaded[0].model_copy(update={"phone": "555"}).phone == "555"
+
+    first, second = reopened.load_index().venues.values()
+    assert not hasattr(first, "__dict__")
+    assert first.state is second.state
+
+
+def test_scan_cursors_survive_deletes_restarts_and_compaction(tmp_path):
+    """Test that venue ids used as cursors stay with their venues."""
+    storage = Storage(data_dir=tmp_path, segment_max_bytes=1, compact_min_segments=100)
+    # Entries written before they carried sequence numbers
+    storage._log.append([
+        (storage._venue_key(make_venue(f"Court {i}")), None,
+         make_venue(f"Court {i}").model_dump(mode="json"))
+        for i in range(2)
+    ])
+    storage.save_venues([make_venue(f"Court {i}") for i in range(2, 5)])
+    cursors = {venue.name: cursor for cursor, venue in storage.iter_venues(state="Texas")}
+    assert sorted(cursors.values()) == [0, 1, 2, 3, 4]
+
+    storage._log.delete([storage._venue_key(make_venue("Court 0"))])
+    storage.compact()
+    reopened = Storage(data_dir=tmp_path)
+    after = [v.name for _, v in reopened.iter_venues(state="Texas", after=cursors["Court 2"])]
+    assert after == ["Court 3", "Court 4"]
+
+    # A rewritten venue keeps its id, and new venues get larger ones
+    reopened.save_venues([make_venue("Court 1", email="hi@court.one"), make_venue("Court 5")])
+    ids = {v.name: cursor for cursor, v in Storage(data_dir=tmp_path).iter_venues()}
+    assert ids == {"Court 1": 1, "Court 2": 2, "Court 3": 3, "Court 4": 4, "Court 5": 5}
+
+
+def test_sqlite_close_closes_every_thread_connection(tmp_path):
+    """Test that close reaches connections opened by other threads."""
+    storage = SqliteStorage(tmp_path / "hunt.db")
+    storage.save_venues([make_venue("Austin Beach Club")])
+    opened = []
+
+    def read():
+        opened.append(storage._connect())
+        return storage.count_venues()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(read).result() == 1
+        storage.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+
+        # Threads transparently reconnect after close
+        assert pool.submit(read).result() == 1
+    assert storage.count_venues() == 1
+    storage.close()